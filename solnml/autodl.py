@@ -118,7 +118,8 @@ class AutoDL(AutoDLBase):
         if self.optalgo == 'see':
             from solnml.components.optimizers.cashp_optimizer import CashpOptimizer
             self.see_optimizer = CashpOptimizer(self.task_type, algorithm_candidates, self.time_limit,
-                                                n_jobs=self.n_jobs)
+                                                n_jobs=self.n_jobs,
+                                                scheduler='asha' if self.evaluation_type == 'partial_asha' else 'sync')
             inc_config, inc_perf = self.see_optimizer.run(dl_evaluator)
             self.best_algo_config = inc_config
             self.best_algo_id = inc_config['estimator']
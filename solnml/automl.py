@@ -12,6 +12,13 @@ from solnml.components.models.classification import _classifiers
 from solnml.components.models.imbalanced_classification import _imb_classifiers
 from solnml.components.meta_learning.algorithm_recomendation.ranknet_advisor_torch import RankNetAdvisor
 from solnml.blocks.block_utils import get_node_type, get_execution_tree
+from solnml.components.computation.resource_manager import set_resource_manager
+from solnml.components.computation.parallel_process import close_shared_pool
+from solnml.components.utils.eval_memo import set_evaluation_memo
+from solnml.components.feature_engineering.transformations.feature_importance import set_importance_cache
+from solnml.components.utils.dtype_utils import check_dtype
+from solnml.components.utils.checkpoint import SearchCheckpointer
+from solnml.components.utils.warm_start import load_prior_records, rank_algorithms, select_warm_start_records
 from solnml.utils.functions import is_imbalanced_dataset
 
 classification_algorithms = _classifiers.keys()
@@ -37,7 +44,16 @@ class AutoML(object):
                  output_dir="logs",
                  logging_config=None,
                  random_state=1,
-                 n_jobs=1):
+                 n_jobs=1,
+                 n_cores=None,
+                 memory_limit=None,
+                 dtype=None):
+        """
+        :param memory_limit: memory (in MB) for the working data of the trials, shared by the n_jobs concurrent
+            trials; the feature engineering generators fit on subsamples and transform in chunks to stay within it.
+        :param dtype: compute dtype of the features, 'float32' halves the memory of the data copies in the
+            feature engineering and evaluation; None keeps the dtype of the input data.
+        """
         self.metric_id = metric
         self.metric = get_metric(self.metric_id)
 
@@ -60,11 +76,15 @@ class AutoML(object):
         self.enable_fe = enable_fe
         self.task_type = task_type
         self.n_jobs = n_jobs
+        self.n_cores = n_cores
+        self.memory_limit = memory_limit
+        self.dtype = check_dtype(dtype)
         self.solver = None
 
         self.global_start_time = time.time()
         self.eval_time = None
         self.total_time = None
+        self.evaluation_memo_stats = {'queries': 0, 'hits': 0, 'hit_rate': 0.}
 
         # Disable meta learning
         if self.include_preprocessors is not None:
@@ -98,6 +118,21 @@ class AutoML(object):
             1. tune each algorithm's hyperparameters.
             2. engineer each algorithm's features automatically.
         :param train_data:
+        :param kwargs: checkpoint_path: path of the checkpoint, default to <output_dir>/<dataset_name>_checkpoint.pkl;
+            checkpoint_interval: minimum seconds between two checkpoints, e.g., 60, None (default) to disable
+                checkpointing;
+            resume: if True, continue the search saved in checkpoint_path on the same train_data;
+            warm_start: topk config files or checkpoints of previous runs on the same or a similar dataset,
+                whose evaluated configurations seed the surrogates of the optimizers without being evaluated again;
+            n_warm_start_configs: number of the best prior configurations loaded for each algorithm, default to 10;
+            acq_type: 'ei' or 'eips', the latter ranks the candidates by expected improvement per second and skips
+                the configurations predicted to exceed per_run_time_limit in the SMAC optimizers;
+            progressive_sampling: if True, evaluate the algorithms on a growing sample of the training data, which
+                speeds up the search on large datasets (holdout evaluation only);
+            evaluation_memo: if True (default), the results of the evaluated configurations are shared by all the
+                blocks during the search, and a configuration suggested again is not evaluated twice;
+            importance_cache: if True (default), the feature importances ranked by the feature engineering
+                transformers are computed once for each data, target fields and method in the run.
         :return:
         """
         # Check whether this dataset is balanced or not.
@@ -106,10 +141,36 @@ class AutoML(object):
         #     train_data = DataBalancer().operate(train_data)
 
         dataset_id = kwargs.get('dataset_id', None)
+        train_data = self.cast_data(train_data)
+        resume = kwargs.get('resume', False)
+        checkpoint_path = kwargs.get('checkpoint_path', None)
+        if checkpoint_path is None:
+            checkpoint_path = os.path.join(self.output_dir, '%s_checkpoint.pkl' % self.dataset_name)
+        checkpoint_interval = kwargs.get('checkpoint_interval', None)
+        checkpointer = None
+        if checkpoint_interval is not None:
+            checkpointer = SearchCheckpointer(checkpoint_path, interval=checkpoint_interval)
+
+        checkpoint = None
+        if resume:
+            checkpoint = SearchCheckpointer.load(checkpoint_path, train_data)
+            self.include_algorithms = checkpoint['include_algorithms']
+            self.logger.info('Resume from checkpoint %s: %d iterations and %d evaluations finished.' % (
+                checkpoint_path, checkpoint['n_iterations'], len(checkpoint['solver'].eval_dict)))
 
-        if self.enable_meta_algorithm_selection:
+        n_algo_recommended = 5
+        prior_records = list()
+        if kwargs.get('warm_start', None) is not None and checkpoint is None:
+            prior_records = [(config, perf) for config, perf in load_prior_records(kwargs['warm_start'], train_data)
+                             if config['algorithm'] in self.include_algorithms]
+            self.logger.info('Load %d configurations from previous runs.' % len(prior_records))
+
+        if self.enable_meta_algorithm_selection and checkpoint is None and len(prior_records) > 0:
+            # The algorithms that performed best in previous runs replace the meta-learning based recommendation.
+            self.include_algorithms = rank_algorithms(prior_records)[:n_algo_recommended]
+            self.logger.info('Final Algorithms Recommended by previous runs: [%s]' % ','.join(self.include_algorithms))
+        elif self.enable_meta_algorithm_selection and checkpoint is None:
             try:
-                n_algo_recommended = 5
                 meta_datasets = kwargs.get('meta_datasets', None)
                 self.logger.info('Executing Meta-Learning based Algorithm Recommendation.')
                 alad = RankNetAdvisor(task_type=self.task_type, n_algorithm=n_algo_recommended,
@@ -144,43 +205,112 @@ class AutoML(object):
             self.fe_config_space = get_fe_cs(self.task_type, include_preprocessors=self.include_preprocessors)
             self.cash_config_space = get_cash_cs(self.include_algorithms, self.task_type)
 
+        # Split the cores among the trials evaluated concurrently.
+        resource_manager = set_resource_manager(n_cores=self.n_cores, n_concurrent_trials=self.n_jobs,
+                                                memory_limit=self.memory_limit)
+        self.logger.info('Resource allocation: %d cores, %d concurrent trial(s), %d thread(s) and %dMB per trial.' % (
+            resource_manager.n_cores, resource_manager.n_concurrent_trials, resource_manager.trial_threads,
+            resource_manager.trial_memory // (1024 * 1024)))
+        # Skip the configurations evaluated before in this run, whichever block suggests them.
+        evaluation_memo = set_evaluation_memo(enabled=kwargs.get('evaluation_memo', True))
+        # Rank the features once for the FE pipelines that see the same data.
+        importance_cache = set_importance_cache(enabled=kwargs.get('importance_cache', True))
+
         # TODO: Define execution trees flexibly
         tree_id = kwargs.get("tree_id", 1)
         tree = get_execution_tree(tree_id)
         solver_type = get_node_type(tree, 0)
-        self.timestamp = time.time()
-        self.solver = solver_type(tree, 0, self.task_type, self.timestamp,
-                                  self.fe_config_space, self.cash_config_space, train_data,
-                                  per_run_time_limit=self.per_run_time_limit,
-                                  dataset_name=self.dataset_name,
-                                  ensemble_method=self.ensemble_method,
-                                  ensemble_size=self.ensemble_size,
-                                  metric=self.metric,
-                                  seed=self.seed,
-                                  time_limit=self.time_limit,
-                                  trial_num=self.amount_of_resource,
-                                  eval_type=self.evaluation_type,
-                                  resampling_params=self.resampling_params,
-                                  output_dir=self.output_dir,
-                                  n_jobs=self.n_jobs)
-
-        for i in range(self.amount_of_resource):
-            if not (self.solver.early_stop_flag or self.solver.timeout_flag):
-                self.solver.iterate()
-        self.eval_time = time.time() - self.timestamp
-
-        if self.ensemble_method is not None and self.evaluation_type in ['holdout', 'partial']:
+        solver_kwargs = dict()
+        if tree[0][0] == 'condition':
+            # Pull several algorithm arms at once with the n_jobs cores.
+            solver_kwargs['parallel_arms'] = kwargs.get('parallel_arms', False)
+            solver_kwargs['progressive_sampling'] = kwargs.get('progressive_sampling', False)
+        if checkpoint is None:
+            self.timestamp = time.time()
+            self.solver = solver_type(tree, 0, self.task_type, self.timestamp,
+                                      self.fe_config_space, self.cash_config_space, train_data,
+                                      per_run_time_limit=self.per_run_time_limit,
+                                      dataset_name=self.dataset_name,
+                                      ensemble_method=self.ensemble_method,
+                                      ensemble_size=self.ensemble_size,
+                                      metric=self.metric,
+                                      seed=self.seed,
+                                      time_limit=self.time_limit,
+                                      trial_num=self.amount_of_resource,
+                                      eval_type=self.evaluation_type,
+                                      resampling_params=self.resampling_params,
+                                      output_dir=self.output_dir,
+                                      n_jobs=self.n_jobs,
+                                      acq_type=kwargs.get('acq_type', 'ei'),
+                                      **solver_kwargs)
+            if len(prior_records) > 0:
+                prior_records = [(config, perf) for config, perf in prior_records
+                                 if config['algorithm'] in self.include_algorithms]
+                self.solver.warm_start(select_warm_start_records(
+                    prior_records, n_configs_per_algorithm=kwargs.get('n_warm_start_configs', 10)))
+            start_iter, _eval_start_time = 0, self.timestamp
+        else:
+            # Keep the timestamp, which identifies the models and the topk configs saved before.
+            self.timestamp = checkpoint['timestamp']
+            self.solver = checkpoint['solver']
+            start_iter = checkpoint['n_iterations']
+            # The time spent before the interruption counts against the budget, while the downtime does not.
+            self.solver.extend_time_limit(time.time() - checkpoint['save_time'])
+            _eval_start_time = time.time() - checkpoint['eval_time']
+
+        try:
+            for i in range(start_iter, self.amount_of_resource):
+                if not (self.solver.early_stop_flag or self.solver.timeout_flag):
+                    self.solver.iterate()
+                    if checkpointer is not None:
+                        self.save_checkpoint(checkpointer, train_data, i + 1, _eval_start_time)
+            if getattr(self.solver, 'progressive_sampling', False):
+                self.solver.finalize_sampling()
+            # The evaluations still running must not write models during refitting and ensembling.
+            self.solver.collect_running_evaluations(timeout=self.per_run_time_limit)
+        finally:
+            # The memo is only valid within the run, the evaluators used afterwards always evaluate.
+            set_evaluation_memo(enabled=False)
+            close_shared_pool()
+        if checkpointer is not None:
+            self.save_checkpoint(checkpointer, train_data, self.amount_of_resource, _eval_start_time, force=True)
+        self.eval_time = time.time() - _eval_start_time
+        self.evaluation_memo_stats = evaluation_memo.get_stats()
+        self.logger.info('Evaluation memo: %d hits in %d evaluations, hit rate %.2f%%.' % (
+            evaluation_memo.n_hits, evaluation_memo.n_queries, evaluation_memo.hit_rate * 100))
+        self.logger.info('Feature importance cache: %d hits in %d queries, hit rate %.2f%%.' % (
+            importance_cache.n_hits, importance_cache.n_queries, importance_cache.hit_rate * 100))
+
+        if self.ensemble_method is not None and self.evaluation_type in ['holdout', 'partial', 'partial_asha']:
             self.solver.fit_ensemble()
         self.total_time = time.time() - self.global_start_time
 
+    def save_checkpoint(self, checkpointer: SearchCheckpointer, train_data: DataNode, n_iterations,
+                        eval_start_time, force=False):
+        try:
+            if checkpointer.save(self.solver, train_data, force=force,
+                                 n_iterations=n_iterations,
+                                 timestamp=self.timestamp,
+                                 include_algorithms=self.include_algorithms,
+                                 eval_time=time.time() - eval_start_time):
+                self.logger.debug('Checkpoint saved to %s.' % checkpointer.path)
+        except Exception as e:
+            # A failed checkpoint should never stop the search.
+            self.logger.warning('Failed to save checkpoint: %s' % str(e))
+
     def refit(self):
         self.solver.refit()
 
+    def cast_data(self, data: DataNode):
+        if self.dtype is None:
+            return data
+        return data.astype(self.dtype)
+
     def predict_proba(self, test_data: DataNode):
-        return self.solver.predict_proba(test_data)
+        return self.solver.predict_proba(self.cast_data(test_data))
 
     def predict(self, test_data: DataNode):
-        return self.solver.predict(test_data)
+        return self.solver.predict(self.cast_data(test_data))
 
     def score(self, test_data: DataNode, metric_func=None):
         if metric_func is None:
@@ -231,6 +361,7 @@ class AutoML(object):
                       [["Optimal Validation Performance", self.solver.incumbent_perf]] +
                       [['Number of Configurations', num_configs]] +
                       [['Number of Failed Configurations', failed_configs]] +
+                      [['Evaluation Memo Hit Rate', '%.2f%%' % (self.evaluation_memo_stats['hit_rate'] * 100)]] +
                       [['Search Runtime', '%.3f sec' % self.eval_time]] +  # TODO: Precise search time.
                       [['Total Runtime', '%.3f sec' % self.total_time]] +
                       [['Average Evaluation Time', 0]] +  # TODO: Wait for OpenBOX
@@ -28,10 +28,13 @@ class BaseEstimator(object):
             per_run_time_limit=150,
             random_state=1,
             n_jobs=1,
+            n_cores=None,
+            memory_limit=None,
             evaluation='holdout',
             resampling_params=None,
             output_dir="/tmp/",
-            delete_output_dir_after_fit=False):
+            delete_output_dir_after_fit=False,
+            dtype=None):
         self.dataset_name = dataset_name
         self.metric = metric
         self.task_type = None
@@ -46,8 +49,11 @@ class BaseEstimator(object):
         self.per_run_time_limit = per_run_time_limit
         self.random_state = random_state
         self.n_jobs = n_jobs
+        self.n_cores = n_cores
+        self.memory_limit = memory_limit
         self.evaluation = evaluation
         self.resampling_params = resampling_params
+        self.dtype = dtype
         self._ml_engine = None
         # Create output directory.
         if not os.path.exists(output_dir):
@@ -79,9 +85,12 @@ class BaseEstimator(object):
             per_run_time_limit=self.per_run_time_limit,
             random_state=self.random_state,
             n_jobs=self.n_jobs,
+            n_cores=self.n_cores,
+            memory_limit=self.memory_limit,
             evaluation=self.evaluation,
             resampling_params=self.resampling_params,
-            output_dir=self.output_dir
+            output_dir=self.output_dir,
+            dtype=self.dtype
         )
         return engine
 
@@ -105,6 +114,62 @@ class BaseEstimator(object):
     def predict_proba(self, X: DataNode, batch_size=None, n_jobs=1):
         return self._ml_engine.predict_proba(X)
 
+    def get_serving_model(self, preprocessor=None, raw_feature_types=None, raw_feature_names=None):
+        """
+        The fitted model for inference only, see solnml.components.utils.serving.ServingModel.
+        :param preprocessor: the fitted DataManager or FEPipeline that produced the training data,
+            if given, the served model predicts on the raw data.
+        :param raw_feature_types: the feature types of the raw data, taken from the DataManager by default.
+        :param raw_feature_names: the column names of the raw data, required to predict on dicts.
+        :return: the ServingModel.
+        """
+        from solnml.components.utils.serving import ServingModel
+        if self._ml_engine is None:
+            raise AttributeError("AutoML is not fitted!")
+        solver = self._ml_engine.solver
+        train_data = solver.original_data
+        if preprocessor is not None:
+            if raw_feature_types is None:
+                raw_feature_types = getattr(preprocessor, 'feature_types', None)
+            if raw_feature_names is None:
+                raw_feature_names = getattr(preprocessor, 'feature_names', None)
+            train_X = getattr(preprocessor, 'train_X', None)
+            if raw_feature_names is None and hasattr(train_X, 'columns'):
+                raw_feature_names = list(train_X.columns)
+        return ServingModel(self.task_type, solver.get_serving_members(),
+                            feature_types=train_data.feature_types,
+                            feature_names=train_data.feature_names,
+                            dtype=self._ml_engine.dtype,
+                            preprocessor=preprocessor,
+                            raw_feature_types=raw_feature_types,
+                            raw_feature_names=raw_feature_names)
+
+    def export(self, path, preprocessor=None, raw_feature_types=None, raw_feature_names=None):
+        """
+        Save the fitted model as a single artifact for serving, load it with
+        solnml.components.utils.serving.load_model. The parameters are the same as get_serving_model.
+        :param path: the file to write.
+        :return: the ServingModel.
+        """
+        model = self.get_serving_model(preprocessor=preprocessor, raw_feature_types=raw_feature_types,
+                                       raw_feature_names=raw_feature_names)
+        model.save(path)
+        return model
+
+    def serve(self, address=('127.0.0.1', 0), max_batch_size=256, max_delay=0.005, preprocessor=None):
+        """
+        Start a local prediction server that micro-batches the concurrent requests,
+        query it with solnml.components.utils.prediction_server.PredictionClient.
+        :param address: (host, port) for TCP, port 0 picks a free port, or a path for a Unix socket.
+        :param max_batch_size: the maximum number of rows in a batch.
+        :param max_delay: the maximum time (in seconds) a request waits for the other requests in its batch.
+        :return: the started PredictionServer, call shutdown() to stop it.
+        """
+        from solnml.components.utils.prediction_server import PredictionServer
+        server = PredictionServer(self.get_serving_model(preprocessor=preprocessor), address=address,
+                                  max_batch_size=max_batch_size, max_delay=max_delay)
+        return server.start()
+
     def get_automl(self):
         return AutoML
 
@@ -33,7 +33,8 @@ class AbstractBlock(object):
                  eval_type='holdout',
                  resampling_params=None,
                  n_jobs=1,
-                 seed=1):
+                 seed=1,
+                 acq_type='ei'):
         # Tree setting
         self.node_list = node_list
         self.node_index = node_index
@@ -60,6 +61,7 @@ class AbstractBlock(object):
         self.ensemble_size = ensemble_size
         self.n_jobs = n_jobs
         self.seed = seed
+        self.acq_type = acq_type
         self.output_dir = output_dir
 
         self.early_stop_flag = False
@@ -75,6 +77,40 @@ class AbstractBlock(object):
 
         self.es = None
 
+    def extend_time_limit(self, delta):
+        """
+            Extend the time budget of this block and its children by delta seconds,
+            e.g., the downtime between saving a checkpoint and resuming from it.
+        """
+        if self.time_limit is not None:
+            self.time_limit += delta
+        for sub_bandit in getattr(self, 'sub_bandits', dict()).values():
+            sub_bandit.extend_time_limit(delta)
+
+    def warm_start(self, records):
+        """
+            Learn from the configurations evaluated in previous runs, without evaluating them again.
+        :param records: a list of (configuration dict, perf), sorted by perf, the larger the better.
+        """
+        for sub_bandit in getattr(self, 'sub_bandits', dict()).values():
+            sub_bandit.warm_start(records)
+
+    def collect_running_evaluations(self, timeout=None):
+        """
+            Wait for the evaluations the optimizers left in flight at the end of the search, and record them.
+        :param timeout: the evaluations not finished within timeout seconds are dropped.
+        """
+        for sub_bandit in getattr(self, 'sub_bandits', dict()).values():
+            sub_bandit.collect_running_evaluations(timeout=timeout)
+            self.eval_dict.update(sub_bandit.eval_dict)
+
+    def set_sample_ratio(self, sample_ratio, n_configs=3):
+        """
+            Evaluate on a sample of the training data, used in progressive sampling.
+        """
+        for sub_bandit in getattr(self, 'sub_bandits', dict()).values():
+            sub_bandit.set_sample_ratio(sample_ratio, n_configs=n_configs)
+
     def refit(self):
         if self.ensemble_method is not None:
             self.logger.info('Start to refit all the well-performed models!')
@@ -95,7 +131,9 @@ class AbstractBlock(object):
                     estimator = fetch_predict_estimator(self.task_type, algo_id, config,
                                                         data_node.data[0], data_node.data[1],
                                                         weight_balance=data_node.enable_balance,
-                                                        data_balance=data_node.data_balance)
+                                                        data_balance=data_node.data_balance,
+                                                        data_shape=self.original_data.data[0].shape,
+                                                        per_run_time_limit=self.per_run_time_limit)
                     with open(path, 'wb')as f:
                         pkl.dump([op_list, estimator, None], f)
 
@@ -116,7 +154,9 @@ class AbstractBlock(object):
             estimator = fetch_predict_estimator(self.task_type, algo_id, config,
                                                 data_node.data[0], data_node.data[1],
                                                 weight_balance=data_node.enable_balance,
-                                                data_balance=data_node.data_balance)
+                                                data_balance=data_node.data_balance,
+                                                data_shape=self.original_data.data[0].shape,
+                                                per_run_time_limit=self.per_run_time_limit)
             with open(model_path, 'wb')as f:
                 pkl.dump([op_list, estimator, None], f)
 
@@ -133,7 +173,10 @@ class AbstractBlock(object):
                                       ensemble_size=self.ensemble_size,
                                       task_type=self.task_type,
                                       metric=self.metric,
-                                      output_dir=self.output_dir)
+                                      output_dir=self.output_dir,
+                                      per_run_time_limit=self.per_run_time_limit,
+                                      resampling_params=self.resampling_params,
+                                      seed=self.seed)
             self.es.fit(data=self.original_data)
 
     def predict(self, test_data: DataNode):
@@ -172,6 +215,18 @@ class AbstractBlock(object):
             raise AttributeError("predict_proba is not supported in regression")
         return self._predict(test_data)
 
+    def get_serving_members(self):
+        """
+            The fitted models used in prediction, a list of (weight, op_list, estimator).
+        """
+        if self.ensemble_method is not None:
+            if self.es is None:
+                raise AttributeError("AutoML is not fitted!")
+            return self.es.get_serving_members()
+        best_op_list, estimator = load_combined_transformer_estimator(self.output_dir, self.incumbent,
+                                                                      self.timestamp)
+        return [(1., best_op_list, estimator)]
+
     def score(self, test_data: DataNode, metric_func=None):
         if metric_func is None:
             raise ValueError('metric_func is not defined!')
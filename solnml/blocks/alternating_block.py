@@ -1,4 +1,3 @@
-import os
 import time
 import numpy as np
 from ConfigSpace import ConfigurationSpace
@@ -6,7 +5,7 @@ from openbox.utils.constants import SUCCESS, TIMEOUT, FAILED
 
 from solnml.components.feature_engineering.transformation_graph import DataNode
 from solnml.components.utils.constants import CLS_TASKS
-from solnml.components.utils.topk_saver import CombinedTopKModelSaver
+from solnml.components.utils.topk_saver import CombinedTopKModelSaver, remove_model
 from solnml.blocks.abstract_block import AbstractBlock
 from solnml.utils.decorators import time_limit
 
@@ -29,7 +28,8 @@ class AlternatingBlock(AbstractBlock):
                  eval_type='holdout',
                  resampling_params=None,
                  n_jobs=1,
-                 seed=1):
+                 seed=1,
+                 acq_type='ei'):
         super(AlternatingBlock, self).__init__(node_list, node_index, task_type, timestamp,
                                                fe_config_space, cash_config_space, data,
                                                fixed_config=fixed_config,
@@ -44,7 +44,8 @@ class AlternatingBlock(AbstractBlock):
                                                eval_type=eval_type,
                                                resampling_params=resampling_params,
                                                n_jobs=n_jobs,
-                                               seed=seed)
+                                               seed=seed,
+                                               acq_type=acq_type)
 
         self.arms = ['hpo', 'fe']
         self.optimal_algo_id = None
@@ -92,7 +93,8 @@ class AlternatingBlock(AbstractBlock):
                     eval_type=eval_type,
                     resampling_params=resampling_params,
                     n_jobs=n_jobs,
-                    seed=seed
+                    seed=seed,
+                    acq_type=acq_type
                 )
             else:
                 from solnml.blocks.block_utils import get_node_type
@@ -110,7 +112,8 @@ class AlternatingBlock(AbstractBlock):
                     eval_type=eval_type,
                     resampling_params=resampling_params,
                     n_jobs=n_jobs,
-                    seed=seed
+                    seed=seed,
+                    acq_type=acq_type
                 )
 
         self.topk_saver = CombinedTopKModelSaver(k=50, model_dir=self.output_dir, identifier=self.timestamp)
@@ -232,7 +235,8 @@ class AlternatingBlock(AbstractBlock):
                 eval_type=self.eval_type,
                 resampling_params=self.resampling_params,
                 n_jobs=self.n_jobs,
-                seed=self.seed
+                seed=self.seed,
+                acq_type=self.acq_type
             )
         else:
             # trials_per_iter = self.optimizer['fe'].evaluation_num_last_iteration // 2
@@ -254,7 +258,8 @@ class AlternatingBlock(AbstractBlock):
                 eval_type=self.eval_type,
                 resampling_params=self.resampling_params,
                 n_jobs=self.n_jobs,
-                seed=self.seed
+                seed=self.seed,
+                acq_type=self.acq_type
             )
 
         self.logger.debug('=' * 30)
@@ -278,7 +283,8 @@ class AlternatingBlock(AbstractBlock):
                         seed=self.seed,
                         output_dir=self.output_dir,
                         resampling_strategy=self.eval_type,
-                        resampling_params=self.resampling_params)
+                        resampling_params=self.resampling_params,
+                        per_run_time_limit=self.per_run_time_limit)
                 else:
                     from solnml.components.evaluators.rgs_evaluator import RegressionEvaluator
                     evaluator = RegressionEvaluator(
@@ -289,7 +295,8 @@ class AlternatingBlock(AbstractBlock):
                         seed=self.seed,
                         output_dir=self.output_dir,
                         resampling_strategy=self.eval_type,
-                        resampling_params=self.resampling_params)
+                        resampling_params=self.resampling_params,
+                        per_run_time_limit=self.per_run_time_limit)
                 _perf = -evaluator(self.local_inc['hpo'].copy())
         except Exception as e:
             self.logger.error(str(e))
@@ -303,16 +310,16 @@ class AlternatingBlock(AbstractBlock):
             save_flag, model_path, delete_flag, model_path_deleted = self.topk_saver.add(_config, -_perf,
                                                                                          classifier_id)
             # By default, the evaluator has already stored the models.
-            if self.eval_type in ['holdout', 'partial']:
+            if self.eval_type in ['holdout', 'partial', 'partial_asha']:
                 if save_flag:
                     pass
                 else:
-                    os.remove(model_path)
+                    remove_model(model_path)
                     self.logger.info("Model deleted from %s" % model_path)
 
                 try:
                     if delete_flag:
-                        os.remove(model_path_deleted)
+                        remove_model(model_path_deleted)
                         self.logger.info("Model deleted from %s" % model_path_deleted)
                     else:
                         pass
@@ -1,10 +1,66 @@
+import os
 import time
+import signal
+import traceback
 import numpy as np
+import pickle as pkl
+import multiprocessing
+from multiprocessing.connection import wait
 from copy import deepcopy
 from ConfigSpace import ConfigurationSpace, Constant
 from solnml.utils.constant import MAX_INT
 from solnml.components.feature_engineering.transformation_graph import DataNode
 from solnml.blocks.abstract_block import AbstractBlock
+from solnml.components.computation.resource_manager import get_resource_manager, set_resource_manager
+
+
+# The attributes of a sub-bandit the parent block reads after each pull.
+ARM_STATE_ATTRS = ['incumbent', 'incumbent_perf', 'early_stop_flag', 'timeout_flag']
+# The command asking an idle arm worker to send back its whole sub-bandit, e.g., before a checkpoint.
+STATE_COMMAND = 'state'
+# Seconds a stopped arm worker may take to finish its current pull before its process group is killed.
+STOP_TIMEOUT = 10
+
+
+def arm_worker(arm, sub_bandit, command_queue, result_conn):
+    """
+        Persistent worker of an arm, which owns the sub-bandit for the rest of the search. Each command
+        (trial_num, n_cores, memory_limit) pulls the arm once with the given share of the resources, and only
+        the reward, the state of the sub-bandit and the new evaluations are sent back.
+    """
+    # Lead a process group, so that stopping the arm also stops the evaluations it started.
+    os.setpgrp()
+    sent_evals = dict()
+    while True:
+        command = command_queue.get()
+        if command is None:
+            break
+        if command == STATE_COMMAND:
+            try:
+                result = pkl.dumps(sub_bandit)
+            except Exception:
+                result = pkl.dumps(None)
+            result_conn.send_bytes(result)
+            continue
+        trial_num, n_cores, memory_limit = command
+        # The cores of the eliminated arms are handed to the remaining arms at their next pull.
+        set_resource_manager(n_cores=n_cores, n_concurrent_trials=sub_bandit.n_jobs, memory_limit=memory_limit)
+        _start_time = time.time()
+        try:
+            reward = sub_bandit.iterate(trial_num=trial_num)
+            state = dict((attr, getattr(sub_bandit, attr)) for attr in ARM_STATE_ATTRS)
+            new_evals = dict((key, value) for key, value in sub_bandit.eval_dict.items()
+                             if key not in sent_evals or sent_evals[key] != value)
+            # Pickle here, so that the errors are reported as the result of the pull.
+            result = pkl.dumps((arm, reward, time.time() - _start_time, state, new_evals, None))
+            sent_evals.update(new_evals)
+        except Exception:
+            result = pkl.dumps((arm, None, time.time() - _start_time, None, None, traceback.format_exc()))
+        try:
+            result_conn.send_bytes(result)
+        except BrokenPipeError:
+            # The arm was stopped during the pull, and its result is discarded.
+            break
 
 
 class ConditioningBlock(AbstractBlock):
@@ -25,8 +81,17 @@ class ConditioningBlock(AbstractBlock):
                  eval_type='holdout',
                  resampling_params=None,
                  n_jobs=1,
-                 seed=1):
+                 seed=1,
+                 acq_type='ei',
+                 parallel_arms=False,
+                 progressive_sampling=False):
         """
+        :param acq_type: acquisition function in the SMAC optimizers, 'ei' or 'eips' (expected improvement per second).
+        :param parallel_arms: if True, keep up to n_jobs arms in flight at once, each in its own persistent worker
+        process, and split the cores evenly among the arms that remain at each pull.
+        :param progressive_sampling: if True, evaluate the arms on a sample of the training data first, and grow
+        the sample by a factor of sampling_eta for the remaining arms after each elimination round. The best
+        configurations of the remaining arms are evaluated on the full data at the end, which are the only models saved.
         :param classifier_ids: subset of {'adaboost','bernoulli_nb','decision_tree','extra_trees','gaussian_nb','gradient_boosting',
         'gradient_boosting','k_nearest_neighbors','lda','liblinear_svc','libsvm_svc','multinomial_nb','passive_aggressive','qda',
         'random_forest','sgd'}
@@ -45,7 +110,8 @@ class ConditioningBlock(AbstractBlock):
                                                 eval_type=eval_type,
                                                 resampling_params=resampling_params,
                                                 n_jobs=n_jobs,
-                                                seed=seed)
+                                                seed=seed,
+                                                acq_type=acq_type)
 
         # Best configuration.
         self.optimal_arm = None
@@ -58,6 +124,19 @@ class ConditioningBlock(AbstractBlock):
         self.sub_bandits = dict()
         self.evaluation_cost = dict()
 
+        # Parallel settings.
+        self.parallel_arms = parallel_arms
+        if self.parallel_arms:
+            self.n_arm_workers = max(min(n_jobs, len(self.arms)), 1)
+            arm_n_jobs = max(n_jobs // self.n_arm_workers, 1)
+        else:
+            self.n_arm_workers = 1
+            arm_n_jobs = n_jobs
+        # The persistent worker process, command queue and result pipe of each arm, and the start time of the
+        # arms in flight. Each worker has its own pipe, so that killing a worker never corrupts the others' results.
+        self.arm_workers = dict()
+        self.running_arms = dict()
+
         self.arm_cost_stats = dict()
         for _arm in self.arms:
             self.arm_cost_stats[_arm] = list()
@@ -104,10 +183,35 @@ class ConditioningBlock(AbstractBlock):
                 dataset_name=dataset_name,
                 eval_type=eval_type,
                 resampling_params=resampling_params,
-                n_jobs=n_jobs,
-                seed=seed
+                n_jobs=arm_n_jobs,
+                seed=seed,
+                acq_type=acq_type
             )
 
+        # Progressive sampling settings.
+        self.progressive_sampling = progressive_sampling
+        self.sample_ratio = 1.0
+        self.sampling_eta = 3
+        self.sampling_n_configs = 3
+        self.sampling_reserve = 0
+        self.sampling_finalized = False
+        if self.progressive_sampling:
+            if self.parallel_arms:
+                raise ValueError('Progressive sampling does not support parallel arms!')
+            if self.eval_type != 'holdout':
+                raise ValueError('Progressive sampling only supports holdout evaluation: %s!' % self.eval_type)
+            # Start from the smallest sample with at least min_samples samples.
+            n_samples, min_samples, max_rounds = data.data[0].shape[0], 5000, 4
+            n_rounds = 0
+            while n_rounds < max_rounds and n_samples / self.sampling_eta ** (n_rounds + 1) >= min_samples:
+                n_rounds += 1
+            self.sample_ratio = 1.0 / self.sampling_eta ** n_rounds
+            if self.sample_ratio < 1:
+                self.logger.info('Progressive sampling starts with %d samples.' % int(n_samples * self.sample_ratio))
+                self.set_sample_ratio(self.sample_ratio, n_configs=self.sampling_n_configs)
+            else:
+                self.sampling_finalized = True
+
         self.action_sequence = list()
         self.final_rewards = list()
         self.start_time = time.time()
@@ -129,6 +233,9 @@ class ConditioningBlock(AbstractBlock):
             self.trial_num = MAX_INT
 
     def iterate(self, trial_num=10):
+        if self.parallel_arms:
+            return self.iterate_parallel(trial_num=trial_num)
+
         # Search for an arm that is not early-stopped.
         while self.sub_bandits[self.arm_candidate[self.pick_id]].early_stop_flag and \
                 self.pick_id < len(self.arm_candidate):
@@ -142,32 +249,11 @@ class ConditioningBlock(AbstractBlock):
             reward = self.sub_bandits[arm_to_pull].iterate(trial_num=trial_num)
 
             # Update results after each iteration
-            self.arm_cost_stats[arm_to_pull].append(time.time() - _start_time)
-            if reward > self.incumbent_perf:
-                self.optimal_algo_id = arm_to_pull
-                self.incumbent_perf = reward
-                self.incumbent = self.sub_bandits[arm_to_pull].incumbent
-            self.eval_dict.update(self.sub_bandits[arm_to_pull].eval_dict)
-            self.rewards[arm_to_pull].append(reward)
-            self.action_sequence.append(arm_to_pull)
-            self.final_rewards.append(reward)
-            self.time_records.append(time.time() - self.start_time)
-            # self.logger.info('The best performance found for %s is %.4f' % (arm_to_pull, reward))
-            self.pull_cnt += 1
+            self.update_arm_stats(arm_to_pull, reward, time.time() - _start_time)
             self.pick_id += 1
-
-            # Logger output
-            scores = list()
-            for _arm in self.arms:
-                scores.append(self.sub_bandits[_arm].incumbent_perf)
-            scores = np.array(scores)
-            self.logger.info('=' * 50)
-            self.logger.info('Node index: %s' % str(self.node_index))
-            self.logger.info('Best_algo_perf:  %s' % str(self.incumbent_perf))
-            self.logger.info('Best_algo_id:    %s' % str(self.optimal_algo_id))
-            self.logger.info('Arm candidates:  %s' % str(self.arms))
-            self.logger.info('Best val scores: %s' % str(list(scores)))
-            self.logger.info('=' * 50)
+            self.log_arm_scores()
+            if self.progressive_sampling and not self.sampling_finalized:
+                self.update_sampling_reserve(trial_num)
 
         # Eliminate arms after pulling each arm a few times.
         if self.pick_id == len(self.arm_candidate):
@@ -175,46 +261,316 @@ class ConditioningBlock(AbstractBlock):
             self.pick_id = 0
             # Update the arms until pulling each arm for at least alpha times.
             if self.update_cnt >= self.alpha:
-                # Update the upper/lower bound estimation.
-                budget_left = max(self.time_limit - (time.time() - self.start_time), 0)
-                avg_cost = np.array([np.mean(self.arm_cost_stats[_arm]) for _arm in self.arm_candidate]).mean()
-                steps = int(budget_left / avg_cost)
-                upper_bounds, lower_bounds = list(), list()
-
-                for _arm in self.arm_candidate:
-                    rewards = self.rewards[_arm]
-                    slope = (rewards[-1] - rewards[-self.alpha]) / self.alpha
-                    if self.time_limit is None:
-                        steps = self.trial_num - self.pull_cnt
-                    upper_bound = np.min([1.0, rewards[-1] + slope * steps])
-                    upper_bounds.append(upper_bound)
-                    lower_bounds.append(rewards[-1])
-                    self.best_lower_bounds[self.arms.index(_arm)] = rewards[-1]
-
-                # Reject the sub-optimal arms.
-                n = len(self.arm_candidate)
-                flags = [False] * n
-                for i in range(n):
-                    for j in range(n):
-                        if i != j:
-                            if upper_bounds[i] < lower_bounds[j]:
-                                flags[i] = True
-
-                if np.sum(flags) == n:
-                    self.logger.error('Removing all the arms simultaneously!')
-
-                self.logger.info('=' * 50)
-                self.logger.info('Node index: %s' % str(self.node_index))
-                self.logger.info('Candidates  : %s' % ','.join(self.arm_candidate))
-                self.logger.info('Upper bound : %s' % ','.join(['%.4f' % val for val in upper_bounds]))
-                self.logger.info('Lower bound : %s' % ','.join(['%.4f' % val for val in lower_bounds]))
-                self.logger.info(
-                    'Arms removed: %s' % [item for idx, item in enumerate(self.arm_candidate) if flags[idx]])
-                self.logger.info('=' * 50)
-
-                # Update arm_candidates.
-                self.arm_candidate = [item for index, item in enumerate(self.arm_candidate) if not flags[index]]
+                self.eliminate_arms()
+                if self.progressive_sampling and not self.sampling_finalized:
+                    self.promote_sample_ratio()
+
+        self.update_flags()
+        # The remaining arms are evaluated on the full data with the budget reserved for it.
+        if self.progressive_sampling and self.timeout_flag and not self.sampling_finalized:
+            self.finalize_sampling()
+        return self.incumbent_perf
+
+    def iterate_parallel(self, trial_num=10):
+        """
+            Keep up to n_arm_workers arms in flight, and update the rewards and the
+            elimination bounds as soon as any of them returns.
+        """
+        # Fill the idle workers with the least pulled arms.
+        _candidates = sorted(self.arm_candidate, key=lambda x: len(self.rewards[x]))
+        _active_arms = [_arm for _arm in _candidates if not self.sub_bandits[_arm].early_stop_flag]
+        # The cores and the memory are split among the arms that may run concurrently from now on.
+        n_active = max(min(self.n_arm_workers, len(_active_arms)), 1)
+        resource_manager = get_resource_manager()
+        arm_cores = max(resource_manager.n_cores // n_active, 1)
+        arm_memory = resource_manager.memory_limit / n_active
+        for _arm in _active_arms:
+            if len(self.running_arms) >= self.n_arm_workers:
+                break
+            if _arm in self.running_arms:
+                continue
+            self.logger.info('Optimize %s in the %d-th iteration with %d core(s)' % (_arm, self.pull_cnt, arm_cores))
+            if _arm not in self.arm_workers:
+                command_queue = multiprocessing.Queue()
+                result_conn, worker_conn = multiprocessing.Pipe(duplex=False)
+                _process = multiprocessing.Process(target=arm_worker,
+                                                   args=(_arm, self.sub_bandits[_arm], command_queue, worker_conn))
+                _process.daemon = False
+                _process.start()
+                # Only the worker writes to the pipe, so that reading from it fails once the worker exits.
+                worker_conn.close()
+                self.arm_workers[_arm] = (_process, command_queue, result_conn)
+            self.arm_workers[_arm][1].put((trial_num, arm_cores, arm_memory))
+            self.running_arms[_arm] = time.time()
+
+        # Wait until at least one arm returns, and collect the others returned meanwhile.
+        results = list()
+        timeout = None
+        while len(self.running_arms) > 0:
+            conns = dict((self.arm_workers[_arm][2], _arm) for _arm in self.running_arms
+                         if not any(result[0] == _arm for result in results))
+            ready_conns = wait(list(conns.keys()), timeout=timeout)
+            if len(ready_conns) == 0:
+                break
+            for result_conn in ready_conns:
+                _arm = conns[result_conn]
+                try:
+                    results.append(pkl.loads(result_conn.recv_bytes()))
+                except EOFError:
+                    self.arm_workers[_arm][0].join()
+                    results.append((_arm, None, None, None, None, 'Worker exited with code %s.'
+                                    % str(self.arm_workers[_arm][0].exitcode)))
+            timeout = 0
+
+        for arm, reward, time_taken, state, new_evals, error in results:
+            self.running_arms.pop(arm)
+            if error is not None:
+                self.logger.error('Pulling arm %s failed: %s' % (arm, error))
+                self.arm_candidate.remove(arm)
+                self.stop_worker(arm)
+                continue
+            # Mirror the sub-bandit owned by the worker.
+            sub_bandit = self.sub_bandits[arm]
+            for attr, value in state.items():
+                setattr(sub_bandit, attr, value)
+            sub_bandit.eval_dict.update(new_evals)
+            self.update_arm_stats(arm, reward, time_taken)
+        self.log_arm_scores()
+
+        # Eliminate arms once each candidate has been pulled for at least alpha times.
+        if len(results) > 0 and len(self.arm_candidate) > 0 and \
+                min([len(self.rewards[_arm]) for _arm in self.arm_candidate]) >= self.alpha:
+            self.eliminate_arms(n_concurrent_pulls=self.n_arm_workers)
+            # Reclaim the workers of eliminated arms.
+            for _arm in list(self.arm_workers.keys()):
+                if _arm not in self.arm_candidate:
+                    self.logger.info('Stop the worker of eliminated arm %s.' % _arm)
+                    self.running_arms.pop(_arm, None)
+                    self.stop_worker(_arm)
+
+        self.update_flags()
+        if self.early_stop_flag or self.timeout_flag:
+            self.terminate_workers()
+        return self.incumbent_perf
+
+    def stop_worker(self, arm):
+        self.stop_workers([arm])
+
+    def stop_workers(self, arms, timeout=STOP_TIMEOUT):
+        """
+            Ask the workers to exit after their current pulls, and kill the process groups, i.e., the workers and
+            the evaluations they started, of those still running after timeout seconds.
+        """
+        workers = [self.arm_workers.pop(_arm) for _arm in arms]
+        for _, command_queue, result_conn in workers:
+            command_queue.put(None)
+            # The results of the pulls in flight are discarded.
+            result_conn.close()
+        deadline = time.time() + timeout
+        for _process, _, _ in workers:
+            _process.join(max(deadline - time.time(), 0))
+            for sig, kill in [(signal.SIGTERM, _process.terminate), (signal.SIGKILL, _process.kill)]:
+                if not _process.is_alive():
+                    break
+                try:
+                    os.killpg(_process.pid, sig)
+                except ProcessLookupError:
+                    # The worker has not become a group leader yet.
+                    kill()
+                _process.join(1)
+            _process.join()
+
+    def terminate_workers(self):
+        self.stop_workers(list(self.arm_workers.keys()))
+        self.running_arms = dict()
+
+    def collect_running_evaluations(self, timeout=None):
+        # The arms in flight are discarded with their workers, which own the optimizers in parallel mode.
+        if self.parallel_arms:
+            self.terminate_workers()
+        super(ConditioningBlock, self).collect_running_evaluations(timeout=timeout)
+        for arm in self.arms:
+            if self.sub_bandits[arm].incumbent_perf > self.incumbent_perf:
+                self.optimal_algo_id = arm
+                self.incumbent_perf = self.sub_bandits[arm].incumbent_perf
+                self.incumbent = self.sub_bandits[arm].incumbent
+
+    def collect_sub_bandits(self):
+        """
+            Replace the mirrors of the idle arms with the sub-bandits owned by their workers,
+            which carry the states of the optimizers.
+        """
+        for _arm, (_process, command_queue, result_conn) in self.arm_workers.items():
+            if _arm in self.running_arms:
+                continue
+            command_queue.put(STATE_COMMAND)
+            try:
+                sub_bandit = pkl.loads(result_conn.recv_bytes())
+            except EOFError:
+                sub_bandit = None
+            if sub_bandit is not None:
+                self.sub_bandits[_arm] = sub_bandit
+
+    def warm_start(self, records):
+        # Pull the arms in the order of their performance in the previous run.
+        prior_arms = list()
+        for config, _ in records:
+            if config.get('algorithm') in self.arm_candidate and config['algorithm'] not in prior_arms:
+                prior_arms.append(config['algorithm'])
+        self.arm_candidate = prior_arms + [arm for arm in self.arm_candidate if arm not in prior_arms]
+        self.logger.info('Arm order after warm start: %s' % ','.join(self.arm_candidate))
+        for arm in self.arms:
+            self.sub_bandits[arm].warm_start([(config, perf) for config, perf in records
+                                              if config.get('algorithm') == arm])
+
+    def update_sampling_reserve(self, trial_num):
+        """
+            Reserve the budget to evaluate the best configurations of the remaining arms on the full data,
+            estimated by the cost of pulling them on the current sample. The sub-bandits time out earlier accordingly.
+        """
+        if self.time_limit is None:
+            return
+        costs = [np.mean(self.arm_cost_stats[_arm]) for _arm in self.arm_candidate
+                 if len(self.arm_cost_stats[_arm]) > 0]
+        if len(costs) == 0:
+            return
+        reserve = np.mean(costs) * len(self.arm_candidate) / self.sample_ratio * self.sampling_n_configs / trial_num
+        reserve = min(reserve, self.time_limit / 2)
+        for sub_bandit in self.sub_bandits.values():
+            sub_bandit.extend_time_limit(self.sampling_reserve - reserve)
+        self.sampling_reserve = reserve
+
+    def promote_sample_ratio(self):
+        """
+            Grow the sample for the remaining arms if the budget allows pulling each of them alpha times more.
+        """
+        sample_ratio = min(self.sample_ratio * self.sampling_eta, 1.0)
+        if self.time_limit is not None:
+            budget_left = self.time_limit - (time.time() - self.start_time) - self.sampling_reserve
+            next_cost = np.sum([np.mean(self.arm_cost_stats[_arm]) for _arm in self.arm_candidate]) * \
+                sample_ratio / self.sample_ratio * self.alpha
+            if budget_left < next_cost:
+                return
+
+        self.logger.info('Increase the sample ratio from %.4f to %.4f for arms: %s' % (
+            self.sample_ratio, sample_ratio, ','.join(self.arm_candidate)))
+        self.sample_ratio = sample_ratio
+        if self.sample_ratio >= 1:
+            self.release_sampling_reserve()
+        for _arm in self.arm_candidate:
+            self.sub_bandits[_arm].set_sample_ratio(self.sample_ratio, n_configs=self.sampling_n_configs)
+            # The rewards on different samples are not comparable.
+            self.rewards[_arm] = list()
+            self.arm_cost_stats[_arm] = list()
+        self.update_cnt = 0
+        self.pick_id = 0
+        self.incumbent_perf = -float("INF")
+
+    def release_sampling_reserve(self):
+        for sub_bandit in self.sub_bandits.values():
+            sub_bandit.extend_time_limit(self.sampling_reserve)
+        self.sampling_reserve = 0
+        self.sampling_finalized = True
+
+    def finalize_sampling(self):
+        """
+            Evaluate the best configurations of the remaining arms on the full data, so that their models
+            are saved for refitting and ensembling.
+        """
+        if not self.progressive_sampling or self.sampling_finalized:
+            return
+        self.release_sampling_reserve()
+        self.logger.info('Evaluate the best %d configurations of arms %s on the full data.' % (
+            self.sampling_n_configs, ','.join(self.arm_candidate)))
+        self.sample_ratio = 1.0
+        self.incumbent_perf = -float("INF")
+        for _arm in self.arm_candidate:
+            self.sub_bandits[_arm].set_sample_ratio(1.0, n_configs=self.sampling_n_configs)
+            _start_time = time.time()
+            reward = self.sub_bandits[_arm].iterate(trial_num=self.sampling_n_configs)
+            self.update_arm_stats(_arm, reward, time.time() - _start_time)
+        self.log_arm_scores()
+        self.update_flags()
+
+    def __getstate__(self):
+        # The worker processes and the pipes are not pickled; arms in flight are pulled again.
+        # In parallel mode, the idle workers send back their sub-bandits first, so that the optimizers of the arms
+        # resume where they stopped; the arms in flight keep the sub-bandits collected at the previous checkpoint.
+        self.collect_sub_bandits()
+        state = self.__dict__.copy()
+        state['arm_workers'] = dict()
+        state['running_arms'] = dict()
+        return state
+
+    def update_arm_stats(self, arm, reward, time_taken):
+        self.arm_cost_stats[arm].append(time_taken)
+        if reward > self.incumbent_perf:
+            self.optimal_algo_id = arm
+            self.incumbent_perf = reward
+            self.incumbent = self.sub_bandits[arm].incumbent
+        self.eval_dict.update(self.sub_bandits[arm].eval_dict)
+        self.rewards[arm].append(reward)
+        self.action_sequence.append(arm)
+        self.final_rewards.append(reward)
+        self.time_records.append(time.time() - self.start_time)
+        # self.logger.info('The best performance found for %s is %.4f' % (arm, reward))
+        self.pull_cnt += 1
+
+    def log_arm_scores(self):
+        scores = list()
+        for _arm in self.arms:
+            scores.append(self.sub_bandits[_arm].incumbent_perf)
+        scores = np.array(scores)
+        self.logger.info('=' * 50)
+        self.logger.info('Node index: %s' % str(self.node_index))
+        self.logger.info('Best_algo_perf:  %s' % str(self.incumbent_perf))
+        self.logger.info('Best_algo_id:    %s' % str(self.optimal_algo_id))
+        self.logger.info('Arm candidates:  %s' % str(self.arms))
+        self.logger.info('Best val scores: %s' % str(list(scores)))
+        self.logger.info('=' * 50)
+
+    def eliminate_arms(self, n_concurrent_pulls=1):
+        # Update the upper/lower bound estimation.
+        budget_left = max(self.time_limit - (time.time() - self.start_time), 0)
+        avg_cost = np.array([np.mean(self.arm_cost_stats[_arm]) for _arm in self.arm_candidate]).mean()
+        steps = int(budget_left / avg_cost) * n_concurrent_pulls
+        upper_bounds, lower_bounds = list(), list()
 
+        for _arm in self.arm_candidate:
+            rewards = self.rewards[_arm]
+            slope = (rewards[-1] - rewards[-self.alpha]) / self.alpha
+            if self.time_limit is None:
+                steps = self.trial_num - self.pull_cnt
+            upper_bound = np.min([1.0, rewards[-1] + slope * steps])
+            upper_bounds.append(upper_bound)
+            lower_bounds.append(rewards[-1])
+            self.best_lower_bounds[self.arms.index(_arm)] = rewards[-1]
+
+        # Reject the sub-optimal arms.
+        n = len(self.arm_candidate)
+        flags = [False] * n
+        for i in range(n):
+            for j in range(n):
+                if i != j:
+                    if upper_bounds[i] < lower_bounds[j]:
+                        flags[i] = True
+
+        if np.sum(flags) == n:
+            self.logger.error('Removing all the arms simultaneously!')
+
+        self.logger.info('=' * 50)
+        self.logger.info('Node index: %s' % str(self.node_index))
+        self.logger.info('Candidates  : %s' % ','.join(self.arm_candidate))
+        self.logger.info('Upper bound : %s' % ','.join(['%.4f' % val for val in upper_bounds]))
+        self.logger.info('Lower bound : %s' % ','.join(['%.4f' % val for val in lower_bounds]))
+        self.logger.info(
+            'Arms removed: %s' % [item for idx, item in enumerate(self.arm_candidate) if flags[idx]])
+        self.logger.info('=' * 50)
+
+        # Update arm_candidates.
+        self.arm_candidate = [item for index, item in enumerate(self.arm_candidate) if not flags[index]]
+
+    def update_flags(self):
         # Update stop flag
         self.early_stop_flag = True
         self.timeout_flag = False
@@ -227,5 +583,3 @@ class ConditioningBlock(AbstractBlock):
         for _arm in self.arm_candidate:
             if self.sub_bandits[_arm].timeout_flag:
                 self.timeout_flag = True
-
-        return self.incumbent_perf
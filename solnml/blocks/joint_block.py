@@ -3,6 +3,7 @@ from ConfigSpace import ConfigurationSpace
 
 from solnml.components.feature_engineering.transformation_graph import DataNode
 from solnml.components.utils.constants import CLS_TASKS
+from solnml.components.utils.warm_start import project_config
 from solnml.components.optimizers import build_hpo_optimizer
 from solnml.blocks.abstract_block import AbstractBlock
 
@@ -25,7 +26,8 @@ class JointBlock(AbstractBlock):
                  eval_type='holdout',
                  resampling_params=None,
                  n_jobs=1,
-                 seed=1):
+                 seed=1,
+                 acq_type='ei'):
         super(JointBlock, self).__init__(node_list, node_index, task_type, timestamp,
                                          fe_config_space, cash_config_space, data,
                                          fixed_config=fixed_config,
@@ -40,7 +42,8 @@ class JointBlock(AbstractBlock):
                                          eval_type=eval_type,
                                          resampling_params=resampling_params,
                                          n_jobs=n_jobs,
-                                         seed=seed)
+                                         seed=seed,
+                                         acq_type=acq_type)
 
         self.fixed_config = fixed_config
 
@@ -68,7 +71,8 @@ class JointBlock(AbstractBlock):
                 output_dir=self.output_dir,
                 seed=self.seed,
                 resampling_strategy=self.eval_type,
-                resampling_params=self.resampling_params)
+                resampling_params=self.resampling_params,
+                per_run_time_limit=self.per_run_time_limit)
         else:
             from solnml.components.evaluators.rgs_evaluator import RegressionEvaluator
             self.evaluator = RegressionEvaluator(
@@ -79,14 +83,19 @@ class JointBlock(AbstractBlock):
                 output_dir=self.output_dir,
                 seed=self.seed,
                 resampling_strategy=self.eval_type,
-                resampling_params=self.resampling_params)
+                resampling_params=self.resampling_params,
+                per_run_time_limit=self.per_run_time_limit)
 
-        self.optimizer = build_hpo_optimizer(self.eval_type, self.evaluator, self.joint_cs,
-                                             output_dir=self.output_dir,
-                                             per_run_time_limit=self.per_run_time_limit,
-                                             inner_iter_num_per_iter=1,
-                                             timestamp=self.timestamp,
-                                             seed=self.seed, n_jobs=self.n_jobs)
+        self.optimizer = self.build_optimizer()
+
+    def build_optimizer(self):
+        return build_hpo_optimizer(self.eval_type, self.evaluator, self.joint_cs,
+                                   output_dir=self.output_dir,
+                                   per_run_time_limit=self.per_run_time_limit,
+                                   inner_iter_num_per_iter=1,
+                                   timestamp=self.timestamp,
+                                   seed=self.seed, n_jobs=self.n_jobs,
+                                   acq_type=self.acq_type)
 
     def iterate(self, trial_num=10):
         self.optimizer.inner_iter_num_per_iter = trial_num
@@ -99,3 +108,36 @@ class JointBlock(AbstractBlock):
         self.incumbent = self.optimizer.incumbent_config.get_dictionary().copy()
         self.eval_dict = self.optimizer.eval_dict
         return self.incumbent_perf
+
+    def collect_running_evaluations(self, timeout=None):
+        self.optimizer.collect_running_evaluations(timeout=timeout)
+        self.incumbent_perf = self.optimizer.incumbent_perf
+        self.incumbent = self.optimizer.incumbent_config.get_dictionary().copy()
+        self.eval_dict = self.optimizer.eval_dict
+
+    def warm_start(self, records):
+        observations = list()
+        for config, perf in records:
+            _config = project_config(config, self.joint_cs)
+            if _config is not None and _config not in [config for config, _ in observations]:
+                observations.append((_config, perf))
+        if len(observations) > 0:
+            self.logger.info('Warm start block %s with %d prior observations.' % (self.node_index,
+                                                                                  len(observations)))
+            self.optimizer.add_prior_observations(observations)
+
+    def set_sample_ratio(self, sample_ratio, n_configs=3):
+        """
+            Evaluate on a sample of the training data from now on. The optimizer restarts
+            from the best n_configs configurations found with the previous sample ratio.
+        """
+        if sample_ratio == self.evaluator.sample_ratio:
+            return
+        self.evaluator.sample_ratio = sample_ratio
+        if len(self.optimizer.configs) == 0:
+            return
+        ranked_configs = sorted(zip(self.optimizer.configs, self.optimizer.perfs), key=lambda x: -x[1])
+        self.optimizer = self.build_optimizer()
+        self.optimizer.warm_start([config for config, _ in ranked_configs[:n_configs]])
+        self.incumbent_perf = -float("INF")
+        self.early_stop_flag = False
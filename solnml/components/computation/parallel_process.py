@@ -1,9 +1,39 @@
+import os
 import time
+import atexit
 import numpy as np
 from ConfigSpace import Configuration
 from multiprocessing import Manager
 from .base.nondaemonic_processpool import ProcessPool
 
+# The worker pool shared by the optimizers that keep evaluations in flight between their iterations, so that
+# no more than n_jobs evaluations run at once in this process, whichever optimizer submitted them.
+_shared_pool = None
+_shared_pool_pid = None
+
+
+def get_shared_pool(n_worker):
+    global _shared_pool, _shared_pool_pid
+    # A forked process, e.g., the worker of an arm, does not own the workers of its parent's pool.
+    if _shared_pool is None or _shared_pool_pid != os.getpid():
+        _shared_pool = ProcessPool(processes=n_worker)
+        _shared_pool_pid = os.getpid()
+    return _shared_pool
+
+
+def close_shared_pool():
+    """
+        Terminate the shared pool and the evaluations still running, e.g., at the end of the search.
+    """
+    global _shared_pool, _shared_pool_pid
+    if _shared_pool is not None and _shared_pool_pid == os.getpid():
+        _shared_pool.terminate()
+        _shared_pool.join()
+    _shared_pool, _shared_pool_pid = None, None
+
+
+atexit.register(close_shared_pool)
+
 
 def execute_func(evaluator, config, resource_ratio, eta, first_iter, rw_lock):
     start_time = time.time()
@@ -19,9 +49,13 @@ def execute_func(evaluator, config, resource_ratio, eta, first_iter, rw_lock):
 
 
 class ParallelProcessEvaluator(object):
-    def __init__(self, evaluator, n_worker=1):
+    def __init__(self, evaluator, n_worker=1, shared=False):
+        """
+        :param shared: if True, submit to the pool shared in this process, see get_shared_pool.
+        """
         self.evaluator = evaluator
         self.n_worker = n_worker
+        self.shared = shared
         self.process_pool = None
         self.rwlock = Manager().Lock()
 
@@ -46,12 +80,31 @@ class ParallelProcessEvaluator(object):
 
         return evaluation_result
 
-    # def shutdown(self):
-    #     self.process_pool.close()
+    def submit(self, param, resource_ratio=1., eta=3, first_iter=False):
+        """
+            Evaluate one configuration asynchronously, res.get() returns (score, time_taken).
+        """
+        return self.process_pool.apply_async(execute_func, (self.evaluator, param, resource_ratio, eta,
+                                                            first_iter, self.rwlock))
 
-    def __enter__(self):
-        self.process_pool = ProcessPool(processes=self.n_worker)
+    def start(self):
+        if self.shared:
+            self.process_pool = get_shared_pool(self.n_worker)
+        else:
+            self.process_pool = ProcessPool(processes=self.n_worker)
         return self
 
+    def shutdown(self):
+        """
+            Stop accepting evaluations, the workers exit after the evaluations submitted.
+            The shared pool is left to close_shared_pool.
+        """
+        if self.process_pool is not None and not self.shared:
+            self.process_pool.close()
+        self.process_pool = None
+
+    def __enter__(self):
+        return self.start()
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.process_pool.close()
+        self.shutdown()
@@ -0,0 +1,81 @@
+import os
+from contextlib import contextmanager
+
+# The default memory budget (in MB) shared by the concurrent trials.
+DEFAULT_MEMORY_LIMIT = 2048
+
+
+class ResourceManager(object):
+    def __init__(self, n_cores=None, n_concurrent_trials=1, memory_limit=None):
+        """
+            Split a global core and memory budget among the trials running concurrently.
+        :param n_cores: total number of cores available, default to os.cpu_count().
+        :param n_concurrent_trials: number of trials evaluated at the same time.
+        :param memory_limit: total memory (in MB) for the working data of the trials, default to DEFAULT_MEMORY_LIMIT.
+        """
+        self.n_cores = n_cores if n_cores is not None else (os.cpu_count() or 1)
+        if self.n_cores < 1:
+            raise ValueError('The number of cores should be positive: %d!' % self.n_cores)
+        self.memory_limit = memory_limit if memory_limit is not None else DEFAULT_MEMORY_LIMIT
+        if self.memory_limit <= 0:
+            raise ValueError('The memory limit should be positive: %s!' % str(self.memory_limit))
+        self.n_concurrent_trials = 1
+        self.set_concurrency(n_concurrent_trials)
+
+    def set_concurrency(self, n_concurrent_trials):
+        if n_concurrent_trials < 1:
+            raise ValueError('The number of concurrent trials should be positive: %d!' % n_concurrent_trials)
+        self.n_concurrent_trials = n_concurrent_trials
+
+    @property
+    def trial_threads(self):
+        """
+            Number of threads each trial is allowed to use.
+        """
+        return max(self.n_cores // self.n_concurrent_trials, 1)
+
+    @property
+    def trial_memory(self):
+        """
+            Memory (in bytes) each trial is allowed to use for its working data.
+        """
+        return int(self.memory_limit * 1024 * 1024 / self.n_concurrent_trials)
+
+    def assign_estimator(self, estimator):
+        if hasattr(estimator, 'n_jobs'):
+            setattr(estimator, 'n_jobs', self.trial_threads)
+        return estimator
+
+    @contextmanager
+    def limit_threads(self):
+        """
+            Bound the BLAS/OpenMP thread pools to the per-trial budget.
+        """
+        from threadpoolctl import threadpool_limits
+        with threadpool_limits(limits=self.trial_threads):
+            yield
+
+
+_resource_manager = ResourceManager(n_cores=1)
+
+
+def get_resource_manager():
+    return _resource_manager
+
+
+def set_resource_manager(n_cores=None, n_concurrent_trials=1, memory_limit=None):
+    """
+        Reset the process-wide resource manager; worker processes forked afterwards inherit it.
+    """
+    global _resource_manager
+    _resource_manager = ResourceManager(n_cores=n_cores, n_concurrent_trials=n_concurrent_trials,
+                                        memory_limit=memory_limit)
+    return _resource_manager
+
+
+def get_trial_threads():
+    return _resource_manager.trial_threads
+
+
+def get_trial_memory():
+    return _resource_manager.trial_memory
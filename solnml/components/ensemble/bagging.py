@@ -14,14 +14,18 @@ class Bagging(BaseEnsembleModel):
                  ensemble_size: int,
                  task_type: int,
                  metric: _BaseScorer,
-                 output_dir=None):
+                 output_dir=None,
+                 resampling_params=None,
+                 seed=1):
         super().__init__(stats=stats,
                          data_node=data_node,
                          ensemble_method='bagging',
                          ensemble_size=ensemble_size,
                          task_type=task_type,
                          metric=metric,
-                         output_dir=output_dir)
+                         output_dir=output_dir,
+                         resampling_params=resampling_params,
+                         seed=seed)
 
     def fit(self, datanode):
         return self
@@ -8,6 +8,7 @@ from solnml.components.utils.constants import CLS_TASKS
 from solnml.components.ensemble.unnamed_ensemble import choose_base_models_classification, \
     choose_base_models_regression
 from solnml.components.feature_engineering.parse import construct_node
+from solnml.components.utils.topk_saver import load_validation_predictions
 from solnml.utils.logging_utils import get_logger
 
 
@@ -19,7 +20,13 @@ class BaseEnsembleModel(object):
                  task_type: int,
                  metric: _BaseScorer,
                  data_node,
-                 output_dir=None):
+                 output_dir=None,
+                 resampling_params=None,
+                 seed=1):
+        """
+        :param resampling_params: the resampling parameters and the seed of the evaluators, with which the
+            validation predictions are rebuilt on the same split as the recorded ones.
+        """
         self.stats = stats
         self.ensemble_method = ensemble_method
         self.ensemble_size = ensemble_size
@@ -27,6 +34,8 @@ class BaseEnsembleModel(object):
         self.metric = metric
         self.output_dir = output_dir
         self.node = data_node
+        self.resampling_params = resampling_params
+        self.seed = seed
 
         self.predictions = []
         self.train_labels = None
@@ -37,33 +46,18 @@ class BaseEnsembleModel(object):
         for algo_id in self.stats.keys():
             model_to_eval = self.stats[algo_id]
             for idx, (_, _, path) in enumerate(model_to_eval):
-                with open(path, 'rb')as f:
-                    op_list, model, _ = pkl.load(f)
-                _node = self.node.copy_()
-                _node = construct_node(_node, op_list)
-
-                # TODO: Test size
-                test_size = 0.33
-                X, y = _node.data
-
-                if self.task_type in CLS_TASKS:
-                    ss = StratifiedShuffleSplit(n_splits=1, test_size=test_size, random_state=1)
+                # Reuse the validation predictions recorded by the evaluator if possible.
+                recorded = load_validation_predictions(path)
+                if recorded is not None:
+                    y_valid_pred, y_valid = recorded
                 else:
-                    ss = ShuffleSplit(n_splits=1, test_size=test_size, random_state=1)
-
-                for train_index, val_index in ss.split(X, y):
-                    X_valid = X[val_index]
-                    y_valid = y[val_index]
+                    y_valid_pred, y_valid = self._rebuild_validation_predictions(path)
 
                 if self.train_labels is not None:
                     assert (self.train_labels == y_valid).all()
                 else:
                     self.train_labels = y_valid
 
-                if self.task_type in CLS_TASKS:
-                    y_valid_pred = model.predict_proba(X_valid)
-                else:
-                    y_valid_pred = model.predict(X_valid)
                 self.predictions.append(y_valid_pred)
 
         if len(self.predictions) < self.ensemble_size:
@@ -76,16 +70,47 @@ class BaseEnsembleModel(object):
             self.base_model_mask = choose_base_models_classification(np.array(self.predictions),
                                                                      self.ensemble_size)
         else:
-            self.base_model_mask = choose_base_models_regression(np.array(self.predictions), np.array(y_valid),
+            self.base_model_mask = choose_base_models_regression(np.array(self.predictions), np.array(self.train_labels),
                                                                  self.ensemble_size)
         self.ensemble_size = sum(self.base_model_mask)
 
+    def _rebuild_validation_predictions(self, model_path):
+        with open(model_path, 'rb')as f:
+            op_list, model, _ = pkl.load(f)
+        _node = self.node.copy_()
+        _node = construct_node(_node, op_list)
+
+        # The same split as the holdout evaluators.
+        if self.resampling_params is None or 'test_size' not in self.resampling_params:
+            test_size = 0.33
+        else:
+            test_size = self.resampling_params['test_size']
+        X, y = _node.data
+
+        if self.task_type in CLS_TASKS:
+            ss = StratifiedShuffleSplit(n_splits=1, test_size=test_size, random_state=self.seed)
+        else:
+            ss = ShuffleSplit(n_splits=1, test_size=test_size, random_state=self.seed)
+
+        for train_index, val_index in ss.split(X, y):
+            X_valid = X[val_index]
+            y_valid = y[val_index]
+
+        if self.task_type in CLS_TASKS:
+            y_valid_pred = model.predict_proba(X_valid)
+        else:
+            y_valid_pred = model.predict(X_valid)
+        return y_valid_pred, y_valid
+
     def fit(self, data):
         raise NotImplementedError
 
     def predict(self, data):
         raise NotImplementedError
 
+    def get_serving_members(self):
+        raise ValueError("%s is not supported for serving!" % self.ensemble_method)
+
     def get_ens_model_info(self):
         raise NotImplementedError
 
@@ -17,14 +17,20 @@ class Blending(BaseEnsembleModel):
                  task_type: int,
                  metric: _BaseScorer,
                  output_dir=None,
-                 meta_learner='lightgbm'):
+                 resampling_params=None,
+                 seed=1,
+                 meta_learner='lightgbm',
+                 per_run_time_limit=None):
         super().__init__(stats=stats,
                          data_node=data_node,
                          ensemble_method='blending',
                          ensemble_size=ensemble_size,
                          task_type=task_type,
                          metric=metric,
-                         output_dir=output_dir)
+                         output_dir=output_dir,
+                         resampling_params=resampling_params,
+                         seed=seed)
+        self.per_run_time_limit = per_run_time_limit
         try:
             from lightgbm import LGBMClassifier
         except:
@@ -79,7 +85,9 @@ class Blending(BaseEnsembleModel):
                 if self.base_model_mask[model_cnt] == 1:
                     estimator = fetch_predict_estimator(self.task_type, algo_id, config, x_p1, y_p1,
                                                         weight_balance=_node.enable_balance,
-                                                        data_balance=_node.data_balance)
+                                                        data_balance=_node.data_balance,
+                                                        data_shape=data.data[0].shape,
+                                                        per_run_time_limit=self.per_run_time_limit)
                     with open(os.path.join(self.output_dir, '%s-blending-model%d' % (self.timestamp, model_cnt)),
                               'wb') as f:
                         pkl.dump(estimator, f)
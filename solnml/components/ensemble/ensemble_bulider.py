@@ -15,7 +15,15 @@ class EnsembleBuilder:
                  ensemble_size: int,
                  task_type: int,
                  metric: _BaseScorer,
-                 output_dir=None):
+                 output_dir=None,
+                 per_run_time_limit=None,
+                 resampling_params=None,
+                 seed=1):
+        """
+        :param per_run_time_limit: the time limit of a trial in the evaluation, with which the base models
+            of blending and stacking are refitted the same as they were evaluated.
+        :param resampling_params: the resampling parameters and the seed of the evaluators.
+        """
         self.model = None
         if ensemble_method == 'bagging':
             self.model = Bagging(stats=stats,
@@ -23,28 +31,38 @@ class EnsembleBuilder:
                                  ensemble_size=ensemble_size,
                                  task_type=task_type,
                                  metric=metric,
-                                 output_dir=output_dir)
+                                 output_dir=output_dir,
+                                 resampling_params=resampling_params,
+                                 seed=seed)
         elif ensemble_method == 'blending':
             self.model = Blending(stats=stats,
                                   data_node=data_node,
                                   ensemble_size=ensemble_size,
                                   task_type=task_type,
                                   metric=metric,
-                                  output_dir=output_dir)
+                                  output_dir=output_dir,
+                                  resampling_params=resampling_params,
+                                  seed=seed,
+                                  per_run_time_limit=per_run_time_limit)
         elif ensemble_method == 'stacking':
             self.model = Stacking(stats=stats,
                                   data_node=data_node,
                                   ensemble_size=ensemble_size,
                                   task_type=task_type,
                                   metric=metric,
-                                  output_dir=output_dir)
+                                  output_dir=output_dir,
+                                  resampling_params=resampling_params,
+                                  seed=seed,
+                                  per_run_time_limit=per_run_time_limit)
         elif ensemble_method == 'ensemble_selection':
             self.model = EnsembleSelection(stats=stats,
                                            data_node=data_node,
                                            ensemble_size=ensemble_size,
                                            task_type=task_type,
                                            metric=metric,
-                                           output_dir=output_dir)
+                                           output_dir=output_dir,
+                                           resampling_params=resampling_params,
+                                           seed=seed)
         else:
             raise ValueError("%s is not supported for ensemble!" % ensemble_method)
 
@@ -57,5 +75,8 @@ class EnsembleBuilder:
     def refit(self):
         return self.model.refit()
 
+    def get_serving_members(self):
+        return self.model.get_serving_members()
+
     def get_ens_model_info(self):
         return self.model.get_ens_model_info()
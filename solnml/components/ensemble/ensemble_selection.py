@@ -7,6 +7,7 @@ from sklearn.metrics.scorer import _BaseScorer, _PredictScorer, _ThresholdScorer
 from solnml.components.utils.constants import *
 from solnml.components.ensemble.base_ensemble import BaseEnsembleModel
 from solnml.components.feature_engineering.parse import construct_node
+from solnml.components.metrics.fast_metrics import FastMetric, get_fast_metric_name
 
 
 class EnsembleSelection(BaseEnsembleModel):
@@ -16,6 +17,8 @@ class EnsembleSelection(BaseEnsembleModel):
             task_type: int,
             metric: _BaseScorer,
             output_dir=None,
+            resampling_params=None,
+            seed=1,
             sorted_initialization: bool = False,
             mode: str = 'fast'
     ):
@@ -25,15 +28,33 @@ class EnsembleSelection(BaseEnsembleModel):
                          ensemble_size=ensemble_size,
                          task_type=task_type,
                          metric=metric,
-                         output_dir=output_dir)
+                         output_dir=output_dir,
+                         resampling_params=resampling_params,
+                         seed=seed)
         self.model_idx = list()
         self.sorted_initialization = sorted_initialization
         self.mode = mode
         self.encoder = OneHotEncoder()
         self.shape = self.predictions[0].shape
         self.random_state = np.random.RandomState(1)
+        # Metric kernel on the training labels, None if the metric is not supported.
+        self.fast_metric = None
+
+    def build_fast_metric(self, labels):
+        name = get_fast_metric_name(self.metric)
+        if name is None:
+            return None
+        y_true = labels
+        if name == 'auc' and len(labels.shape) == 1:
+            y_true = self.encoder.transform(np.reshape(labels, (len(labels), 1))).toarray()
+        try:
+            return FastMetric(name, y_true)
+        except ValueError:
+            return None
 
     def calculate_score(self, pred, y_true):
+        if self.fast_metric is not None and y_true is self.train_labels:
+            return self.fast_metric.score(pred) * self.metric._sign
         if isinstance(self.metric, _ThresholdScorer):
             if len(y_true.shape) == 1:
                 y_true = self.encoder.transform(np.reshape(y_true, (len(y_true), 1))).toarray()
@@ -56,6 +77,7 @@ class EnsembleSelection(BaseEnsembleModel):
         if self.mode not in ('fast', 'slow'):
             raise ValueError('Unknown mode %s' % self.mode)
 
+        self.fast_metric = self.build_fast_metric(self.train_labels)
         self._fit(self.predictions, self.train_labels)
         self._calculate_weights()
         self.identifiers_ = None
@@ -86,6 +108,8 @@ class EnsembleSelection(BaseEnsembleModel):
         order = []
 
         ensemble_size = self.ensemble_size
+        if self.fast_metric is not None and labels is self.train_labels:
+            stacked_predictions = np.asarray(predictions)
 
         if self.sorted_initialization:
             n_best = 20
@@ -112,8 +136,15 @@ class EnsembleSelection(BaseEnsembleModel):
 
                 weighted_ensemble_prediction = (s / float(s + 1)) * \
                                                ensemble_prediction
+            if self.fast_metric is not None and labels is self.train_labels:
+                # Score all the candidates in one batch.
+                fant_ensemble_predictions = weighted_ensemble_prediction + (1. / float(s + 1)) * stacked_predictions
+                scores[:] = -self.fast_metric.score_batch(fant_ensemble_predictions) * self.metric._sign
+                predictions_to_score = list()
+            else:
+                predictions_to_score = predictions
             fant_ensemble_prediction = np.zeros(weighted_ensemble_prediction.shape)
-            for j, pred in enumerate(predictions):
+            for j, pred in enumerate(predictions_to_score):
                 # TODO: this could potentially be vectorized! - let's profile
                 # the script first!
                 if self.task_type in CLS_TASKS:
@@ -296,6 +327,22 @@ class EnsembleSelection(BaseEnsembleModel):
     def get_validation_performance(self):
         return self.trajectory_[-1]
 
+    def get_serving_members(self):
+        """
+            The members with positive weight, a list of (weight, op_list, estimator).
+        """
+        members = list()
+        cur_idx = 0
+        for algo_id in self.stats.keys():
+            model_to_eval = self.stats[algo_id]
+            for idx, (_, _, path) in enumerate(model_to_eval):
+                if self.weights_[cur_idx] > 0:
+                    with open(path, 'rb')as f:
+                        op_list, estimator, _ = pkl.load(f)
+                    members.append((self.weights_[cur_idx], op_list, estimator))
+                cur_idx += 1
+        return members
+
     def get_ens_model_info(self):
         model_cnt = 0
         ens_info = {}
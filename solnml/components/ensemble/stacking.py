@@ -17,15 +17,21 @@ class Stacking(BaseEnsembleModel):
                  task_type: int,
                  metric: _BaseScorer,
                  output_dir=None,
+                 resampling_params=None,
+                 seed=1,
                  meta_learner='lightgbm',
-                 kfold=5):
+                 kfold=5,
+                 per_run_time_limit=None):
         super().__init__(stats=stats,
                          data_node=data_node,
                          ensemble_method='stacking',
                          ensemble_size=ensemble_size,
                          task_type=task_type,
                          metric=metric,
-                         output_dir=output_dir)
+                         output_dir=output_dir,
+                         resampling_params=resampling_params,
+                         seed=seed)
+        self.per_run_time_limit = per_run_time_limit
 
         self.kfold = kfold
         try:
@@ -82,7 +88,9 @@ class Stacking(BaseEnsembleModel):
                         x_p1, x_p2, y_p1, _ = X[train], X[test], y[train], y[test]
                         estimator = fetch_predict_estimator(self.task_type, algo_id, config, x_p1, y_p1,
                                                             weight_balance=data.enable_balance,
-                                                            data_balance=data.data_balance)
+                                                            data_balance=data.data_balance,
+                                                            data_shape=data.data[0].shape,
+                                                            per_run_time_limit=self.per_run_time_limit)
                         with open(
                                 os.path.join(self.output_dir, '%s-model%d_part%d' % (self.timestamp, model_cnt, j)),
                                 'wb') as f:
@@ -3,11 +3,20 @@ from solnml.components.metrics.metric import get_metric
 from solnml.components.utils.constants import *
 
 
-def fetch_predict_estimator(task_type, estimator_id, config, X_train, y_train, weight_balance=0, data_balance=0):
+def fetch_predict_estimator(task_type, estimator_id, config, X_train, y_train, weight_balance=0, data_balance=0,
+                            data_shape=None, per_run_time_limit=None):
+    """
+    :param data_shape: the shape of the full training data, from which the kernel SVMs are chosen exact
+        or approximate the same as in the evaluation, default to the shape of X_train.
+    :param per_run_time_limit: the time limit of a trial in the evaluation.
+    """
     # Build the ML estimator.
     from solnml.components.utils.balancing import get_weights, smote
+    from solnml.components.utils.model_util import set_kernel_approximation
     _fit_params = {}
     config_dict = config.copy()
+    set_kernel_approximation(config_dict, estimator_id, data_shape if data_shape is not None else X_train.shape,
+                             per_run_time_limit)
     if weight_balance == 1:
         _init_params, _fit_params = get_weights(
             y_train, estimator_id, None, {}, {})
@@ -25,6 +34,29 @@ def fetch_predict_estimator(task_type, estimator_id, config, X_train, y_train, w
     return estimator
 
 
+def sample_data_node(data_node, sample_ratio, stratify=True, seed=1):
+    """
+        Draw a sample of the data node, stratified by the labels for classification.
+    """
+    from sklearn.model_selection import ShuffleSplit, StratifiedShuffleSplit
+    from solnml.components.feature_engineering.transformation_graph import DataNode
+    X, y = data_node.data
+    try:
+        splitter = StratifiedShuffleSplit if stratify else ShuffleSplit
+        _, sample_index = next(splitter(n_splits=1, test_size=sample_ratio, random_state=seed).split(X, y))
+    except ValueError:
+        # Some classes have too few samples to stratify.
+        _, sample_index = next(ShuffleSplit(n_splits=1, test_size=sample_ratio, random_state=seed).split(X, y))
+    sample_node = DataNode([X[sample_index], y[sample_index]], data_node.feature_types.copy(), data_node.task_type,
+                           data_node.feature_names.copy() if data_node.feature_names is not None else None)
+    sample_node.trans_hist = data_node.trans_hist.copy()
+    sample_node.depth = data_node.depth
+    sample_node.enable_balance = data_node.enable_balance
+    sample_node.data_balance = data_node.data_balance
+    sample_node.config = data_node.config
+    return sample_node
+
+
 class _BaseEvaluator(metaclass=ABCMeta):
     def __init__(self, estimator, metric, task_type,
                  evaluation_strategy, **evaluation_params):
@@ -11,6 +11,7 @@ from solnml.utils.logging_utils import get_logger
 from solnml.components.utils.constants import IMG_CLS
 from solnml.components.evaluators.base_evaluator import _BaseEvaluator
 from solnml.components.evaluators.base_dl_evaluator import TopKModelSaver
+from solnml.components.utils.instrumentation import create_recorder
 from solnml.components.evaluators.dl_evaluate_func import dl_holdout_validation
 from solnml.components.models.img_classification.nn_utils.nn_aug.aug_hp_space import get_transforms
 from .base_dl_evaluator import TopKModelSaver, get_estimator
@@ -37,19 +38,22 @@ class DLEvaluator(_BaseEvaluator):
             self.image_size = kwargs['image_size']
 
     def __call__(self, config, **kwargs):
-        if self.task_type == IMG_CLS:
-            data_transforms = get_transforms(config, image_size=self.image_size)
-            self.dataset.load_data(data_transforms['train'], data_transforms['val'])
-        else:
-            self.dataset.load_data()
+        config_dict = config.get_dictionary().copy()
+        epoch_ratio = kwargs.get('resource_ratio', 1.0)
+        recorder = create_recorder(algorithm=config_dict['estimator'], evaluator=self.__class__.__name__,
+                                   resource_ratio=epoch_ratio)
+
+        with recorder.stage('load_data'):
+            if self.task_type == IMG_CLS:
+                data_transforms = get_transforms(config, image_size=self.image_size)
+                self.dataset.load_data(data_transforms['train'], data_transforms['val'])
+            else:
+                self.dataset.load_data()
         start_time = time.time()
         return_dict = dict()
 
-        config_dict = config.get_dictionary().copy()
-
         classifier_id, estimator = get_estimator(self.task_type, config_dict, self.max_epoch, device=self.device)
 
-        epoch_ratio = kwargs.get('resource_ratio', 1.0)
         eta = kwargs.get('eta', 3)
         first_iter = kwargs.get('first_iter', False)
 
@@ -78,7 +82,10 @@ class DLEvaluator(_BaseEvaluator):
             return time_cost
 
         try:
-            score = dl_holdout_validation(estimator, self.scorer, self.dataset, random_state=self.seed, **kwargs)
+            # Training and validation are interleaved across epochs.
+            with recorder.stage('fit'):
+                score = dl_holdout_validation(estimator, self.scorer, self.dataset, random_state=self.seed,
+                                              **kwargs)
         except Exception as e:
             self.logger.error(e)
             score = -np.inf
@@ -96,7 +103,8 @@ class DLEvaluator(_BaseEvaluator):
                      'scheduler': estimator.scheduler.state_dict(),
                      'epoch_num': estimator.epoch_num,
                      'early_stop': estimator.early_stop}
-            torch.save(state, config_model_path)
+            with recorder.stage('save'):
+                torch.save(state, config_model_path)
 
         # Save top K models with the largest validation scores.
         if 'rw_lock' not in kwargs or kwargs['rw_lock'] is None:
@@ -111,7 +119,8 @@ class DLEvaluator(_BaseEvaluator):
                          'scheduler': estimator.scheduler.state_dict(),
                          'epoch_num': estimator.epoch_num,
                          'early_stop': estimator.early_stop}
-                torch.save(state, model_path)
+                with recorder.stage('save'):
+                    torch.save(state, model_path)
                 self.logger.info("Model saved to %s" % model_path)
 
             # In case of double-deletion
@@ -122,6 +131,7 @@ class DLEvaluator(_BaseEvaluator):
             except:
                 pass
         lock.release()
+        recorder.finish(score=self.scorer._sign * score)
 
         # Turn it into a minimization problem.
         return_dict['score'] = -score
@@ -3,6 +3,7 @@ import numpy as np
 from sklearn.model_selection import StratifiedKFold, KFold, StratifiedShuffleSplit, ShuffleSplit
 
 from solnml.components.utils.balancing import smote
+from solnml.components.utils.instrumentation import NullRecorder
 
 
 def get_onehot_y(encoder, y):
@@ -98,7 +99,13 @@ def partial_validation(estimator, scorer, X, y, data_subsample_ratio, test_size=
 
 
 def validation(estimator, scorer, X_train, y_train, X_val, y_val, fit_params=None, onehot=None,
-               random_state=1):
+               random_state=1, recorder=None, pred_method=None):
+    """
+    :param pred_method: 'predict' or 'predict_proba', if given the scorer is a FastScorer, and the predictions
+        on the validation set are returned along with the score, i.e., (score, y_pred).
+    """
+    if recorder is None:
+        recorder = NullRecorder()
     with warnings.catch_warnings():
         # ignore all caught warnings
         warnings.filterwarnings("ignore")
@@ -108,7 +115,14 @@ def validation(estimator, scorer, X_train, y_train, X_val, y_val, fit_params=Non
                 _fit_params['sample_weight'] = fit_params['sample_weight']
             elif 'data_balance' in fit_params:
                 X_train, y_train = smote(X_train, y_train)
-        estimator.fit(X_train, y_train, **_fit_params)
+        with recorder.stage('fit') as info:
+            info['data'] = X_train
+            estimator.fit(X_train, y_train, **_fit_params)
         if onehot is not None:
             y_val = get_onehot_y(onehot, y_val)
-        return scorer(estimator, X_val, y_val)
+        # The scorer runs the prediction on the validation set.
+        with recorder.stage('score') as info:
+            info['data'] = X_val
+            if pred_method is not None:
+                return scorer.score_predictions(estimator, X_val, y_val, pred_method)
+            return scorer(estimator, X_val, y_val)
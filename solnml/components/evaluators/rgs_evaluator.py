@@ -7,11 +7,16 @@ import pickle as pkl
 from sklearn.metrics.scorer import balanced_accuracy_scorer
 
 from solnml.utils.logging_utils import get_logger
-from solnml.components.evaluators.base_evaluator import _BaseEvaluator
+from solnml.components.evaluators.base_evaluator import _BaseEvaluator, sample_data_node
 from solnml.components.evaluators.evaluate_func import validation
 from solnml.components.feature_engineering.task_space import get_task_hyperparameter_space
 from solnml.components.feature_engineering.parse import parse_config, construct_node
-from solnml.components.utils.topk_saver import CombinedTopKModelSaver
+from solnml.components.computation.resource_manager import get_resource_manager
+from solnml.components.utils.instrumentation import create_recorder
+from solnml.components.utils.topk_saver import CombinedTopKModelSaver, save_validation_predictions
+from solnml.components.utils.eval_memo import get_evaluation_memo
+from solnml.components.utils.model_util import set_kernel_approximation
+from solnml.components.metrics.fast_metrics import FastScorer
 from solnml.components.utils.class_loader import get_combined_candidtates
 from solnml.components.models.regression import _regressors, _addons
 from solnml.components.utils.constants import *
@@ -30,8 +35,7 @@ def get_estimator(config, estimator_id):
 
     _candidates = get_combined_candidtates(_regressors, _addons)
     estimator = _candidates[regressor_type](**hpo_config)
-    if hasattr(estimator, 'n_jobs'):
-        setattr(estimator, 'n_jobs', 1)
+    get_resource_manager().assign_estimator(estimator)
     return regressor_type, estimator
 
 
@@ -85,12 +89,16 @@ def get_combined_cs(task_type=REGRESSION, include_image=False, include_text=Fals
 
 class RegressionEvaluator(_BaseEvaluator):
     def __init__(self, fixed_config=None, scorer=None, data_node=None, task_type=REGRESSION, resampling_strategy='cv',
-                 resampling_params=None, timestamp=None, output_dir=None, seed=1):
+                 resampling_params=None, timestamp=None, output_dir=None, seed=1, per_run_time_limit=None):
         self.resampling_strategy = resampling_strategy
         self.resampling_params = resampling_params
+        # The time limit of a trial, used to choose the exact or approximate kernel SVMs.
+        self.per_run_time_limit = per_run_time_limit
 
         self.fixed_config = fixed_config
         self.scorer = scorer if scorer is not None else balanced_accuracy_scorer
+        # Score with the vectorized metric kernels, the label encodings are computed once per validation set.
+        self.fast_scorer = FastScorer(self.scorer)
         self.task_type = task_type
         self.data_node = data_node
         self.output_dir = output_dir
@@ -101,10 +109,66 @@ class RegressionEvaluator(_BaseEvaluator):
 
         self.train_node = data_node.copy_()
         self.val_node = data_node.copy_()
+        # Ratio of the data evaluated on, used in progressive sampling.
+        self.sample_ratio = 1.0
+        self._sample_node = None
 
         self.timestamp = timestamp
 
+    def __getstate__(self):
+        # The train/val nodes are scratch space overwritten in each evaluation, rebuild them after unpickling.
+        state = self.__dict__.copy()
+        state['train_node'], state['val_node'] = None, None
+        state['_sample_node'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.train_node = self.data_node.copy_()
+        self.val_node = self.data_node.copy_()
+
+    def get_data_node(self):
+        if self.sample_ratio >= 1:
+            return self.data_node
+        if self._sample_node is None or self._sample_node[0] != self.sample_ratio:
+            self._sample_node = (self.sample_ratio, sample_data_node(self.data_node, self.sample_ratio,
+                                                                     stratify=False, seed=self.seed))
+        return self._sample_node[1]
+
+    def save_model(self, model_path, op_list, clf, score, y_pred, y_val, recorder):
+        """
+        :param y_pred: the predictions on the validation set returned by validation().
+        """
+        if os.path.exists(model_path):
+            with open(model_path, 'rb') as f:
+                _, _, perf = pkl.load(f)
+            if score <= perf:
+                return
+        with recorder.stage('save'):
+            with open(model_path, 'wb') as f:
+                pkl.dump([op_list, clf, score], f)
+            save_validation_predictions(model_path, y_pred, y_val)
+
     def __call__(self, config, **kwargs):
+        # The same full configuration may be suggested by several optimizers in the run, evaluate it once.
+        memo = get_evaluation_memo()
+        key = memo.get_key(config, self.fixed_config,
+                           data=self.data_node.profile.fingerprint,
+                           output_dir=self.output_dir,
+                           timestamp=self.timestamp,
+                           resampling_strategy=self.resampling_strategy,
+                           resource_ratio=kwargs.get('resource_ratio', 1.0),
+                           sample_ratio=self.sample_ratio)
+        result = memo.lookup(key)
+        if result is not None:
+            self.logger.debug('Evaluation memo hit, skip the evaluation.')
+            return result
+        with get_resource_manager().limit_threads():
+            result = self._evaluate(config, **kwargs)
+        memo.add(key, result)
+        return result
+
+    def _evaluate(self, config, **kwargs):
         start_time = time.time()
         return_dict = dict()
         self.seed = 1
@@ -118,6 +182,8 @@ class RegressionEvaluator(_BaseEvaluator):
         if self.fixed_config is not None:
             config.update(self.fixed_config)
         self.estimator_id = config['algorithm']
+        recorder = create_recorder(algorithm=self.estimator_id, evaluator=self.__class__.__name__,
+                                   resampling_strategy=self.resampling_strategy, resource_ratio=downsample_ratio)
 
         if 'holdout' in self.resampling_strategy:
             # Prepare data node.
@@ -131,38 +197,37 @@ class RegressionEvaluator(_BaseEvaluator):
 
                 from sklearn.model_selection import ShuffleSplit
                 ss = ShuffleSplit(n_splits=1, test_size=test_size, random_state=self.seed)
-                for train_index, test_index in ss.split(self.data_node.data[0], self.data_node.data[1]):
-                    _x_train, _x_val = self.data_node.data[0][train_index], self.data_node.data[0][test_index]
-                    _y_train, _y_val = self.data_node.data[1][train_index], self.data_node.data[1][test_index]
+                _data_node = self.get_data_node()
+                with recorder.stage('split'):
+                    for train_index, test_index in ss.split(_data_node.data[0], _data_node.data[1]):
+                        _x_train, _x_val = _data_node.data[0][train_index], _data_node.data[0][test_index]
+                        _y_train, _y_val = _data_node.data[1][train_index], _data_node.data[1][test_index]
                 self.train_node.data = [_x_train, _y_train]
                 self.val_node.data = [_x_val, _y_val]
 
-                data_node, op_list = parse_config(self.train_node, config, record=True)
+                data_node, op_list = parse_config(self.train_node, config, record=True,
+                                                  recorder=recorder)
                 _val_node = self.val_node.copy_()
-                _val_node = construct_node(_val_node, op_list)
+                with recorder.stage('fe_transform') as info:
+                    _val_node = construct_node(_val_node, op_list)
+                    info['data'] = _val_node.data[0]
 
             _x_train, _y_train = data_node.data
             _x_val, _y_val = _val_node.data
 
             config_dict = config.copy()
+            set_kernel_approximation(config_dict, self.estimator_id, self.data_node.data[0].shape,
+                                     self.per_run_time_limit)
             # regression gadgets
             regressor_id, clf = get_estimator(config_dict, self.estimator_id)
 
-            score = validation(clf, self.scorer, _x_train, _y_train, _x_val, _y_val,
-                               random_state=self.seed)
+            score, y_pred = validation(clf, self.fast_scorer, _x_train, _y_train, _x_val, _y_val,
+                                       random_state=self.seed, recorder=recorder, pred_method='predict')
 
-            if np.isfinite(score):
+            if np.isfinite(score) and self.sample_ratio >= 1:
                 model_path = CombinedTopKModelSaver.get_path_by_config(self.output_dir, config, self.timestamp)
 
-                if not os.path.exists(model_path):
-                    with open(model_path, 'wb') as f:
-                        pkl.dump([op_list, clf, score], f)
-                else:
-                    with open(model_path, 'rb') as f:
-                        _, _, perf = pkl.load(f)
-                    if score > perf:
-                        with open(model_path, 'wb') as f:
-                            pkl.dump([op_list, clf, score], f)
+                self.save_model(model_path, op_list, clf, score, y_pred, _y_val, recorder)
 
                 self.logger.info("Model saved to %s" % model_path)
 
@@ -181,24 +246,30 @@ class RegressionEvaluator(_BaseEvaluator):
                 scores = list()
 
                 for train_index, test_index in kfold.split(self.data_node.data[0], self.data_node.data[1]):
-                    _x_train, _x_val = self.data_node.data[0][train_index], self.data_node.data[0][test_index]
-                    _y_train, _y_val = self.data_node.data[1][train_index], self.data_node.data[1][test_index]
+                    with recorder.stage('split'):
+                        _x_train, _x_val = self.data_node.data[0][train_index], self.data_node.data[0][test_index]
+                        _y_train, _y_val = self.data_node.data[1][train_index], self.data_node.data[1][test_index]
                     self.train_node.data = [_x_train, _y_train]
                     self.val_node.data = [_x_val, _y_val]
 
-                    data_node, op_list = parse_config(self.train_node, config, record=True)
+                    data_node, op_list = parse_config(self.train_node, config, record=True,
+                                                      recorder=recorder)
                     _val_node = self.val_node.copy_()
-                    _val_node = construct_node(_val_node, op_list)
+                    with recorder.stage('fe_transform') as info:
+                        _val_node = construct_node(_val_node, op_list)
+                        info['data'] = _val_node.data[0]
 
                     _x_train, _y_train = data_node.data
                     _x_val, _y_val = _val_node.data
 
                     config_dict = config.copy()
+                    set_kernel_approximation(config_dict, self.estimator_id, self.data_node.data[0].shape,
+                                             self.per_run_time_limit)
                     # regressor gadgets
                     regressor_id, clf = get_estimator(config_dict, self.estimator_id)
 
-                    _score = validation(clf, self.scorer, _x_train, _y_train, _x_val, _y_val,
-                                        random_state=self.seed)
+                    _score = validation(clf, self.fast_scorer, _x_train, _y_train, _x_val, _y_val,
+                                        random_state=self.seed, recorder=recorder)
                     scores.append(_score)
                 score = np.mean(scores)
 
@@ -214,15 +285,19 @@ class RegressionEvaluator(_BaseEvaluator):
 
                 from sklearn.model_selection import ShuffleSplit
                 ss = ShuffleSplit(n_splits=1, test_size=test_size, random_state=self.seed)
-                for train_index, test_index in ss.split(self.data_node.data[0], self.data_node.data[1]):
-                    _x_train, _x_val = self.data_node.data[0][train_index], self.data_node.data[0][test_index]
-                    _y_train, _y_val = self.data_node.data[1][train_index], self.data_node.data[1][test_index]
+                with recorder.stage('split'):
+                    for train_index, test_index in ss.split(self.data_node.data[0], self.data_node.data[1]):
+                        _x_train, _x_val = self.data_node.data[0][train_index], self.data_node.data[0][test_index]
+                        _y_train, _y_val = self.data_node.data[1][train_index], self.data_node.data[1][test_index]
                 self.train_node.data = [_x_train, _y_train]
                 self.val_node.data = [_x_val, _y_val]
 
-                data_node, op_list = parse_config(self.train_node, config, record=True)
+                data_node, op_list = parse_config(self.train_node, config, record=True,
+                                                  recorder=recorder)
                 _val_node = self.val_node.copy_()
-                _val_node = construct_node(_val_node, op_list)
+                with recorder.stage('fe_transform') as info:
+                    _val_node = construct_node(_val_node, op_list)
+                    info['data'] = _val_node.data[0]
 
             _x_train, _y_train = data_node.data
 
@@ -238,35 +313,31 @@ class RegressionEvaluator(_BaseEvaluator):
             _x_val, _y_val = _val_node.data
 
             config_dict = config.copy()
+            set_kernel_approximation(config_dict, self.estimator_id, self.data_node.data[0].shape,
+                                     self.per_run_time_limit)
             # Regressor gadgets
             regressor_id, clf = get_estimator(config_dict, self.estimator_id)
 
-            score = validation(clf, self.scorer, _act_x_train, _act_y_train, _x_val, _y_val,
-                               random_state=self.seed)
+            score, y_pred = validation(clf, self.fast_scorer, _act_x_train, _act_y_train, _x_val, _y_val,
+                                       random_state=self.seed, recorder=recorder, pred_method='predict')
 
             if np.isfinite(score) and downsample_ratio == 1:
                 model_path = CombinedTopKModelSaver.get_path_by_config(self.output_dir, config, self.timestamp)
 
-                if not os.path.exists(model_path):
-                    with open(model_path, 'wb') as f:
-                        pkl.dump([op_list, clf, score], f)
-                else:
-                    with open(model_path, 'rb') as f:
-                        _, _, perf = pkl.load(f)
-                    if score > perf:
-                        with open(model_path, 'wb') as f:
-                            pkl.dump([op_list, clf, score], f)
+                self.save_model(model_path, op_list, clf, score, y_pred, _y_val, recorder)
 
                 self.logger.info("Model saved to %s" % model_path)
 
         else:
             raise ValueError('Invalid resampling strategy: %s!' % self.resampling_strategy)
 
+        recorder.finish(score=self.scorer._sign * score)
         try:
-            self.logger.info('Evaluation<%s> | Score: %.4f | Time cost: %.2f seconds | Shape: %s' %
+            self.logger.info('Evaluation<%s> | Score: %.4f | Time cost: %.2f seconds | Shape: %s | Threads: %d' %
                              (regressor_id,
                               self.scorer._sign * score,
-                              time.time() - start_time, _x_train.shape))
+                              time.time() - start_time, _x_train.shape,
+                              get_resource_manager().trial_threads))
         except:
             pass
 
@@ -1,6 +1,7 @@
 import os
 import abc
 from solnml.components.utils.constants import CLS_TASKS, CLASSIFICATION, CATEGORICAL, ORDINAL
+from solnml.components.utils.dtype_utils import check_dtype
 from solnml.components.feature_engineering.transformation_graph import DataNode
 from solnml.components.feature_engineering.transformations.preprocessor.imputer import ImputationTransformation
 from solnml.components.feature_engineering.transformations.preprocessor.onehot_encoder import \
@@ -25,8 +26,10 @@ class FEPipeline(object, metaclass=abc.ABCMeta):
                  mem_limit_per_trans=1024,
                  fe_enabled=True, evaluator=None, debug=False, seed=1,
                  tmp_directory='logs', logging_config=None, model_id=None,
-                 task_id='Default'):
+                 task_id='Default', dtype=None):
         self.fe_enabled = fe_enabled
+        # The compute dtype of the features, e.g., 'float32' to halve the memory.
+        self.dtype = check_dtype(dtype)
         self.trans_set = trans_set
         self.maximum_evaluation_num = maximum_evaluation_num
         self.time_budget = time_budget
@@ -138,6 +141,8 @@ class FEPipeline(object, metaclass=abc.ABCMeta):
         if self.task_type is None or self.task_type in CLS_TASKS:
             # Label encoding.
             input_node = self.encode_label(input_node)
+        if self.dtype is not None:
+            input_node = input_node.astype(self.dtype)
         return input_node
 
     def fit_transform(self, data_node: DataNode):
@@ -3,16 +3,55 @@ from solnml.components.feature_engineering.transformations import _bal_balancer,
 from solnml.components.utils.class_loader import get_combined_fe_candidtates
 from solnml.components.feature_engineering.transformation_graph import DataNode
 from solnml.components.feature_engineering.task_space import stage_list, thirdparty_candidates_dict
+from solnml.components.feature_engineering.transformations.densifier import Densifier
+from solnml.components.utils.instrumentation import NullRecorder
+from solnml.components.utils.constants import CLS_TASKS
+from solnml.components.utils.sparse_utils import accepts_sparse
+from solnml.components.utils.dtype_utils import is_float32, requires_float64
+
+
+def get_model_class(task_type, algo_id):
+    from solnml.components.utils.class_loader import get_combined_candidtates
+    if task_type in CLS_TASKS:
+        from solnml.components.models.classification import _classifiers, _addons
+        from solnml.components.models.imbalanced_classification import _imb_classifiers
+        _candidates = get_combined_candidtates(_classifiers, _addons)
+        _candidates.update({key: val for key, val in _imb_classifiers.items() if key not in _candidates})
+    else:
+        from solnml.components.models.regression import _regressors, _addons
+        _candidates = get_combined_candidtates(_regressors, _addons)
+    return _candidates.get(algo_id, None)
 
 
-def parse_config(data_node: DataNode, config: dict, record=False, skip_balance=False, if_imbal=False):
+def operate_node(tran, node: DataNode):
+    """
+        Apply the transformer, the sparse data are densified first if the transformer does not support them.
+        The float32 data stay in float32, and are only cast to float64 for the transformers that require it.
+    """
+    if node.is_sparse and not accepts_sparse(tran):
+        node = Densifier().operate(node)
+    if not is_float32(node.data[0]):
+        return tran.operate(node)
+    if requires_float64(tran):
+        node = node.astype('float64')
+    output_node = tran.operate(node)
+    if not is_float32(output_node.data[0]):
+        output_node = output_node.astype('float32')
+    return output_node
+
+
+def parse_config(data_node: DataNode, config: dict, record=False, skip_balance=False, if_imbal=False,
+                 recorder=None):
     """
         Transform the data node based on the pipeline specified by configuration.
     :param data_node:
     :param config:
     :param record:
+    :param recorder: TrialRecorder that times each FE stage.
     :return: the resulting data node.
     """
+    if recorder is None:
+        recorder = NullRecorder()
     _preprocessor_candidates = get_combined_fe_candidtates(_preprocessor, _gen_addons)
     _preprocessor_candidates = get_combined_fe_candidtates(_preprocessor_candidates, _sel_addons)
     _rescaler_candidates = get_combined_fe_candidtates(_rescaler, _res_addons)
@@ -32,14 +71,16 @@ def parse_config(data_node: DataNode, config: dict, record=False, skip_balance=F
     if text_pre_id:
         config_dict.pop('text_preprocessor')
 
-    def tran_operate(id, tran_set, config, node):
+    def tran_operate(id, tran_set, config, node, stage):
         _config = {}
         for key in config:
             if id in key:
                 config_name = key.split(':')[1]
                 _config[config_name] = config[key]
         tran = tran_set[id](**_config)
-        output_node = tran.operate(node)
+        with recorder.stage('fe:%s' % stage, operator=id) as info:
+            output_node = operate_node(tran, node)
+            info['data'] = output_node.data[0]
         return output_node, tran
 
     _node = data_node.copy_()
@@ -47,12 +88,12 @@ def parse_config(data_node: DataNode, config: dict, record=False, skip_balance=F
 
     # Image preprocessor
     if image_pre_id:
-        _node, image_tran = tran_operate(image_pre_id, _image_preprocessor, config_dict, _node)
+        _node, image_tran = tran_operate(image_pre_id, _image_preprocessor, config_dict, _node, 'image_preprocessor')
         tran_dict['image_preprocessor'] = image_tran
 
     # Text preprocessor
     if text_pre_id:
-        _node, text_tran = tran_operate(text_pre_id, _text_preprocessor, config_dict, _node)
+        _node, text_tran = tran_operate(text_pre_id, _text_preprocessor, config_dict, _node, 'text_preprocessor')
         tran_dict['text_preprocessor'] = text_tran
 
     for stage in stage_list:
@@ -69,17 +110,24 @@ def parse_config(data_node: DataNode, config: dict, record=False, skip_balance=F
             op_id = config_dict[stage]
             config_dict.pop(stage)
         if stage == 'preprocessor':
-            _node, tran = tran_operate(op_id, _preprocessor_candidates, config_dict, _node)
+            _node, tran = tran_operate(op_id, _preprocessor_candidates, config_dict, _node, stage)
         elif stage == 'rescaler':
-            _node, tran = tran_operate(op_id, _rescaler_candidates, config_dict, _node)
+            _node, tran = tran_operate(op_id, _rescaler_candidates, config_dict, _node, stage)
         elif stage == 'balancer':
-            _node, tran = tran_operate(op_id, _balancer_candidates, config_dict, _node)
+            _node, tran = tran_operate(op_id, _balancer_candidates, config_dict, _node, stage)
         else:
             # Third party stage
-            _node, tran = tran_operate(op_id, thirdparty_candidates_dict[stage], config_dict, _node)
+            _node, tran = tran_operate(op_id, thirdparty_candidates_dict[stage], config_dict, _node, stage)
 
         tran_dict[stage] = tran
 
+    # Models that support sparse inputs, e.g., lightgbm and liblinear, receive the sparse data as is.
+    if _node.is_sparse and 'algorithm' in config:
+        model_class = get_model_class(_node.task_type, config['algorithm'])
+        if model_class is None or not accepts_sparse(model_class):
+            tran_dict['densifier'] = Densifier()
+            _node = tran_dict['densifier'].operate(_node)
+
     _node.config = config
     if record:
         return _node, tran_dict
@@ -88,13 +136,16 @@ def parse_config(data_node: DataNode, config: dict, record=False, skip_balance=F
 
 def construct_node(data_node: DataNode, tran_dict, mode='test'):
     if 'image_preprocessor' in tran_dict:
-        data_node = tran_dict['image_preprocessor'].operate(data_node)
+        data_node = operate_node(tran_dict['image_preprocessor'], data_node)
 
     if 'text_preprocessor' in tran_dict:
-        data_node = tran_dict['text_preprocessor'].operate(data_node)
+        data_node = operate_node(tran_dict['text_preprocessor'], data_node)
 
     for stage in stage_list:
-        if stage_list == 'balancer' and mode == 'test':
+        if stage == 'balancer' and mode == 'test':
             continue
-        data_node = tran_dict[stage].operate(data_node)
+        data_node = operate_node(tran_dict[stage], data_node)
+
+    if 'densifier' in tran_dict:
+        data_node = tran_dict['densifier'].operate(data_node)
     return data_node
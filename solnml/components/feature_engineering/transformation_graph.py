@@ -1,10 +1,13 @@
 import numpy as np
 from solnml.components.utils.constants import CATEGORICAL
+from solnml.components.utils import sparse_utils
+from solnml.components.utils.data_profile import DataProfile
 
 
 class DataNode(object):
     def __init__(self, data=None, feature_type=None, task_type=None, feature_names=None):
         self.task_type = task_type
+        self._profile = None
         self.data = data
         self.feature_types = feature_type
         self.feature_names = feature_names
@@ -21,9 +24,16 @@ class DataNode(object):
         if isinstance(node, DataNode):
             if self.shape != node.shape:
                 return False
-            X1 = self.data[0].astype("float64")
-            X2 = node.data[0].astype("float64")
-            X_flag = np.isclose(X1, X2).all()
+            if self.is_sparse or node.is_sparse:
+                X_flag = np.isclose(abs(self.data[0] - node.data[0]).max(), 0)
+            else:
+                # Only the non-float features are cast, the float32 data are compared as is.
+                X1, X2 = self.data[0], node.data[0]
+                if X1.dtype.kind != 'f':
+                    X1 = X1.astype("float64")
+                if X2.dtype.kind != 'f':
+                    X2 = X2.astype("float64")
+                X_flag = np.isclose(X1, X2).all()
             y_flag = np.isclose(self.data[1], node.data[1]).all()
             if X_flag and y_flag:
                 return True
@@ -33,7 +43,7 @@ class DataNode(object):
         X1, y1 = self.copy_().data
         X2, y2 = other.copy_().data
         feat_types = self.feature_types.copy()
-        X = np.vstack((X1, X2))
+        X = sparse_utils.vstack((X1, X2))
         y = np.vstack((y1, y2))
         return DataNode(data=[X, y], feature_type=feat_types)
 
@@ -47,6 +57,26 @@ class DataNode(object):
         new_node.enable_balance = self.enable_balance
         new_node.data_balance = self.data_balance
         new_node.config = self.config
+        # The copied data are the same, so are their statistics.
+        if self._profile is not None and self._profile.is_valid_for(*self.data[:2]):
+            new_node._profile = self._profile.rebind(*new_node.data[:2])
+        return new_node
+
+    def astype(self, dtype):
+        """
+            Return a node whose features are cast to dtype, e.g., float32 to halve the memory.
+            The arrays are shared with the current node if they already have the dtype.
+        """
+        X, y = self.data
+        if getattr(X, 'dtype', None) != dtype:
+            X = X.astype(dtype)
+        new_node = DataNode([X, y], self.feature_types.copy(), self.task_type,
+                            self.feature_names.copy() if self.feature_names is not None else None)
+        new_node.trans_hist = self.trans_hist.copy()
+        new_node.depth = self.depth
+        new_node.enable_balance = self.enable_balance
+        new_node.data_balance = self.data_balance
+        new_node.config = self.config
         return new_node
 
     def set_values(self, node):
@@ -64,6 +94,35 @@ class DataNode(object):
         self.feature_types = node.feature_types.copy()
         self.task_type = node.task_type
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._profile = None
+
+    def __setstate__(self, state):
+        # The nodes pickled before the profile was added.
+        if 'data' in state:
+            state['_data'] = state.pop('data')
+        state['_profile'] = state.get('_profile')
+        self.__dict__.update(state)
+
+    @property
+    def profile(self):
+        """
+            The cached DataProfile of the data: class histogram, imbalance, column statistics and fingerprint.
+            It is recomputed if the features or the labels are replaced.
+        """
+        X, y = self.data[0], self.data[1]
+        feature_types = list(self.feature_types) if self.feature_types is not None else None
+        if self._profile is None or not self._profile.is_valid_for(X, y) or \
+                self._profile.feature_types != feature_types:
+            self._profile = DataProfile(X, y, feature_types=self.feature_types, task_type=self.task_type)
+        return self._profile
+
     @property
     def node_id(self):
         return self._node_id
@@ -75,6 +134,10 @@ class DataNode(object):
             cnt += 1 if feature_type == CATEGORICAL else 0
         return cnt
 
+    @property
+    def is_sparse(self):
+        return sparse_utils.is_sparse(self.data[0])
+
     @property
     def shape(self):
         assert self.data[0].shape[1] == len(self.feature_types)
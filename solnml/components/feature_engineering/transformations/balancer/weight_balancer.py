@@ -14,3 +14,9 @@ class WeightBalancer(Transformer):
             output_datanode.enable_balance = 1
         output_datanode.trans_hist.append(self.type)
         return output_datanode
+
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['input'] = (DENSE, SPARSE, UNSIGNED_DATA)
+        return properties
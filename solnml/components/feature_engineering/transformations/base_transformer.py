@@ -4,7 +4,14 @@ import pandas as pd
 
 from solnml.components.utils.utils import *
 from solnml.components.utils.constants import *
+from solnml.components.utils import sparse_utils
 from solnml.components.feature_engineering.transformation_graph import DataNode
+from solnml.components.computation.resource_manager import get_trial_memory
+
+# The generators fit on at least MIN_FIT_ROWS rows and transform at least MIN_CHUNK_ROWS rows at a time,
+# whatever the memory budget of the trial.
+MIN_FIT_ROWS = 1000
+MIN_CHUNK_ROWS = 100
 
 
 class Transformer(object, metaclass=abc.ABCMeta):
@@ -39,6 +46,7 @@ class Transformer(object, metaclass=abc.ABCMeta):
         25: discrete_categorizer.
         ----
         26: merger.
+        27: densifier.
         30: percentile_selector_regression.
         31: extra_trees_based_selector_regression
         32: cross_feature
@@ -121,8 +129,10 @@ class Transformer(object, metaclass=abc.ABCMeta):
                 'handles_multiclass': True,
                 'handles_multilabel': True,
                 'is_deterministic': True,
-                'input': (DENSE, SPARSE, UNSIGNED_DATA),
-                'output': (INPUT,)}
+                'input': (DENSE, UNSIGNED_DATA),
+                'output': (INPUT,),
+                # np.float64 if the transformer needs double precision internally.
+                'preferred_dtype': None}
 
 
 def ease_trans(func):
@@ -151,6 +161,9 @@ def ease_trans(func):
 
         args = (trans, input, target_fields)
         _X = func(*args)
+        # Keep float32 data in float32.
+        if getattr(X, 'dtype', None) == np.float32 and _X.dtype != np.float32:
+            _X = _X.astype(np.float32)
         if isinstance(trans.output_type, list):
             trans.output_type = trans.output_type[0]
         _types = [trans.output_type] * _X.shape[1]
@@ -159,21 +172,19 @@ def ease_trans(func):
             new_X = _X
             new_types = _types
         elif trans.compound_mode == 'concatenate':
-            new_X = np.hstack((X, _X))
+            new_X = sparse_utils.hstack((X, _X))
             new_types = input.feature_types.copy()
             new_types.extend(_types)
         elif trans.compound_mode == 'replace':
-            new_X = np.hstack((X, _X))
+            new_X = sparse_utils.hstack((X, _X))
             new_types = input.feature_types.copy()
             new_types.extend(_types)
-            new_X = np.delete(new_X, target_fields, axis=1)
+            new_X = sparse_utils.delete_columns(new_X, target_fields)
             temp_array = np.array(new_types)
             new_types = list(np.delete(temp_array, target_fields))
         else:
             assert _X.shape[1] == len(target_fields)
-            new_X = X.copy()
-            new_X = new_X.astype(float)
-            new_X[:, target_fields] = _X
+            new_X = sparse_utils.replace_columns(X, target_fields, _X)
             new_types = input.feature_types.copy()
 
         output_datanode = DataNode((new_X, y), new_types, input.task_type)
@@ -185,3 +196,66 @@ def ease_trans(func):
         return output_datanode
 
     return dec
+
+
+def get_row_budget(row_bytes, min_rows=MIN_CHUNK_ROWS):
+    """
+        The number of rows that fit in the memory budget of the trial.
+    :param row_bytes: the working memory (in bytes) needed per row.
+    """
+    return max(min_rows, int(get_trial_memory() // max(row_bytes, 1)))
+
+
+def sample_fit_rows(input_datanode, X, max_rows, random_state=1):
+    """
+        A subsample of at most max_rows rows to fit a transformer on, stratified by the labels for classification.
+    :param X: the rows of input_datanode to sample, e.g., the target fields only.
+    :return: the sampled X and y.
+    """
+    from sklearn.model_selection import ShuffleSplit, StratifiedShuffleSplit
+    y = input_datanode.data[1]
+    n_samples = X.shape[0]
+    max_rows = max(int(max_rows), MIN_FIT_ROWS)
+    if n_samples <= max_rows:
+        return X, y
+    splitter = ShuffleSplit(n_splits=1, train_size=max_rows, random_state=random_state)
+    if y is not None and input_datanode.task_type in CLS_TASKS and np.ndim(y) == 1:
+        splitter = StratifiedShuffleSplit(n_splits=1, train_size=max_rows, random_state=random_state)
+    try:
+        sample_index, _ = next(splitter.split(np.zeros((n_samples, 1)), y))
+    except ValueError:
+        # Some classes have too few samples to stratify.
+        sample_index, _ = next(ShuffleSplit(n_splits=1, train_size=max_rows,
+                                            random_state=random_state).split(np.zeros((n_samples, 1))))
+    sample_index = np.sort(sample_index)
+    return X[sample_index], (y[sample_index] if y is not None else None)
+
+
+def transform_in_chunks(transform, X, row_bytes):
+    """
+        Apply transform to X chunk by chunk, so that each chunk fits in the memory budget of the trial,
+        and write the results into a preallocated output array.
+    :param transform: a function that maps the rows of X to the rows of the output.
+    :param row_bytes: the working memory (in bytes) of transform per row.
+    """
+    n_samples = X.shape[0]
+    chunk_rows = get_row_budget(row_bytes)
+    if n_samples <= chunk_rows:
+        return transform(X)
+
+    output, sparse_chunks = None, list()
+    for start in range(0, n_samples, chunk_rows):
+        _X = transform(X[start: start + chunk_rows])
+        if sparse_utils.is_sparse(_X):
+            sparse_chunks.append(_X)
+            continue
+        if output is None:
+            # Keep float32 data in float32, as ease_trans does.
+            dtype = _X.dtype
+            if getattr(X, 'dtype', None) == np.float32 and _X.dtype.kind == 'f':
+                dtype = np.float32
+            output = np.empty((n_samples, _X.shape[1]), dtype=dtype)
+        output[start: start + _X.shape[0]] = _X
+    if sparse_chunks:
+        return sparse_utils.vstack(sparse_chunks)
+    return output
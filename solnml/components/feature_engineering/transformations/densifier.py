@@ -0,0 +1,26 @@
+from solnml.components.feature_engineering.transformations.base_transformer import *
+
+
+class Densifier(Transformer):
+    type = 27
+
+    def __init__(self):
+        super().__init__("densifier")
+
+    def operate(self, input_datanode: DataNode, target_fields=None):
+        if not input_datanode.is_sparse:
+            return input_datanode
+        X, y = input_datanode.data
+        output_datanode = DataNode((sparse_utils.to_dense(X), y), input_datanode.feature_types.copy(),
+                                   input_datanode.task_type, feature_names=input_datanode.feature_names)
+        output_datanode.trans_hist = input_datanode.trans_hist.copy()
+        output_datanode.trans_hist.append(self.type)
+        output_datanode.enable_balance = input_datanode.enable_balance
+        output_datanode.data_balance = input_datanode.data_balance
+        return output_datanode
+
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['input'] = (DENSE, SPARSE, UNSIGNED_DATA)
+        return properties
@@ -0,0 +1,141 @@
+import numpy as np
+
+from solnml.components.utils.constants import CLS_TASKS
+from solnml.components.utils.data_profile import array_fingerprint
+from solnml.components.computation.resource_manager import get_trial_threads
+
+# The estimator settings that do not change the importances.
+_IGNORED_PARAMS = ['n_jobs', 'verbose']
+
+
+def compute_importances(input_datanode, target_fields, method, sample_weight=None, **params):
+    """
+        Fit the estimator of the method on the target fields and return its feature importances,
+        a classifier for the classification tasks and a regressor otherwise.
+    :param method: 'lightgbm', fitted on a sample within the memory budget of the trial,
+        or 'extra_trees', whose params are those of the forest.
+    """
+    from solnml.components.feature_engineering.transformations.base_transformer import sample_fit_rows, \
+        get_row_budget, MIN_FIT_ROWS
+    X, y = input_datanode.data
+    X_new = X[:, target_fields]
+    is_classification = input_datanode.task_type in CLS_TASKS
+
+    if method == 'lightgbm':
+        from lightgbm import LGBMClassifier, LGBMRegressor
+        estimator_class = LGBMClassifier if is_classification else LGBMRegressor
+        params.setdefault('random_state', 1)
+        params.setdefault('n_jobs', get_trial_threads())
+        estimator = estimator_class(**params)
+        # The binned copy of the sample.
+        _X, _y = sample_fit_rows(input_datanode, X_new, get_row_budget(16 * X_new.shape[1], MIN_FIT_ROWS),
+                                 params['random_state'])
+        estimator.fit(_X, _y)
+    elif method == 'extra_trees':
+        from sklearn.ensemble import ExtraTreesClassifier, ExtraTreesRegressor
+        estimator_class = ExtraTreesClassifier if is_classification else ExtraTreesRegressor
+        estimator = estimator_class(**params)
+        estimator.fit(X_new, y, sample_weight=sample_weight)
+    else:
+        raise ValueError('Invalid importance method: %s!' % method)
+    return np.asarray(estimator.feature_importances_, dtype=np.float64)
+
+
+class FeatureImportanceCache(object):
+    def __init__(self, enabled=True):
+        """
+            Run-wide record of the feature importances, shared by all the transformers that rank the features,
+            so that the same importances (data, target fields and method) are computed only once.
+        :param enabled: if False, every lookup misses and nothing is recorded.
+        """
+        self.enabled = enabled
+        self.records = dict()
+        self.n_queries = 0
+        self.n_hits = 0
+
+    @staticmethod
+    def get_key(input_datanode, target_fields, method, sample_weight=None, **params):
+        # The values are compared by repr, e.g., class_weight may be a dict.
+        params = [(key, repr(value)) for key, value in sorted(params.items()) if key not in _IGNORED_PARAMS]
+        weight_key = array_fingerprint(sample_weight) if sample_weight is not None else None
+        return (input_datanode.profile.fingerprint, input_datanode.task_type,
+                tuple(int(field) for field in target_fields), method, weight_key) + tuple(params)
+
+    def get_or_compute(self, key, compute):
+        """
+            The record of the key, computed by compute() at the first query.
+        """
+        if not self.enabled:
+            return compute()
+        self.n_queries += 1
+        if key in self.records:
+            self.n_hits += 1
+        else:
+            self.records[key] = compute()
+        return self.records[key]
+
+    def get_importances(self, input_datanode, target_fields, method, sample_weight=None, **params):
+        """
+            The feature importances of the target fields, see compute_importances.
+        """
+        key = self.get_key(input_datanode, target_fields, method, sample_weight=sample_weight, **params)
+        importances = self.get_or_compute(key, lambda: compute_importances(
+            input_datanode, target_fields, method, sample_weight=sample_weight, **params))
+        return importances.copy()
+
+    @property
+    def hit_rate(self):
+        return self.n_hits / self.n_queries if self.n_queries > 0 else 0.
+
+    def get_stats(self):
+        return {'queries': self.n_queries, 'hits': self.n_hits, 'hit_rate': self.hit_rate}
+
+
+class SupportSelector(object):
+    def __init__(self, support):
+        """
+            Select the features of a boolean mask, with the interface of the sklearn selectors.
+        """
+        self.support = np.asarray(support, dtype=bool)
+
+    def get_support(self):
+        return self.support
+
+    def transform(self, X):
+        return X[:, np.nonzero(self.support)[0]]
+
+
+class ImportanceSelector(SupportSelector):
+    def __init__(self, importances):
+        """
+            Select the features whose importance is at least the mean importance,
+            the same as SelectFromModel(threshold='mean') on the fitted estimator.
+        """
+        self.importances = np.asarray(importances)
+        self.threshold = np.mean(self.importances)
+        super().__init__(self.importances >= self.threshold)
+
+
+def rank_features(importances, target_fields, n_features=None):
+    """
+        The target fields sorted by decreasing importance, the first n_features of them if given.
+    """
+    order = np.argsort(-np.asarray(importances))
+    ranked_fields = [target_fields[idx] for idx in order]
+    return ranked_fields[:n_features] if n_features is not None else ranked_fields
+
+
+_importance_cache = FeatureImportanceCache()
+
+
+def get_importance_cache():
+    return _importance_cache
+
+
+def set_importance_cache(enabled=True):
+    """
+        Reset the process-wide importance cache, e.g., at the beginning of each run.
+    """
+    global _importance_cache
+    _importance_cache = FeatureImportanceCache(enabled=enabled)
+    return _importance_cache
@@ -1,6 +1,7 @@
 from ConfigSpace.configuration_space import ConfigurationSpace
 from ConfigSpace.hyperparameters import CategoricalHyperparameter
-from solnml.components.feature_engineering.transformations.base_transformer import Transformer, ease_trans
+from solnml.components.feature_engineering.transformations.base_transformer import Transformer, ease_trans, \
+    sample_fit_rows, transform_in_chunks, get_row_budget, MIN_FIT_ROWS
 from solnml.components.utils.constants import *
 from solnml.components.utils.operations import *
 
@@ -20,12 +21,14 @@ class ArithmeticTransformation(Transformer):
         X, y = input_datanode.data
         X_new = X[:, target_fields]
 
-        X_new = np.array(X_new.tolist())
         if not self.model:
             self.get_model(self.func)
-            self.model.fit(X_new)
+            _X, _ = sample_fit_rows(input_datanode, X_new, get_row_budget(16 * X_new.shape[1], MIN_FIT_ROWS))
+            self.model.fit(np.array(_X.tolist()))
 
-        _X = self.model.transform(X_new)
+        # The list copy of a chunk and the output.
+        _X = transform_in_chunks(lambda _X: self.model.transform(np.array(_X.tolist())), X_new,
+                                 64 * X_new.shape[1])
         return _X
 
     def get_model(self, param):
@@ -21,14 +21,14 @@ class BinaryTransformation(Transformer):
         X, y = input_datanode.data
         if target_fields is None:
             target_fields = collect_fields(input_datanode.feature_types, self.input_type)
-        X1 = X[:, target_fields]
-        X2 = X[:, target_fields]
+        X_new = X[:, target_fields]
 
         if not self.model:
             self.get_model(self.func)
-            self.model.fit(X1, X2)
+            _X, _ = sample_fit_rows(input_datanode, X_new, MIN_FIT_ROWS)
+            self.model.fit(_X, _X)
 
-        _X = self.model.transform(X1, X2)
+        _X = transform_in_chunks(lambda _X: self.model.transform(_X, _X), X_new, 16 * X_new.shape[1])
 
         return _X
 
@@ -32,15 +32,26 @@ class CrossFeatureTransformation(Transformer):
             self.features_ids = idxs[:200]
 
             self.model = PolynomialFeatures(degree=2, interaction_only=True, include_bias=False)
-            self.model.fit(X_new[:, self.features_ids])
+            # The output features only depend on the number of input features.
+            self.model.fit(X_new[:1, self.features_ids])
 
-        _X = self.model.transform(X_new[:, self.features_ids])
+        # The crossed features of a chunk before and after the selection.
+        row_bytes = 16 * self.model.n_output_features_
         if not self._model:
             self._model = VarianceThreshold()
-            self._model.fit(_X)
-        _X = self._model.transform(_X)
+            _X, _ = sample_fit_rows(input_datanode, X_new[:, self.features_ids], get_row_budget(row_bytes),
+                                    self.random_state)
+            self._model.fit(self.model.transform(_X))
+        _X = transform_in_chunks(lambda _X: self._model.transform(self.model.transform(_X[:, self.features_ids])),
+                                 X_new, row_bytes)
         return _X
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['input'] = (DENSE, SPARSE, UNSIGNED_DATA)
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         cs = ConfigurationSpace()
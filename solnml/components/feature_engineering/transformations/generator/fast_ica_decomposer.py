@@ -23,22 +23,11 @@ class FastIcaDecomposer(Transformer):
         self.n_components = n_components
 
         self.random_state = random_state
-        self.skip_flag = False
-        self.pre_trained = False
 
     @ease_trans
     def operate(self, input_datanode, target_fields=None):
         X, y = input_datanode.data
 
-        # Skip heavy computation in fast ica.
-        if X.shape[0] > 10000 or X.shape[1] > 200:
-            if not self.pre_trained:
-                pass
-                # self.skip_flag = True
-        self.pre_trained = True
-        if self.skip_flag:
-            return X.copy()
-
         if self.model is None:
             from sklearn.decomposition import FastICA
 
@@ -48,8 +37,11 @@ class FastIcaDecomposer(Transformer):
             else:
                 self.n_components = int(self.n_components)
 
+            # The centered copy, the whitened data and the SVD workspace of the sample.
+            _X, _ = sample_fit_rows(input_datanode, X, get_row_budget(32 * X.shape[1], MIN_FIT_ROWS),
+                                    self.random_state)
             if self.n_components is not None:
-                self.n_components = min(self.n_components, X.shape[0])
+                self.n_components = min(self.n_components, _X.shape[0])
 
             self.model = FastICA(
                 n_components=self.n_components, algorithm=self.algorithm,
@@ -59,15 +51,23 @@ class FastIcaDecomposer(Transformer):
             with warnings.catch_warnings():
                 warnings.filterwarnings("error", message='array must not contain infs or NaNs')
                 try:
-                    self.model.fit(X)
+                    self.model.fit(_X)
                 except ValueError as e:
                     if 'array must not contain infs or NaNs' in e.args[0]:
                         raise ValueError("Bug in scikit-learn: https://github.com/scikit-learn/scikit-learn/pull/2738")
                     raise e
 
-        X_new = self.model.transform(X)
+        # The centered copy of a chunk and the output.
+        n_components = self.model.components_.shape[0]
+        X_new = transform_in_chunks(self.model.transform, X, 8 * (X.shape[1] + n_components))
         return X_new
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['preferred_dtype'] = np.float64
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='samc'):
         if optimizer == 'smac':
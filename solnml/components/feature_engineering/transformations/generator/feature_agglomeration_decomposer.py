@@ -40,9 +40,13 @@ class FeatureAgglomerationDecomposer(Transformer):
             self.model = FeatureAgglomeration(
                 n_clusters=n_clusters, affinity=self.affinity,
                 linkage=self.linkage, pooling_func=self.pooling_func)
-            self.model.fit(X)
+            # The features are clustered on the transposed copy of the sample.
+            _X, _ = sample_fit_rows(input_datanode, X, get_row_budget(16 * X.shape[1], MIN_FIT_ROWS),
+                                    self.random_state)
+            self.model.fit(_X)
 
-        X_new = self.model.transform(X)
+        # The pooled features of a chunk.
+        X_new = transform_in_chunks(self.model.transform, X, 16 * X.shape[1])
 
         return X_new
 
@@ -5,6 +5,7 @@ from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
     UniformIntegerHyperparameter, UniformFloatHyperparameter
 from ConfigSpace.conditions import EqualsCondition, InCondition
 from solnml.components.feature_engineering.transformations.base_transformer import *
+from solnml.components.computation.resource_manager import get_trial_threads
 
 
 class KernelPCA(Transformer):
@@ -23,8 +24,6 @@ class KernelPCA(Transformer):
         self.gamma = gamma
         self.coef0 = coef0
         self.random_state = random_state
-        self.skip_flag = False
-        self.pre_trained = False
 
         if isinstance(self.kernel, tuple):
             nested_kernel = self.kernel
@@ -42,16 +41,6 @@ class KernelPCA(Transformer):
     def operate(self, input_datanode, target_fields=None):
         X, y = input_datanode.data
 
-        # Skip large matrix computation in obtaining the kernel matrix.
-        if X.shape[0] > 10000:
-            if not self.pre_trained:
-                pass
-                # self.skip_flag = True
-
-        self.pre_trained = True
-        if self.skip_flag:
-            return X.copy()
-
         if self.model is None:
             import scipy.sparse
             from solnml.components.feature_engineering.transformations.utils import KernelPCA
@@ -64,20 +53,31 @@ class KernelPCA(Transformer):
             self.model = KernelPCA(
                 n_components=self.n_components, kernel=self.kernel,
                 degree=self.degree, gamma=self.gamma, coef0=self.coef0,
-                remove_zero_eig=True, random_state=self.random_state, n_jobs=-1)
+                remove_zero_eig=True, random_state=self.random_state, n_jobs=get_trial_threads())
             if scipy.sparse.issparse(X):
                 X = X.astype(np.float64)
+            # The kernel matrix, its centered copy and the eigensolver workspace take about 32 * n^2 bytes,
+            # fit on as many rows as the budget allows.
+            _X, _ = sample_fit_rows(input_datanode, X, np.sqrt(get_trial_memory() / 32), self.random_state)
             with warnings.catch_warnings():
                 warnings.filterwarnings("error")
-                self.model.fit(X)
+                self.model.fit(_X)
             # Raise an informative error message, equation is based ~line 249 in
             # kernel_pca.py in scikit-learn
             if len(self.model.alphas_ / self.model.lambdas_) == 0:
                 raise ValueError('KernelPCA removed all features!')
-        X_new = self.model.transform(X)
 
+        # The kernel between a chunk and the fitted rows, and its centered copy.
+        n_fit = self.model.X_fit_.shape[0]
+        X_new = transform_in_chunks(self.model.transform, X, 8 * (2 * n_fit + X.shape[1]))
         return X_new
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['preferred_dtype'] = np.float64
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         n_components = UniformIntegerHyperparameter(
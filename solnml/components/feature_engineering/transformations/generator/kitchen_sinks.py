@@ -27,9 +27,12 @@ class KitchenSinks(Transformer):
             import sklearn.kernel_approximation
             self.model = sklearn.kernel_approximation.RBFSampler(
                 gamma=self.gamma, n_components=self.n_components, random_state=self.random_state)
-            self.model.fit(X_new)
+            # The random features only depend on the number of features.
+            _X, _ = sample_fit_rows(input_datanode, X_new, MIN_FIT_ROWS, self.random_state)
+            self.model.fit(_X)
 
-        _X = self.model.transform(X_new)
+        # The projection of a chunk and its cosine.
+        _X = transform_in_chunks(self.model.transform, X_new, 8 * (X_new.shape[1] + 2 * self.model.n_components))
 
         return _X
 
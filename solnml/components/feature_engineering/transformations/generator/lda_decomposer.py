@@ -32,11 +32,19 @@ class LdaDecomposer(Transformer):
                 n_components=self.n_components,
                 shrinkage=self.shrinkage
             )
-            self.model.fit(X, y)
-        X_new = self.model.transform(X)
+            # The class-centered copy of the sample.
+            _X, _y = sample_fit_rows(input_datanode, X, get_row_budget(16 * X.shape[1], MIN_FIT_ROWS))
+            self.model.fit(_X, _y)
+        X_new = transform_in_chunks(self.model.transform, X, 16 * X.shape[1])
 
         return X_new
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['preferred_dtype'] = np.float64
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         cs = ConfigurationSpace()
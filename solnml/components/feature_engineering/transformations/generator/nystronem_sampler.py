@@ -39,34 +39,41 @@ class NystronemSampler(Transformer):
             elif self.kernel == 'chi':
                 self.gamma = nested_kernel[1]['gamma']
 
-    @ease_trans
-    def operate(self, input_datanode, target_fields=None):
-        X, y = input_datanode.data
-        X_new = X[:, target_fields].astype(np.float64)
-
+    def _preprocess(self, X):
+        X = X.astype(np.float64)
         # Because the pipeline guarantees that each feature is positive,
         # clip all values below zero to zero
         if self.kernel == 'chi2':
-            if scipy.sparse.issparse(X_new):
-                X_new.data[X_new.data < 0] = 0.0
+            if scipy.sparse.issparse(X):
+                X.data[X.data < 0] = 0.0
             else:
-                X_new[X_new < 0] = 0.0
+                X[X < 0] = 0.0
+        return X
 
-        if not self.model:
-            n_components = min(X.shape[0], self.n_components)
+    @ease_trans
+    def operate(self, input_datanode, target_fields=None):
+        X, y = input_datanode.data
+        X_new = X[:, target_fields]
 
+        if not self.model:
             self.gamma = float(self.gamma)
             self.degree = int(self.degree)
             self.coef0 = float(self.coef0)
 
+            _X, _ = sample_fit_rows(input_datanode, X_new, get_row_budget(16 * X_new.shape[1], MIN_FIT_ROWS),
+                                    self.random_state)
+            n_components = min(_X.shape[0], self.n_components)
             self.model = Nystroem(
                 kernel=self.kernel, n_components=n_components,
                 gamma=self.gamma, degree=self.degree, coef0=self.coef0,
                 random_state=self.random_state)
 
-            self.model.fit(X_new.astype(np.float64))
+            self.model.fit(self._preprocess(_X))
 
-        _X = self.model.transform(X_new)
+        # The float64 copy of a chunk, its kernel with the components and the output.
+        n_components = self.model.components_.shape[0]
+        _X = transform_in_chunks(lambda _X: self.model.transform(self._preprocess(_X)), X_new,
+                                 8 * (X_new.shape[1] + 2 * n_components))
 
         return _X
 
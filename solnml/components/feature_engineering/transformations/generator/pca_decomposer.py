@@ -29,12 +29,16 @@ class PcaDecomposer(Transformer):
             self.model = sklearn.decomposition.PCA(n_components=n_components,
                                                    whiten=self.whiten,
                                                    copy=True)
-            self.model.fit(X)
+            # The centered copy of the sample and its SVD.
+            _X, _ = sample_fit_rows(input_datanode, X, get_row_budget(24 * X.shape[1], MIN_FIT_ROWS),
+                                    self.random_state)
+            self.model.fit(_X)
 
             if not np.isfinite(self.model.components_).all():
                 raise ValueError("PCA found non-finite components.")
 
-        X_new = self.model.transform(X)
+        # The centered copy of a chunk and the output.
+        X_new = transform_in_chunks(self.model.transform, X, 8 * (X.shape[1] + self.model.n_components_))
 
         return X_new
 
@@ -1,8 +1,9 @@
-import numpy as np
 from ConfigSpace.configuration_space import ConfigurationSpace
 from ConfigSpace.hyperparameters import CategoricalHyperparameter, UnParametrizedHyperparameter, \
     UniformIntegerHyperparameter
 from solnml.components.feature_engineering.transformations.base_transformer import *
+from solnml.components.feature_engineering.transformations.feature_importance import get_importance_cache, \
+    rank_features
 from solnml.components.utils.configspace_utils import check_for_bool
 
 
@@ -30,19 +31,12 @@ class PolynomialTransformation(Transformer):
     @ease_trans
     def operate(self, input_datanode, target_fields):
         from sklearn.preprocessing import PolynomialFeatures
-        from lightgbm import LGBMRegressor
         X, y = input_datanode.data
 
         if not self.best_idxs:
-            lgb = LGBMRegressor(random_state=1)
-            lgb.fit(X, y)
-            _importance = lgb.feature_importances_
-            idx_importance = np.argsort(-_importance)
-            cur_idx = 0
-            while len(self.best_idxs) < self.bestn and cur_idx < len(_importance):
-                if idx_importance[cur_idx] in target_fields:
-                    self.best_idxs.append(idx_importance[cur_idx])
-                cur_idx += 1
+            # The ranking is shared with the other transformers fitted on the same data.
+            importances = get_importance_cache().get_importances(input_datanode, target_fields, 'lightgbm')
+            self.best_idxs = rank_features(importances, target_fields, self.bestn)
 
         X_new = X[:, self.best_idxs]
         if not self.model:
@@ -51,10 +45,13 @@ class PolynomialTransformation(Transformer):
             self.model = PolynomialFeatures(
                 degree=self.degree, interaction_only=self.interaction_only,
                 include_bias=self.include_bias)
-            self.model.fit(X_new)
+            # The output features only depend on the number of input features.
+            self.model.fit(X_new[:1])
 
-        _X = self.model.transform(X_new)
-        _X = _X[:, X_new.shape[1]:]
+        # The polynomial features of a chunk, the original features are dropped.
+        n_inputs = X_new.shape[1]
+        _X = transform_in_chunks(lambda _X: self.model.transform(_X)[:, n_inputs:], X_new,
+                                 16 * self.model.n_output_features_)
         return _X
 
     @staticmethod
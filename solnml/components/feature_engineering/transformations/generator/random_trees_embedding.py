@@ -3,6 +3,7 @@ from ConfigSpace.hyperparameters import UniformIntegerHyperparameter, \
     UnParametrizedHyperparameter, Constant, CategoricalHyperparameter
 from solnml.components.feature_engineering.transformations.base_transformer import *
 from solnml.components.utils.configspace_utils import check_none, check_for_bool
+from solnml.components.computation.resource_manager import get_trial_threads
 
 
 class RandomTreesEmbeddingTransformation(Transformer):
@@ -10,7 +11,7 @@ class RandomTreesEmbeddingTransformation(Transformer):
 
     def __init__(self, n_estimators=10, max_depth=5, min_samples_split=2,
                  min_samples_leaf=1, min_weight_fraction_leaf=1.0, max_leaf_nodes='None',
-                 sparse_output=True, bootstrap='False', n_jobs=-1, random_state=1):
+                 sparse_output=True, bootstrap='False', n_jobs=None, random_state=1):
         super().__init__("random_trees_embedding")
         self.input_type = [NUMERICAL, DISCRETE, CATEGORICAL]
         self.compound_mode = 'only_new'
@@ -62,16 +63,34 @@ class RandomTreesEmbeddingTransformation(Transformer):
                 min_samples_leaf=self.min_samples_leaf,
                 max_leaf_nodes=self.max_leaf_nodes,
                 sparse_output=self.sparse_output,
-                n_jobs=self.n_jobs,
+                n_jobs=get_trial_threads() if self.n_jobs is None else self.n_jobs,
                 random_state=self.random_state
             )
 
-            self.model.fit(X_new)
+            # The float32 copy and the sorted indices of the sample.
+            _X, _ = sample_fit_rows(input_datanode, X_new, get_row_budget(16 * X_new.shape[1], MIN_FIT_ROWS),
+                                    self.random_state)
+            self.model.fit(_X)
 
-        _X = self.model.transform(X_new).toarray()
+        def transform(_X):
+            _X_embedded = self.model.transform(_X)
+            # Keep the embedding sparse only if the input is sparse.
+            if not sparse_utils.is_sparse(_X):
+                _X_embedded = sparse_utils.to_dense(_X_embedded)
+            return _X_embedded
+
+        # The one-hot leaves of a chunk, dense unless the input is sparse.
+        n_leaves = sum(estimator.get_n_leaves() for estimator in self.model.estimators_)
+        _X = transform_in_chunks(transform, X_new, 8 * (X_new.shape[1] + n_leaves))
 
         return _X
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['input'] = (DENSE, SPARSE, UNSIGNED_DATA)
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         n_estimators = UniformIntegerHyperparameter(name="n_estimators",
@@ -30,12 +30,21 @@ class SvdDecomposer(Transformer):
             # Circumvents a bug in sklearn
             # https://github.com/scikit-learn/scikit-learn/commit/f08b8c8e52663167819f242f605db39f3b5a6d0c
             # X = X.astype(np.float64)
-            self.model.fit(X, y)
+            # The random projections of the sample.
+            _X, _y = sample_fit_rows(input_datanode, X, get_row_budget(16 * X.shape[1], MIN_FIT_ROWS),
+                                     self.random_state)
+            self.model.fit(_X, _y)
 
-        X_new = self.model.transform(X)
+        X_new = transform_in_chunks(self.model.transform, X, 8 * (X.shape[1] + self.model.components_.shape[0]))
 
         return X_new
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['input'] = (DENSE, SPARSE, UNSIGNED_DATA)
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         target_dim = UniformIntegerHyperparameter(
@@ -4,9 +4,15 @@ from solnml.components.feature_engineering.transformations.base_transformer impo
 class OneHotTransformation(Transformer):
     type = 2
 
-    def __init__(self):
+    def __init__(self, sparse_output=None):
+        """
+        :param sparse_output: if True, return a CSR matrix; if None, return a CSR matrix when the encoding
+        has more than sparse_threshold columns, e.g., for high-cardinality categorical features.
+        """
         super().__init__("onehot_encoder")
         self.input_type = CATEGORICAL
+        self.sparse_output = sparse_output
+        self.sparse_threshold = 1000
 
     def operate(self, input_datanode: DataNode, target_fields=None):
         import pandas as pd
@@ -24,14 +30,19 @@ class OneHotTransformation(Transformer):
         X_input = X[:, target_fields]
 
         if self.model is None:
-            self.model = OneHotEncoder(handle_unknown='ignore')
+            self.model = OneHotEncoder(handle_unknown='ignore',
+                                       dtype=np.float32 if X.dtype == np.float32 else np.float64)
             self.model.fit(X_input)
-        new_X = self.model.transform(X_input).toarray()
-        X_output = X.copy()
+        new_X = self.model.transform(X_input)
+        # The encoders pickled by previous versions always return dense arrays.
+        if getattr(self, 'sparse_output', False) is None:
+            self.sparse_output = new_X.shape[1] > self.sparse_threshold
+        if not getattr(self, 'sparse_output', False):
+            new_X = new_X.toarray()
 
         # Delete the original columns.
-        X_output = np.delete(X_output, np.s_[target_fields], axis=1)
-        X_output = np.hstack((X_output, new_X))
+        X_output = sparse_utils.delete_columns(X, target_fields)
+        X_output = sparse_utils.hstack((X_output, new_X))
         feature_types = input_datanode.feature_types.copy()
         feature_types = list(np.delete(feature_types, target_fields))
         feature_types.extend([CATEGORICAL] * new_X.shape[1])
@@ -35,6 +35,12 @@ class QuantileTransformation(Transformer):
 
         return _X
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['preferred_dtype'] = np.float64
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         if optimizer == 'smac':
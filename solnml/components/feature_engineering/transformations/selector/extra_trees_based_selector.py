@@ -3,7 +3,10 @@ from ConfigSpace.hyperparameters import UniformFloatHyperparameter, \
     UniformIntegerHyperparameter, CategoricalHyperparameter, \
     UnParametrizedHyperparameter, Constant
 from solnml.components.feature_engineering.transformations.base_transformer import *
+from solnml.components.feature_engineering.transformations.feature_importance import get_importance_cache, \
+    ImportanceSelector
 from solnml.components.utils.configspace_utils import check_none, check_for_bool
+from solnml.components.computation.resource_manager import get_trial_threads
 
 
 class ExtraTreeBasedSelector(Transformer):
@@ -12,7 +15,7 @@ class ExtraTreeBasedSelector(Transformer):
     def __init__(self, n_estimators=100, criterion='gini', min_samples_leaf=1,
                  min_samples_split=2, max_features=0.5, bootstrap='False', max_leaf_nodes='None',
                  max_depth='None', min_weight_fraction_leaf=0., min_impurity_decrease=0.,
-                 oob_score=False, n_jobs=-1, random_state=1, verbose=0,
+                 oob_score=False, n_jobs=None, random_state=1, verbose=0,
                  class_weight=None):
         super().__init__("extra_trees_based_selector")
         self.input_type = [NUMERICAL, DISCRETE, CATEGORICAL]
@@ -40,8 +43,6 @@ class ExtraTreeBasedSelector(Transformer):
         self.class_weight = class_weight
 
     def operate(self, input_datanode, target_fields=None, sample_weight=None):
-        from sklearn.feature_selection import SelectFromModel
-
         feature_types = input_datanode.feature_types
         X, y = input_datanode.data
         if target_fields is None:
@@ -54,7 +55,6 @@ class ExtraTreeBasedSelector(Transformer):
             irrevalent_fields.remove(field_id)
 
         if self.model is None:
-            from sklearn.ensemble import ExtraTreesClassifier
             if check_none(self.max_leaf_nodes):
                 self.max_leaf_nodes = None
             else:
@@ -66,7 +66,7 @@ class ExtraTreeBasedSelector(Transformer):
                 self.max_depth = int(self.max_depth)
 
             self.bootstrap = check_for_bool(self.bootstrap)
-            self.n_jobs = int(self.n_jobs)
+            self.n_jobs = get_trial_threads() if check_none(self.n_jobs) else int(self.n_jobs)
             self.min_impurity_decrease = float(self.min_impurity_decrease)
             self.max_features = self.max_features
             self.min_samples_leaf = int(self.min_samples_leaf)
@@ -74,7 +74,9 @@ class ExtraTreeBasedSelector(Transformer):
             self.verbose = int(self.verbose)
 
             max_features = int(X_new.shape[1] ** float(self.max_features))
-            estimator = ExtraTreesClassifier(
+            # The importances are shared with the other transformers fitted on the same data.
+            importances = get_importance_cache().get_importances(
+                input_datanode, target_fields, 'extra_trees', sample_weight=sample_weight,
                 n_estimators=self.n_estimators,
                 criterion=self.criterion,
                 max_depth=self.max_depth,
@@ -89,8 +91,7 @@ class ExtraTreeBasedSelector(Transformer):
                 verbose=self.verbose,
                 random_state=self.random_state,
                 class_weight=self.class_weight)
-            estimator.fit(X_new, y, sample_weight=sample_weight)
-            self.model = SelectFromModel(estimator=estimator, threshold='mean', prefit=True)
+            self.model = ImportanceSelector(importances)
 
         _X = self.model.transform(X_new)
         is_selected = self.model.get_support()
@@ -99,7 +100,7 @@ class ExtraTreeBasedSelector(Transformer):
         selected_types = [feature_types[idx] for idx in target_fields if is_selected[idx]]
         selected_types.extend(irrevalent_types)
 
-        new_X = np.hstack((_X, X[:, irrevalent_fields]))
+        new_X = sparse_utils.hstack((_X, X[:, irrevalent_fields]))
         new_feature_types = selected_types
         output_datanode = DataNode((new_X, y), new_feature_types, input_datanode.task_type)
         output_datanode.trans_hist = input_datanode.trans_hist.copy()
@@ -110,6 +111,12 @@ class ExtraTreeBasedSelector(Transformer):
 
         return output_datanode
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['input'] = (DENSE, SPARSE, UNSIGNED_DATA)
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         if optimizer == 'smac':
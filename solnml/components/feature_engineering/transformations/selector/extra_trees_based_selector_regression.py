@@ -3,7 +3,10 @@ from ConfigSpace.hyperparameters import UniformFloatHyperparameter, \
     UniformIntegerHyperparameter, CategoricalHyperparameter, \
     UnParametrizedHyperparameter, Constant
 from solnml.components.feature_engineering.transformations.base_transformer import *
+from solnml.components.feature_engineering.transformations.feature_importance import get_importance_cache, \
+    ImportanceSelector
 from solnml.components.utils.configspace_utils import check_none, check_for_bool
+from solnml.components.computation.resource_manager import get_trial_threads
 
 
 class ExtraTreeBasedSelectorRegression(Transformer):
@@ -12,7 +15,7 @@ class ExtraTreeBasedSelectorRegression(Transformer):
     def __init__(self, n_estimators=100, criterion='mse', min_samples_leaf=1,
                  min_samples_split=2, max_features=1., bootstrap='False', max_leaf_nodes='None',
                  max_depth='15', min_weight_fraction_leaf=0.,
-                 oob_score=False, n_jobs=-1, random_state=1, verbose=0):
+                 oob_score=False, n_jobs=None, random_state=1, verbose=0):
         super().__init__("extra_trees_based_selector_regression")
         self.input_type = [NUMERICAL, DISCRETE, CATEGORICAL]
         self.compound_mode = 'only_new'
@@ -49,14 +52,12 @@ class ExtraTreeBasedSelectorRegression(Transformer):
             irrevalent_fields.remove(field_id)
 
         if self.model is None:
-            from sklearn.feature_selection import SelectFromModel
-            from sklearn.ensemble import ExtraTreesRegressor
             self.n_estimators = int(self.n_estimators)
             self.min_samples_leaf = int(self.min_samples_leaf)
             self.min_samples_split = int(self.min_samples_split)
             self.max_features = float(self.max_features)
             self.bootstrap = check_for_bool(self.bootstrap)
-            self.n_jobs = int(self.n_jobs)
+            self.n_jobs = get_trial_threads() if check_none(self.n_jobs) else int(self.n_jobs)
             self.verbose = int(self.verbose)
 
             if check_none(self.max_leaf_nodes):
@@ -77,7 +78,9 @@ class ExtraTreeBasedSelectorRegression(Transformer):
             # Use at most half of the features
             max_features = max(1, min(int(X.shape[1] / 2), max_features))
 
-            estimator = ExtraTreesRegressor(
+            # The importances are shared with the other transformers fitted on the same data.
+            importances = get_importance_cache().get_importances(
+                input_datanode, target_fields, 'extra_trees', sample_weight=sample_weight,
                 n_estimators=self.n_estimators,
                 criterion=self.criterion,
                 max_depth=self.max_depth,
@@ -90,8 +93,7 @@ class ExtraTreeBasedSelectorRegression(Transformer):
                 n_jobs=self.n_jobs,
                 verbose=self.verbose,
                 random_state=self.random_state)
-            estimator.fit(X_new, y, sample_weight=sample_weight)
-            self.model = SelectFromModel(estimator=estimator, threshold='mean', prefit=True)
+            self.model = ImportanceSelector(importances)
 
         _X = self.model.transform(X_new)
         is_selected = self.model.get_support()
@@ -100,7 +102,7 @@ class ExtraTreeBasedSelectorRegression(Transformer):
         selected_types = [feature_types[idx] for idx in target_fields if is_selected[idx]]
         selected_types.extend(irrevalent_types)
 
-        new_X = np.hstack((_X, X[:, irrevalent_fields]))
+        new_X = sparse_utils.hstack((_X, X[:, irrevalent_fields]))
         new_feature_types = selected_types
         output_datanode = DataNode((new_X, y), new_feature_types, input_datanode.task_type)
         output_datanode.trans_hist = input_datanode.trans_hist.copy()
@@ -109,6 +111,12 @@ class ExtraTreeBasedSelectorRegression(Transformer):
 
         return output_datanode
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['input'] = (DENSE, SPARSE, UNSIGNED_DATA)
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         if optimizer == 'smac':
@@ -1,20 +1,134 @@
 from solnml.components.feature_engineering.transformations.base_transformer import *
+from solnml.components.feature_engineering.transformations.feature_importance import get_importance_cache, \
+    SupportSelector
+from solnml.components.computation.resource_manager import get_trial_threads
+
+
+def get_step_sizes(n_features, step):
+    """
+        The geometric schedule of the elimination: each step removes the fraction step of the features left,
+        at least one, until one feature is left.
+    """
+    sizes = [n_features]
+    while sizes[-1] > 1:
+        sizes.append(max(1, sizes[-1] - max(1, int(sizes[-1] * step))))
+    return sizes
+
+
+def get_rfe_importances(estimator):
+    # The same ranking criterion as sklearn's RFE.
+    if hasattr(estimator, 'coef_'):
+        coef = np.asarray(estimator.coef_)
+        return (coef ** 2).sum(axis=0) if coef.ndim > 1 else coef ** 2
+    return np.asarray(estimator.feature_importances_)
+
+
+def _fit_step(estimator, X_train, y_train, X_test, y_test, features):
+    """
+        Fit the estimator on the features left, and score it on the test data if given.
+    :return: the score and the importances of the features.
+    """
+    from sklearn.base import clone
+    estimator = clone(estimator)
+    estimator.fit(X_train[:, features], y_train)
+    score = estimator.score(X_test[:, features], y_test) if X_test is not None else None
+    return score, get_rfe_importances(estimator)
 
 
-# TODO: Only for classification
 class RecursiveFeatureEliminationSelector(Transformer):
     type = 23
 
-    def __init__(self, param='lr', min_features=1):
-        super().__init__("rfe_selector")
+    def __init__(self, param='lr', min_features=1, step=0.2, cv=3, patience=2, n_jobs=None, random_state=1):
+        """
+        :param step: the fraction of the features left removed at each step.
+        :param patience: the number of steps the validation score may drop before the elimination stops.
+        :param n_jobs: the number of folds fitted in parallel, default to the trial threads.
+        """
+        super().__init__("rfe_selector", random_state=random_state)
         self.input_type = [NUMERICAL, DISCRETE, CATEGORICAL]
         self.params = param
         self.min_features = min_features
+        self.step = step
+        self.cv = cv
+        self.patience = patience
+        self.n_jobs = n_jobs
         self.optional_params = ['lr', 'rf']
 
-    def operate(self, input_datanode: DataNode, target_fields=None):
-        from sklearn.feature_selection import RFECV
+    def get_base_model(self, task_type, n_jobs=1):
+        is_classification = task_type in CLS_TASKS
+        if self.params == 'lr':
+            if is_classification:
+                from sklearn.linear_model import LogisticRegression
+                return LogisticRegression(solver='lbfgs')
+            from sklearn.linear_model import Ridge
+            return Ridge()
+        elif self.params == 'rf':
+            from sklearn.ensemble import ExtraTreesClassifier, ExtraTreesRegressor
+            estimator_class = ExtraTreesClassifier if is_classification else ExtraTreesRegressor
+            return estimator_class(n_estimators=100, n_jobs=n_jobs, random_state=self.random_state)
+        else:
+            raise ValueError('Invalid base model: %s!' % self.params)
 
+    def eliminate(self, X, y, task_type):
+        """
+            Eliminate the features along the geometric schedule, in each CV fold and on the whole data.
+            The folds and the whole data of a step are fitted in parallel, and the elimination stops
+            once the mean validation score has dropped for patience steps.
+        :return: {'sizes', 'scores', 'supports'}, the number of features, the mean validation score and
+            the features selected on the whole data at each step.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from sklearn.model_selection import check_cv
+        n_features = X.shape[1]
+        is_classification = task_type in CLS_TASKS
+        splits = list(check_cv(self.cv, y, classifier=is_classification).split(X, y))
+        # The folds are split once for all the steps, the last task is the whole data.
+        tasks = [(X[train_idx], y[train_idx], X[test_idx], y[test_idx]) for train_idx, test_idx in splits]
+        tasks.append((X, y, None, None))
+
+        n_threads = get_trial_threads() if self.n_jobs is None else int(self.n_jobs)
+        n_workers = max(1, min(n_threads, len(tasks)))
+        estimator = self.get_base_model(task_type, n_jobs=max(1, n_threads // n_workers))
+
+        features = [np.arange(n_features)] * len(tasks)
+        path = {'sizes': list(), 'scores': list(), 'supports': list()}
+        best_score, n_drops = -np.inf, 0
+        sizes = get_step_sizes(n_features, self.step)
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            for step_idx, size in enumerate(sizes):
+                results = list(executor.map(lambda args: _fit_step(estimator, *args[0], args[1]),
+                                            zip(tasks, features)))
+                score = np.mean([result[0] for result in results[:-1]])
+                support = np.zeros(n_features, dtype=bool)
+                support[features[-1]] = True
+                path['sizes'].append(size)
+                path['scores'].append(score)
+                path['supports'].append(support)
+
+                if score > best_score:
+                    best_score, n_drops = score, 0
+                else:
+                    n_drops += 1
+                if n_drops >= self.patience or step_idx == len(sizes) - 1:
+                    break
+                # Keep the most important features for the next step.
+                next_size = sizes[step_idx + 1]
+                features = [np.sort(_features[np.argsort(-importances, kind='stable')[:next_size]])
+                            for _features, (_, importances) in zip(features, results)]
+        return path
+
+    def select(self, path, min_features):
+        """
+            The features of the step with the best validation score among the steps that keep
+            at least min_features features, the fewer features the better on ties.
+        """
+        candidates = [idx for idx, size in enumerate(path['sizes']) if size >= min_features]
+        if len(candidates) == 0:
+            candidates = [0]
+        best_idx = max(candidates, key=lambda idx: (path['scores'][idx], -path['sizes'][idx]))
+        return path['supports'][best_idx]
+
+    def operate(self, input_datanode: DataNode, target_fields=None):
         feature_types = input_datanode.feature_types
         X, y = input_datanode.data
         if target_fields is None:
@@ -28,26 +142,23 @@ class RecursiveFeatureEliminationSelector(Transformer):
 
         self.min_features = max(self.min_features, n_fields // 20)
         if self.model is None:
-            if self.params == 'lr':
-                from sklearn.linear_model import LogisticRegression
-                base_model = LogisticRegression(solver='lbfgs')
-            elif self.params == 'rf':
-                from sklearn.ensemble import ExtraTreesClassifier
-                base_model = ExtraTreesClassifier(n_estimators=100)
-            else:
-                raise ValueError('Invalid base model!')
-
-            self.model = RFECV(base_model, cv=3, min_features_to_select=self.min_features)
-            self.model.fit(X_new, y)
+            # The elimination does not depend on min_features, the configurations differing only
+            # in min_features share it.
+            key = get_importance_cache().get_key(input_datanode, target_fields, 'rfe', param=self.params,
+                                                 step=self.step, cv=self.cv, patience=self.patience,
+                                                 random_state=self.random_state)
+            path = get_importance_cache().get_or_compute(
+                key, lambda: self.eliminate(X_new, y, input_datanode.task_type))
+            self.model = SupportSelector(self.select(path, self.min_features))
 
         _X = self.model.transform(X_new)
         is_selected = self.model.get_support()
 
         irrevalent_types = [feature_types[idx] for idx in irrevalent_fields]
-        selected_types = [feature_types[idx] for idx in target_fields if is_selected[idx]]
+        selected_types = [feature_types[field] for field, selected in zip(target_fields, is_selected) if selected]
         selected_types.extend(irrevalent_types)
 
-        new_X = np.hstack((_X, X[:, irrevalent_fields]))
+        new_X = sparse_utils.hstack((_X, X[:, irrevalent_fields]))
         new_feature_types = selected_types
         output_datanode = DataNode((new_X, y), new_feature_types, input_datanode.task_type)
         output_datanode.trans_hist = input_datanode.trans_hist.copy()
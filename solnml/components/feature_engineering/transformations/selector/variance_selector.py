@@ -42,7 +42,7 @@ class VarianceSelector(Transformer):
         _X = self.model.transform(X_new)
 
         if len(irrevalent_fields) > 0:
-            new_X = np.hstack((_X, X[:, irrevalent_fields]))
+            new_X = sparse_utils.hstack((_X, X[:, irrevalent_fields]))
             if input_datanode.feature_names is not None:
                 feature_names = np.hstack(([input_datanode.feature_names[idx] for idx in irrevalent_fields],
                                            [input_datanode.feature_names[idx] for idx in self.model.get_support(True)]))
@@ -64,6 +64,12 @@ class VarianceSelector(Transformer):
 
         return output_datanode
 
+    @staticmethod
+    def get_properties(dataset_properties=None):
+        properties = Transformer.get_properties(dataset_properties)
+        properties['input'] = (DENSE, SPARSE, UNSIGNED_DATA)
+        return properties
+
     @staticmethod
     def get_hyperparameter_search_space(dataset_properties=None, optimizer='smac'):
         if optimizer == 'smac':
@@ -0,0 +1,297 @@
+import numpy as np
+from functools import partial
+from sklearn.metrics import accuracy_score, balanced_accuracy_score, f1_score, precision_score, recall_score, \
+    roc_auc_score, mean_squared_error, mean_absolute_error, r2_score
+
+from solnml.components.metrics.rgs_metrics import rmse
+from solnml.components.utils.data_profile import array_fingerprint
+
+CLS_METRICS = ['acc', 'bal_acc', 'f1', 'precision', 'recall']
+RGS_METRICS = ['mse', 'rmse', 'mae', 'r2']
+# The classifiers whose predict() is the class with the largest predict_proba(), the SVMs vote or
+# threshold the decision function instead.
+ARGMAX_CLASSIFIERS = ['RandomForestClassifier', 'ExtraTreesClassifier', 'GradientBoostingClassifier',
+                      'AdaBoostClassifier', 'KNeighborsClassifier', 'LinearDiscriminantAnalysis',
+                      'QuadraticDiscriminantAnalysis', 'LogisticRegression', 'LGBMClassifier']
+_trapz = getattr(np, 'trapezoid', None) or np.trapz
+
+
+def get_fast_metric_name(scorer):
+    """
+        Name of the metric kernel equivalent to the scorer, or None if the scorer is not supported.
+    """
+    score_func = getattr(scorer, '_score_func', None)
+    if getattr(scorer, '_kwargs', None):
+        return None
+    if isinstance(score_func, partial):
+        if score_func.func is f1_score and score_func.args == () and score_func.keywords == {'average': 'macro'}:
+            return 'f1'
+        return None
+    funcs = {accuracy_score: 'acc', balanced_accuracy_score: 'bal_acc', precision_score: 'precision',
+             recall_score: 'recall', roc_auc_score: 'auc', mean_squared_error: 'mse', rmse: 'rmse',
+             mean_absolute_error: 'mae', r2_score: 'r2'}
+    for func, name in funcs.items():
+        if score_func is func:
+            return name
+    return None
+
+
+def _prf_divide(numerator, denominator):
+    # x / 0 is 0, as in sklearn.
+    mask = denominator == 0
+    denominator = denominator.copy()
+    denominator[mask] = 1
+    result = numerator / denominator
+    result[mask] = 0.
+    return result
+
+
+def binary_roc_auc(y_true, y_score):
+    """
+        The area under the ROC curve of binary labels (1 is positive), computed in the same steps
+        as sklearn.metrics.roc_auc_score so that the results are identical.
+    """
+    desc_score_indices = np.argsort(y_score, kind="mergesort")[::-1]
+    y_score = y_score[desc_score_indices]
+    y_true = y_true[desc_score_indices]
+
+    distinct_value_indices = np.where(np.diff(y_score))[0]
+    threshold_idxs = np.r_[distinct_value_indices, y_true.size - 1]
+    tps = np.cumsum(y_true * 1., dtype=np.float64)[threshold_idxs]
+    fps = 1 + threshold_idxs - tps
+
+    # Drop the collinear points.
+    if len(fps) > 2:
+        optimal_idxs = np.where(np.r_[True, np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), True])[0]
+        fps, tps = fps[optimal_idxs], tps[optimal_idxs]
+    if tps.size == 0 or fps[0] != 0 or tps[0] != 0:
+        tps, fps = np.r_[0, tps], np.r_[0, fps]
+    if fps[-1] <= 0 or tps[-1] <= 0:
+        raise ValueError('Only one class present in y_true. ROC AUC score is not defined in that case.')
+    fpr, tpr = fps / fps[-1], tps / tps[-1]
+    return _trapz(tpr, fpr)
+
+
+def get_proba_classes(estimator):
+    """
+        The classes of the columns of predict_proba if predict() is their argmax, otherwise None.
+    :param estimator: a sklearn classifier, or a solnml model wrapping one in its estimator attribute.
+    """
+    for _estimator in [estimator, getattr(estimator, 'estimator', None)]:
+        if _estimator.__class__.__name__ in ARGMAX_CLASSIFIERS and hasattr(_estimator, 'classes_'):
+            return np.asarray(_estimator.classes_)
+    return None
+
+
+class FastMetric(object):
+    def __init__(self, name, y_true):
+        """
+            Metric kernel for a fixed validation set: the label encodings (or the statistics of the
+            regression targets) are computed once, then each prediction is scored without validating the inputs.
+        :param name: see get_fast_metric_name.
+        :param y_true: the labels, or the one-hot labels for 'auc'.
+        """
+        self.name = name
+        y_true = np.asarray(y_true)
+        if name in CLS_METRICS:
+            self.y_true = y_true.reshape(-1)
+            self.labels, self.true_codes = np.unique(self.y_true, return_inverse=True)
+        elif name == 'auc':
+            if y_true.ndim == 1:
+                y_true = y_true.reshape((-1, 1))
+            # The binary labels of each column.
+            self.y_true = [y_true[:, c].ravel() == 1 for c in range(y_true.shape[1])]
+            if any(len(np.unique(y_true[:, c])) != 2 for c in range(y_true.shape[1])):
+                raise ValueError('Only one class present in y_true. ROC AUC score is not defined in that case.')
+        elif name in RGS_METRICS:
+            if y_true.dtype.kind == 'O':
+                y_true = y_true.astype(np.float64)
+            self.y_true = y_true.reshape((-1, 1)) if y_true.ndim == 1 else y_true
+            if name == 'r2':
+                self.r2_denominator = ((1. * (self.y_true - np.average(self.y_true, axis=0)) ** 2)
+                                       .sum(axis=0, dtype=np.float64))
+        else:
+            raise ValueError('Unsupported metric: %s!' % name)
+
+    def _confusion_matrices(self, y_preds):
+        """
+            The confusion matrices of a batch of label predictions, computed with one bincount.
+        :return: the sorted union of the labels, and the matrices of shape (n_preds, n_labels, n_labels).
+        """
+        labels = np.union1d(self.labels, np.unique(y_preds))
+        if len(labels) == len(self.labels):
+            true_codes = self.true_codes
+        else:
+            true_codes = np.searchsorted(labels, self.y_true)
+        n_labels, n_preds = len(labels), y_preds.shape[0]
+        pred_codes = np.searchsorted(labels, y_preds)
+        codes = (np.arange(n_preds).reshape((-1, 1)) * n_labels + true_codes) * n_labels + pred_codes
+        matrices = np.bincount(codes.ravel(), minlength=n_preds * n_labels * n_labels)
+        return labels, matrices.reshape((n_preds, n_labels, n_labels))
+
+    def _score_confusion(self, labels, matrix):
+        tp_sum = np.diag(matrix)
+        if self.name == 'bal_acc':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                per_class = tp_sum / matrix.sum(axis=1)
+            per_class = per_class[~np.isnan(per_class)]
+            return np.mean(per_class)
+
+        if self.name in ['precision', 'recall']:
+            # The binary average with pos_label=1.
+            if len(labels) > 2:
+                raise ValueError('Target is multiclass but average=\'binary\'.')
+            if 1 not in labels:
+                if len(labels) < 2:
+                    return 0.
+                raise ValueError('pos_label=1 is not a valid label: %s!' % labels)
+            idx = int(np.searchsorted(labels, 1))
+            tp_sum, pred_sum, true_sum = tp_sum[[idx]], matrix.sum(axis=0)[[idx]], matrix.sum(axis=1)[[idx]]
+            if self.name == 'precision':
+                return np.average(_prf_divide(tp_sum, pred_sum))
+            return np.average(_prf_divide(tp_sum, true_sum))
+
+        # Macro f1, the same formula as sklearn 0.21.
+        precision = _prf_divide(tp_sum, matrix.sum(axis=0))
+        recall = _prf_divide(tp_sum, matrix.sum(axis=1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f_score = (1 + 1.) * precision * recall / (1. * precision + recall)
+        f_score[tp_sum == 0] = 0.0
+        return np.average(f_score)
+
+    def _score_regression(self, y_pred):
+        y_pred = np.asarray(y_pred)
+        if y_pred.ndim == 1:
+            y_pred = y_pred.reshape((-1, 1))
+        if self.name in ['mse', 'rmse']:
+            score = np.average(np.average((self.y_true - y_pred) ** 2, axis=0))
+            return score ** 0.5 if self.name == 'rmse' else score
+        if self.name == 'mae':
+            return np.average(np.average(np.abs(y_pred - self.y_true), axis=0))
+        numerator = (1. * (self.y_true - y_pred) ** 2).sum(axis=0, dtype=np.float64)
+        denominator = self.r2_denominator
+        nonzero_denominator = denominator != 0
+        nonzero_numerator = numerator != 0
+        valid_score = nonzero_denominator & nonzero_numerator
+        output_scores = np.ones([self.y_true.shape[1]])
+        output_scores[valid_score] = 1 - (numerator[valid_score] / denominator[valid_score])
+        output_scores[nonzero_numerator & ~nonzero_denominator] = 0.
+        return np.average(output_scores)
+
+    def _score_auc(self, y_score):
+        y_score = np.asarray(y_score)
+        if y_score.ndim == 1:
+            y_score = y_score.reshape((-1, 1))
+        if y_score.shape[1] != len(self.y_true):
+            raise ValueError('The number of columns in y_score does not match y_true: %d!' % y_score.shape[1])
+        score = np.zeros((y_score.shape[1],))
+        for c in range(y_score.shape[1]):
+            score[c] = binary_roc_auc(self.y_true[c], y_score[:, c])
+        return np.average(score)
+
+    def score(self, pred, classes=None):
+        """
+            Score one prediction, the result equals the score_func of the sklearn scorer.
+        :param pred: the labels or the class probabilities (the label is the argmax) for the classification
+            metrics, the scores of each class for 'auc', and the predictions for regression.
+        :param classes: the labels of the probability columns, default to 0, ..., n_classes - 1.
+        """
+        return self.score_batch(np.asarray(pred)[np.newaxis], classes=classes)[0]
+
+    def score_batch(self, preds, classes=None):
+        """
+            Score a batch of predictions at once, e.g., all the candidates of an ensemble selection step.
+        :param preds: an array of shape (n_preds, n_samples) or (n_preds, n_samples, n_classes).
+        """
+        preds = np.asarray(preds)
+        if self.name in RGS_METRICS:
+            return np.array([self._score_regression(pred) for pred in preds], dtype=np.float64)
+        if self.name == 'auc':
+            return np.array([self._score_auc(pred) for pred in preds], dtype=np.float64)
+
+        if preds.ndim == 3:
+            preds = np.argmax(preds, axis=-1)
+            if classes is not None:
+                preds = np.asarray(classes)[preds]
+        if self.name == 'acc':
+            return np.array([np.average(pred == self.y_true) for pred in preds], dtype=np.float64)
+        labels, matrices = self._confusion_matrices(preds)
+        return np.array([self._score_confusion(labels, matrix) for matrix in matrices], dtype=np.float64)
+
+
+class FastScorer(object):
+    def __init__(self, scorer):
+        """
+            Drop-in replacement of a sklearn scorer (scorer(estimator, X, y)) that scores with FastMetric.
+            The metric of the last validation set is cached, the unsupported scorers are called as is.
+        """
+        self.scorer = scorer
+        self.name = get_fast_metric_name(scorer)
+        self._fingerprint = None
+        self._metric = None
+
+    def __getattr__(self, item):
+        # _sign, _score_func and _kwargs of the wrapped scorer.
+        if item == 'scorer':
+            raise AttributeError(item)
+        return getattr(self.scorer, item)
+
+    def get_metric(self, y_true):
+        fingerprint = array_fingerprint(y_true)
+        if fingerprint != self._fingerprint:
+            self._metric = FastMetric(self.name, y_true)
+            self._fingerprint = fingerprint
+        return self._metric
+
+    def _predict(self, estimator, X, y_true):
+        if self.name != 'auc':
+            return estimator.predict(X)
+        # The same as sklearn's _ThresholdScorer for the one-hot labels.
+        try:
+            y_pred = estimator.decision_function(X)
+            if isinstance(y_pred, list):
+                y_pred = np.vstack([p for p in y_pred]).T
+        except (NotImplementedError, AttributeError):
+            y_pred = estimator.predict_proba(X)
+            if np.asarray(y_true).ndim == 1:
+                y_pred = y_pred[:, 1]
+        return y_pred
+
+    def _can_reuse(self, estimator, y_true, pred_method):
+        if self.name in RGS_METRICS:
+            return pred_method == 'predict'
+        if self.name in CLS_METRICS:
+            return pred_method == 'predict' or get_proba_classes(estimator) is not None
+        # The probabilities are the scores of _predict for the one-hot labels.
+        return pred_method == 'predict_proba' and not hasattr(estimator, 'decision_function') and \
+            np.asarray(y_true).ndim == 2
+
+    def score_predictions(self, estimator, X, y_true, pred_method):
+        """
+            Predict with pred_method ('predict' or 'predict_proba') once, and score these predictions
+            if the metric accepts them: the labels are derived from the probabilities only if predict()
+            is their argmax, otherwise predict() is called.
+        :return: the score and the predictions.
+        """
+        y_pred = getattr(estimator, pred_method)(X)
+        if self.name is None or not self._can_reuse(estimator, y_true, pred_method):
+            return self(estimator, X, y_true), y_pred
+        classes = None
+        if self.name in CLS_METRICS and pred_method == 'predict_proba':
+            classes = get_proba_classes(estimator)
+        try:
+            score = self.get_metric(y_true).score(y_pred, classes=classes)
+        except ValueError:
+            return self.scorer(estimator, X, y_true), y_pred
+        return self.scorer._sign * score, y_pred
+
+    def __call__(self, estimator, X, y_true):
+        if self.name is None:
+            return self.scorer(estimator, X, y_true)
+        try:
+            metric = self.get_metric(y_true)
+            score = metric.score(self._predict(estimator, X, y_true))
+        except ValueError:
+            # Let sklearn handle the corner cases, e.g., raise the same error.
+            return self.scorer(estimator, X, y_true)
+        return self.scorer._sign * score
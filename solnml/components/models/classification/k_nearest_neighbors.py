@@ -4,14 +4,20 @@ from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
 
 from solnml.components.models.base_model import BaseClassificationModel
 from solnml.components.utils.constants import DENSE, SPARSE, UNSIGNED_DATA, PREDICTIONS
+from solnml.components.utils.ann_index import use_ann_index, ANNKNeighborsClassifier
 
 
 class KNearestNeighborsClassifier(BaseClassificationModel):
 
-    def __init__(self, n_neighbors, weights, p, random_state=None):
+    def __init__(self, n_neighbors, weights, p, n_probes=8, random_state=None):
+        """
+        :param n_probes: the number of clusters searched by each query in the approximate index,
+            which replaces the exact search on large data, see ann_index.IVFIndex.
+        """
         self.n_neighbors = n_neighbors
         self.weights = weights
         self.p = p
+        self.n_probes = n_probes
         self.random_state = random_state
         self.n_jobs = 1
         self.time_limit = None
@@ -19,6 +25,15 @@ class KNearestNeighborsClassifier(BaseClassificationModel):
     def fit(self, X, Y):
         import sklearn.multiclass
 
+        if use_ann_index(X):
+            self.estimator = ANNKNeighborsClassifier(n_neighbors=self.n_neighbors,
+                                                     weights=self.weights,
+                                                     p=self.p,
+                                                     n_probes=self.n_probes,
+                                                     random_state=self.random_state)
+            self.estimator.fit(X, Y)
+            return self
+
         estimator = \
             sklearn.neighbors.KNeighborsClassifier(n_neighbors=self.n_neighbors,
                                                    weights=self.weights,
@@ -63,15 +78,19 @@ class KNearestNeighborsClassifier(BaseClassificationModel):
             weights = CategoricalHyperparameter(
                 name="weights", choices=["uniform", "distance"], default_value="uniform")
             p = CategoricalHyperparameter(name="p", choices=[1, 2], default_value=2)
-            cs.add_hyperparameters([n_neighbors, weights, p])
+            # The recall/speed trade-off of the approximate search, only used on large data.
+            n_probes = UniformIntegerHyperparameter(
+                name="n_probes", lower=1, upper=64, log=True, default_value=8)
+            cs.add_hyperparameters([n_neighbors, weights, p, n_probes])
 
             return cs
         elif optimizer == 'tpe':
             from hyperopt import hp
             space = {'n_neighbors': hp.randint('knn_n_neighbors', 100) + 1,
                      'weights': hp.choice('knn_weights', ['uniform', 'distance']),
-                     'p': hp.choice('knn_p', [1, 2])}
+                     'p': hp.choice('knn_p', [1, 2]),
+                     'n_probes': hp.randint('knn_n_probes', 64) + 1}
 
-            init_trial = {'n_neighbors': 1, 'weights': "uniform", 'p': 2}
+            init_trial = {'n_neighbors': 1, 'weights': "uniform", 'p': 2, 'n_probes': 8}
 
             return space
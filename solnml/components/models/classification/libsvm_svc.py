@@ -6,14 +6,19 @@ from ConfigSpace.hyperparameters import UniformFloatHyperparameter, \
 import numpy as np
 
 from solnml.components.utils.constants import *
-from solnml.components.utils.model_util import softmax
+from solnml.components.utils.model_util import softmax, use_kernel_approximation, get_nystroem, \
+    NYSTROEM_MAX_ITER
 from solnml.components.utils.configspace_utils import check_none, check_for_bool
 from solnml.components.models.base_model import BaseClassificationModel
 
 
 class LibSVM_SVC(BaseClassificationModel):
     def __init__(self, C, kernel, gamma, shrinking, tol, max_iter,
-                 class_weight=None, degree=3, coef0=0, random_state=None):
+                 class_weight=None, degree=3, coef0=0, random_state=None, approximation='auto'):
+        """
+        :param approximation: 'exact' fits libsvm, 'nystroem' fits a linear SVM on the Nystroem features
+            instead, 'auto' chooses between them by the number of samples and the time limit.
+        """
         self.C = C
         self.kernel = kernel
         self.degree = degree
@@ -24,6 +29,7 @@ class LibSVM_SVC(BaseClassificationModel):
         self.class_weight = class_weight
         self.max_iter = max_iter
         self.random_state = random_state
+        self.approximation = approximation
         self.estimator = None
         self.time_limit = None
 
@@ -60,6 +66,19 @@ class LibSVM_SVC(BaseClassificationModel):
         if check_none(self.class_weight):
             self.class_weight = None
 
+        if use_kernel_approximation(X.shape[0], X.shape[1], self.approximation, self.time_limit):
+            # The same primal objective (hinge loss) on the approximated kernel features.
+            from sklearn.pipeline import make_pipeline
+            self.estimator = make_pipeline(
+                get_nystroem(self.kernel, self.gamma, self.degree, self.coef0, X.shape[0],
+                             random_state=self.random_state),
+                sklearn.svm.LinearSVC(C=self.C, loss='hinge', tol=self.tol,
+                                      class_weight=self.class_weight,
+                                      max_iter=min(int(self.max_iter), NYSTROEM_MAX_ITER),
+                                      random_state=self.random_state))
+            self.estimator.fit(X, Y)
+            return self
+
         self.estimator = sklearn.svm.SVC(C=self.C,
                                          kernel=self.kernel,
                                          degree=self.degree,
@@ -12,7 +12,7 @@ class BalancedBagging(BaseClassificationModel):
 
     def __init__(self, n_estimators, max_features,
                  max_depth, bootstrap, bootstrap_features,
-                 sampling_strategy, replacement, random_state=None, n_jobs=-1):
+                 sampling_strategy, replacement, random_state=None, n_jobs=1):
         self.n_estimators = n_estimators
         self.max_features = max_features
         self.max_depth = max_depth
@@ -16,7 +16,7 @@ class BalancedRandomForest(BaseClassificationModel):
                  min_samples_split, min_samples_leaf,
                  min_weight_fraction_leaf, bootstrap,
                  min_impurity_decrease, sampling_strategy, replacement,
-                 random_state=None, n_jobs=-1,
+                 random_state=None, n_jobs=1,
                  class_weight=None):
         self.n_estimators = n_estimators
         self.criterion = criterion
@@ -17,7 +17,7 @@ class EasyEnsemble(BaseClassificationModel):
                  ab_max_depth,
                  ab_learning_rate,
                  ab_algorithm,
-                 n_jobs=-1,
+                 n_jobs=1,
                  random_state=None):
         self.n_estimators = n_estimators
         self.sampling_strategy = sampling_strategy
@@ -7,12 +7,18 @@ import numpy as np
 
 from solnml.components.utils.constants import *
 from solnml.components.utils.configspace_utils import check_for_bool
+from solnml.components.utils.model_util import use_kernel_approximation, get_nystroem, \
+    NYSTROEM_MAX_ITER
 from solnml.components.models.base_model import BaseRegressionModel
 
 
 class LibSVM_SVR(BaseRegressionModel):
     def __init__(self, epsilon, C, kernel, gamma, shrinking, tol, max_iter,
-                 degree=3, coef0=0, random_state=None):
+                 degree=3, coef0=0, random_state=None, approximation='auto'):
+        """
+        :param approximation: 'exact' fits libsvm, 'nystroem' fits a linear SVR on the Nystroem features
+            instead, 'auto' chooses between them by the number of samples and the time limit.
+        """
         self.epsilon = epsilon
         self.C = C
         self.kernel = kernel
@@ -23,10 +29,12 @@ class LibSVM_SVR(BaseRegressionModel):
         self.tol = tol
         self.max_iter = max_iter
         self.random_state = random_state
+        self.approximation = approximation
         self.estimator = None
+        self.time_limit = None
 
     def fit(self, X, Y):
-        from sklearn.svm import SVR
+        from sklearn.svm import SVR, LinearSVR
 
         # Nested kernel
         if isinstance(self.kernel, tuple):
@@ -57,6 +65,17 @@ class LibSVM_SVR(BaseRegressionModel):
 
         self.shrinking = check_for_bool(self.shrinking)
 
+        if use_kernel_approximation(X.shape[0], X.shape[1], self.approximation, self.time_limit):
+            # The same primal objective (epsilon-insensitive loss) on the approximated kernel features.
+            from sklearn.pipeline import make_pipeline
+            self.estimator = make_pipeline(
+                get_nystroem(self.kernel, self.gamma, self.degree, self.coef0, X.shape[0],
+                             random_state=self.random_state),
+                LinearSVR(epsilon=self.epsilon, C=self.C, tol=self.tol,
+                          max_iter=min(int(self.max_iter), NYSTROEM_MAX_ITER), random_state=self.random_state))
+            self.estimator.fit(X, Y)
+            return self
+
         self.estimator = SVR(epsilon=self.epsilon,
                              C=self.C,
                              kernel=self.kernel,
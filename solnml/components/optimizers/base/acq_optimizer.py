@@ -1,8 +1,9 @@
 import numpy as np
+from ConfigSpace import Configuration
 from ConfigSpace.util import get_one_exchange_neighbourhood
 
 from solnml.components.optimizers.base.config_space_utils import convert_configurations_to_array, \
-    sample_configurations
+    impute_default_values, sample_configurations_array
 
 
 class BaseOptimizer(object):
@@ -70,16 +71,17 @@ class RandomSampling(BaseOptimizer):
         configs_list = list(incs_configs)
         rand_incs = convert_configurations_to_array(configs_list)
 
-        # Sample random points uniformly over the whole space
-        rand_configs = sample_configurations(self.config_space, self.n_samples - rand_incs.shape[0])
-        rand = convert_configurations_to_array(rand_configs)
-
-        configs_list.extend(rand_configs)
+        # Sample random points uniformly over the whole space, only the winners are turned into configurations.
+        rand_array = sample_configurations_array(self.config_space, self.n_samples - rand_incs.shape[0], self.rng)
+        rand = impute_default_values(self.config_space, rand_array.copy())
 
         X = np.concatenate((rand_incs, rand), axis=0)
         y = self.objective_func(X).flatten()
         candidate_idxs = list(np.argsort(-y)[:batch_size])
-        # print(candidate_idxs)
-        # print(type(candidate_idxs))
-        # print(configs_list[:5])
-        return [configs_list[idx] for idx in candidate_idxs]
+        candidates = list()
+        for idx in candidate_idxs:
+            if idx < len(configs_list):
+                candidates.append(configs_list[idx])
+            else:
+                candidates.append(Configuration(self.config_space, vector=rand_array[idx - len(configs_list)]))
+        return candidates
@@ -0,0 +1,142 @@
+import time
+import numpy as np
+from math import log
+
+
+class AshaScheduler(object):
+    def __init__(self, sample_func, R=27, eta=3):
+        """
+            Asynchronous successive halving: whenever a worker is free, it takes a configuration
+            in the top 1/eta of a rung that has not been promoted yet, or a new configuration
+            at the lowest rung if there is nothing to promote.
+        :param sample_func: sample_func(n) returns a list of n new configurations.
+        :param R: the maximum resource, the rungs are R * eta^-s_max, ..., R / eta, R.
+        """
+        self.sample_func = sample_func
+        self.R = R
+        self.eta = eta
+        self.s_max = int(log(R) / log(eta))
+        self.rung_resources = [int(item) for item in np.logspace(0, self.s_max, self.s_max + 1, base=self.eta)]
+
+        # Finished evaluations: {resource: [(config, loss)]}.
+        self.rungs = dict()
+        # Configurations promoted from (or pending in) each rung.
+        self.promoted = dict()
+        self.pending = dict()
+        for r in self.rung_resources:
+            self.rungs[r] = list()
+            self.promoted[r] = list()
+            self.pending[r] = list()
+        self.candidates = list()
+
+    def _get_promotable(self, r):
+        rung = self.rungs[r]
+        n_promotable = len(rung) // self.eta
+        if n_promotable == 0:
+            return None
+        indices = np.argsort([loss for _, loss in rung], kind='stable')[:n_promotable]
+        for idx in indices:
+            config, loss = rung[idx]
+            if np.isfinite(loss) and config not in self.promoted[r]:
+                return config
+        return None
+
+    def get_job(self, n_candidates=1):
+        """
+            Choose the next evaluation.
+        :param n_candidates: the number of new configurations sampled at once if the lowest rung is chosen.
+        :return: (config, resource, first_iter), first_iter is True for the configurations
+            not evaluated in any lower rung.
+        """
+        # Promote from the highest rung first, the top rung is never promoted.
+        for idx in reversed(range(len(self.rung_resources) - 1)):
+            r = self.rung_resources[idx]
+            config = self._get_promotable(r)
+            if config is not None:
+                self.promoted[r].append(config)
+                next_r = self.rung_resources[idx + 1]
+                self.pending[next_r].append(config)
+                return config, next_r, False
+
+        if len(self.candidates) == 0:
+            self.candidates = list(self.sample_func(n_candidates))
+        config = self.candidates.pop(0)
+        self.pending[self.rung_resources[0]].append(config)
+        return config, self.rung_resources[0], True
+
+    def report(self, config, r, loss):
+        if config in self.pending[r]:
+            self.pending[r].remove(config)
+        if loss is None or np.isnan(loss):
+            loss = np.inf
+        self.rungs[r].append((config, loss))
+
+    def reset_candidates(self):
+        """
+            Drop the sampled configurations not evaluated yet, e.g., after the surrogate is updated.
+        """
+        self.candidates = list()
+
+    def is_top_rung(self, r):
+        return r == self.rung_resources[-1]
+
+
+def run_asha(scheduler: AshaScheduler, executor, n_workers, budget, max_evaluations=None, callback=None,
+             eval_func=None, poll_interval=0.05, running=None):
+    """
+        Keep all the workers busy until the budget is exhausted, then wait for the running evaluations.
+    :param executor: a ParallelProcessEvaluator, or None to evaluate sequentially with eval_func.
+    :param max_evaluations: return after max_evaluations evaluations are finished.
+    :param callback: callback(config, resource, loss) is called after each evaluation.
+    :param running: the evaluations in flight [(result, config, resource)], kept by the caller across the calls
+        and updated in place. If given, the workers are kept busy when returning within the budget, and the
+        evaluations finished in the meantime are collected at the start of the next call; otherwise all the
+        evaluations submitted are waited for.
+    """
+    start_time = time.time()
+    n_submitted, n_finished = 0, 0
+
+    def in_budget():
+        return time.time() - start_time < budget
+
+    if executor is None:
+        while in_budget() and (max_evaluations is None or n_submitted < max_evaluations):
+            config, r, first_iter = scheduler.get_job()
+            n_submitted += 1
+            try:
+                loss = eval_func(config, resource_ratio=float(r / scheduler.R), eta=scheduler.eta,
+                                 first_iter=first_iter)
+            except Exception:
+                loss = np.inf
+            scheduler.report(config, r, loss)
+            if callback is not None:
+                callback(config, r, loss)
+        return
+
+    keep_running = running is not None
+    if running is None:
+        running = list()
+    while True:
+        finished = [item for item in running if item[0].ready()]
+        for item in finished:
+            running.remove(item)
+            res, config, r = item
+            loss = res.get()[0]
+            n_finished += 1
+            scheduler.report(config, r, loss)
+            if callback is not None:
+                callback(config, r, loss)
+
+        enough = max_evaluations is not None and n_finished >= max_evaluations
+        while len(running) < n_workers and in_budget():
+            if not keep_running and max_evaluations is not None and n_submitted >= max_evaluations:
+                break
+            config, r, first_iter = scheduler.get_job(n_candidates=n_workers)
+            n_submitted += 1
+            res = executor.submit(config, resource_ratio=float(r / scheduler.R), eta=scheduler.eta,
+                                  first_iter=first_iter)
+            running.append((res, config, r))
+        if len(running) == 0 or (keep_running and enough and in_budget()):
+            break
+        if len(finished) == 0:
+            time.sleep(poll_interval)
@@ -6,7 +6,7 @@ from solnml.utils.constant import MAX_INT
 from solnml.components.optimizers.base.acquisition import EI
 from solnml.components.transfer_learning.tlbo.models.kde import TPE
 from solnml.components.optimizers.base.acq_optimizer import RandomSampling
-from solnml.components.optimizers.base.funcs import get_types, std_normalization
+from solnml.components.optimizers.base.funcs import get_types
 from solnml.components.optimizers.base.config_space_utils import sample_configurations
 from solnml.components.optimizers.base.config_space_utils import convert_configurations_to_array
 from solnml.components.computation.parallel_process import ParallelProcessEvaluator
@@ -16,7 +16,7 @@ from solnml.components.optimizers.base.prob_rf import RandomForestWithInstances
 
 class BohbBase(object):
     def __init__(self, eval_func, config_space, config_generator='tpe',
-                 seed=1, R=27, eta=3, n_jobs=1):
+                 seed=1, R=27, eta=3, n_jobs=1, refit_schedule='always'):
         self.eval_func = eval_func
         self.config_space = config_space
         self.config_generator = config_generator
@@ -57,7 +57,8 @@ class BohbBase(object):
 
         types, bounds = get_types(self.config_space)
         self.num_config = len(bounds)
-        self.surrogate = RandomForestWithInstances(types, bounds)
+        # The surrogate normalizes the targets itself, so that its data container only grows between the refits.
+        self.surrogate = RandomForestWithInstances(types, bounds, refit_schedule=refit_schedule, normalize_y=True)
 
         # self.executor = ParallelEvaluator(self.eval_func, n_worker=n_jobs)
         # self.executor = ParallelProcessEvaluator(self.eval_func, n_worker=n_jobs)
@@ -71,6 +72,16 @@ class BohbBase(object):
 
         self.eval_dict = dict()
 
+    def __getstate__(self):
+        # logeta is a lambda, which can not be pickled; the surrogate pickles itself.
+        state = self.__dict__.copy()
+        state.pop('logeta')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.logeta = lambda x: log(x) / log(self.eta)
+
     def _iterate(self, s, budget=MAX_INT, skip_last=0):
         # Set initial number of configurations
         n = int(ceil(self.B / self.R / (s + 1) * self.eta ** s))
@@ -132,9 +143,8 @@ class BohbBase(object):
         resource_val = self.iterate_r[-1]
         if len(self.target_y[resource_val]) > 1:
             if self.config_generator == 'smac':
-                normalized_y = std_normalization(self.target_y[resource_val])
                 self.surrogate.train(convert_configurations_to_array(self.target_x[resource_val]),
-                                     np.array(normalized_y, dtype=np.float64))
+                                     np.array(self.target_y[resource_val], dtype=np.float64))
 
     def smac_get_candidate_configurations(self, num_config):
         if len(self.target_y[self.iterate_r[-1]]) <= 3:
@@ -5,6 +5,9 @@ from typing import List
 from ConfigSpace import Configuration, ConfigurationSpace
 from ConfigSpace.hyperparameters import CategoricalHyperparameter, \
     IntegerHyperparameter, FloatHyperparameter
+from ConfigSpace.conditions import AndConjunction, OrConjunction, EqualsCondition, NotEqualsCondition, \
+    InCondition, LessThanCondition, GreaterThanCondition
+from ConfigSpace.forbidden import ForbiddenEqualsClause, ForbiddenAndConjunction
 
 
 def convert_configurations_to_array(configs: List[Configuration]) -> np.ndarray:
@@ -168,15 +171,107 @@ def get_random_neighborhood(configuration: Configuration, num: int, seed: int) -
 # TODO: escape the bug.
 def sample_configurations(configuration_space: ConfigurationSpace, num: int) -> List[Configuration]:
     result = []
+    sampled = set()
     cnt = 0
     while cnt < num:
         config = configuration_space.sample_configuration(1)
-        if config not in result:
+        if config not in sampled:
+            sampled.add(config)
             result.append(config)
             cnt += 1
     return result
 
 
+def _evaluate_condition_vector(configuration_space: ConfigurationSpace, condition, configs_array: np.ndarray):
+    if isinstance(condition, AndConjunction):
+        masks = [_evaluate_condition_vector(configuration_space, component, configs_array)
+                 for component in condition.components]
+        return np.logical_and.reduce(masks)
+    if isinstance(condition, OrConjunction):
+        masks = [_evaluate_condition_vector(configuration_space, component, configs_array)
+                 for component in condition.components]
+        return np.logical_or.reduce(masks)
+
+    values = configs_array[:, configuration_space.get_idx_by_hyperparameter_name(condition.parent.name)]
+    # An inactive parent deactivates its children.
+    mask = np.isfinite(values)
+    if isinstance(condition, EqualsCondition):
+        mask &= values == condition.vector_value
+    elif isinstance(condition, NotEqualsCondition):
+        mask &= values != condition.vector_value
+    elif isinstance(condition, InCondition):
+        mask &= np.isin(values, condition.vector_values)
+    elif isinstance(condition, LessThanCondition):
+        mask &= values < condition.vector_value
+    elif isinstance(condition, GreaterThanCondition):
+        mask &= values > condition.vector_value
+    else:
+        raise ValueError('Unsupported condition type: %s!' % type(condition))
+    return mask
+
+
+def _evaluate_forbidden_vector(forbidden, configs_array: np.ndarray):
+    if isinstance(forbidden, ForbiddenAndConjunction):
+        masks = [_evaluate_forbidden_vector(component, configs_array) for component in forbidden.components]
+        return np.logical_and.reduce(masks)
+    if isinstance(forbidden, ForbiddenEqualsClause):
+        return configs_array[:, forbidden.vector_id] == forbidden.vector_value
+    return np.array([forbidden.is_forbidden_vector(row, strict=False) for row in configs_array], dtype=bool)
+
+
+def sample_configurations_array(configuration_space: ConfigurationSpace, num: int,
+                                rng: np.random.RandomState = None) -> np.ndarray:
+    """Sample (at most num) distinct configurations directly in their array representation.
+
+    Inactive hyperparameters are set to NaN as in Configuration.get_array(), so a row
+    can be turned into a configuration via Configuration(configuration_space, vector=row)
+    and fed to an EPM after impute_default_values.
+
+    Parameters
+    ----------
+    configuration_space : ConfigurationSpace
+    num : int
+        Number of configurations to sample.
+    rng : np.random.RandomState
+        Random state, the one of the configuration space by default.
+
+    Returns
+    -------
+    np.ndarray (num, D)
+    """
+    rng = configuration_space.random if rng is None else rng
+    hyperparameters = configuration_space.get_hyperparameters()
+    forbiddens = configuration_space.get_forbiddens()
+    result = np.zeros((0, len(hyperparameters)))
+    n_trials = 0
+    while result.shape[0] < num and n_trials < 10:
+        n_trials += 1
+        n_samples = num - result.shape[0]
+        configs_array = np.zeros((n_samples, len(hyperparameters)))
+        for idx, hp in enumerate(hyperparameters):
+            configs_array[:, idx] = hp._sample(rng, n_samples)
+
+        # Hyperparameters are in topological order, so parents are deactivated before their children.
+        for idx, hp in enumerate(hyperparameters):
+            for condition in configuration_space.get_parent_conditions_of(hp.name):
+                inactive_mask = ~_evaluate_condition_vector(configuration_space, condition, configs_array)
+                configs_array[inactive_mask, idx] = np.nan
+
+        for forbidden in forbiddens:
+            configs_array = configs_array[~_evaluate_forbidden_vector(forbidden, configs_array)]
+
+        n_sampled = result.shape[0]
+        result = np.concatenate((result, configs_array), axis=0)
+        # Drop duplicates while keeping the sampling order, rows are compared as raw bytes with NaN mapped to -1.
+        keys = np.ascontiguousarray(np.where(np.isnan(result), -1., result))
+        keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+        _, unique_idx = np.unique(keys, return_index=True)
+        result = result[np.sort(unique_idx)]
+        if result.shape[0] == n_sampled:
+            break
+    return result[:num]
+
+
 def expand_configurations(configs: List[Configuration], configuration_space: ConfigurationSpace, num: int):
     num_config = len(configs)
     num_needed = num - num_config
@@ -8,11 +8,18 @@ from solnml.utils.constant import MAX_INT
 from solnml.utils.logging_utils import get_logger
 from solnml.components.computation.parallel_process import ParallelProcessEvaluator
 from solnml.utils.decorators import time_limit
+from solnml.components.optimizers.base.asha import AshaScheduler, run_asha
 
 
 class MfseBase(object):
     def __init__(self, eval_func, config_space, per_run_time_limit=600,
-                 seed=1, R=81, eta=3, n_jobs=1, output_dir='./'):
+                 seed=1, R=81, eta=3, n_jobs=1, output_dir='./', scheduler='sync'):
+        """
+        :param scheduler: 'sync' runs synchronous successive halving, each rung waits for all its evaluations;
+            'asha' promotes the configurations asynchronously, so that no worker waits for the slow evaluations.
+        """
+        if scheduler not in ['sync', 'asha']:
+            raise ValueError('Invalid scheduler: %s!' % scheduler)
         self.eval_func = eval_func
         self.config_space = config_space
         self.n_workers = n_jobs
@@ -53,8 +60,147 @@ class MfseBase(object):
             self.target_x[r] = list()
             self.target_y[r] = list()
 
+        self.output_dir = output_dir
         self.mf_advisor = MFBatchAdvisor(config_space, output_dir=output_dir)
         self.eval_dict = dict()
+        # Configurations evaluated before the suggestions, e.g., the incumbents of a previous run.
+        self.warm_start_configs = list()
+        # Observations of previous runs (config, val_loss), which the surrogate learns from without evaluating them.
+        self.prior_x = list()
+        self.prior_y = list()
+
+        self.scheduler = scheduler
+        self.asha = None
+        # The evaluator on the shared worker pool and the evaluations in flight of ASHA, kept across iterations.
+        self.executor = None
+        self.running_jobs = list()
+        if self.scheduler == 'asha':
+            # The rungs are kept across iterations, a configuration can be promoted in a later iteration.
+            self.asha = AshaScheduler(self._sample_configs, R=self.R, eta=self.eta)
+
+    def __getstate__(self):
+        """The MF advisor holds its pyrfr surrogates, which can not be pickled: it is rebuilt on top of
+        the observations in target_x/target_y. logeta is a lambda, rebuilt from eta. The worker pool
+        is not pickled, the evaluations in flight are lost.
+        """
+        state = self.__dict__.copy()
+        state.pop('mf_advisor')
+        state.pop('logeta')
+        state['executor'] = None
+        state['running_jobs'] = list()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.logeta = lambda x: log(x) / log(self.eta)
+        self.mf_advisor = MFBatchAdvisor(self.config_space, output_dir=self.output_dir)
+        if len(self.prior_y) > 0 or any(len(self.target_y[r]) > 0 for r in self.target_y):
+            self._update_mf_observations()
+
+    def add_prior_observations(self, observations):
+        """
+        :param observations: a list of (Configuration, perf), perf: the larger, the better.
+        """
+        for config, perf in observations:
+            self.prior_x.append(config)
+            self.prior_y.append(-perf)
+        if len(self.prior_y) > 0:
+            self._update_mf_observations()
+
+    def _sample_configs(self, n):
+        T = self.mf_advisor.get_suggestions(n_suggestions=n)
+        if len(self.warm_start_configs) > 0:
+            n_warm_start = min(n, len(self.warm_start_configs))
+            T = self.warm_start_configs[:n_warm_start] + \
+                [config for config in T if config not in self.warm_start_configs][:n - n_warm_start]
+            self.warm_start_configs = self.warm_start_configs[n_warm_start:]
+        return T
+
+    def _update_mf_observations(self):
+        observations = list()
+        for item in self.target_x:
+            config_dict = OrderedDict()
+            # The prior observations are added to each fidelity, and replaced by the observations
+            # of the same configurations in this run.
+            for i, config in enumerate(self.prior_x):
+                config_dict[config] = self.prior_y[i]
+            for i, config in enumerate(self.target_x[item]):
+                config_dict[config] = self.target_y[item][i]
+            observations.append(config_dict)
+        self.mf_advisor.update_mf_observations(observations)
+
+    def _iterate_async(self, s, budget=MAX_INT):
+        """
+            Collect as many evaluations as a bracket of synchronous successive halving with ASHA,
+            the workers are kept busy across the iterations.
+        """
+        n = int(ceil(self.B / self.R / (s + 1) * self.eta ** s))
+        n_evaluations = sum(int(n * self.eta ** (-i)) for i in range(s + 1))
+        self.logger.info("ASHA: %d evaluations, %d configurations in the top rung" %
+                         (n_evaluations, len(self.asha.rungs[self.R])))
+
+        full_config_list = list()
+        full_perf_list = list()
+
+        def callback(config, n_resource, val_loss):
+            self._record_async(config, n_resource, val_loss, full_config_list, full_perf_list)
+
+        def eval_func(config, **kwargs):
+            with time_limit(self.per_run_time_limit):
+                return self.eval_func(config, **kwargs)
+
+        if self.n_workers > 1:
+            if self.executor is None:
+                # The pool is shared by all the optimizers of the search, so that the evaluations left in flight
+                # by the others wait for a free worker instead of running on top of the n_jobs workers.
+                self.executor = ParallelProcessEvaluator(self.eval_func, n_worker=self.n_workers,
+                                                         shared=True).start()
+            # The evaluations still running are collected in the next iteration, so no worker waits
+            # for the slowest evaluation of this one.
+            run_asha(self.asha, self.executor, self.n_workers, budget,
+                     max_evaluations=n_evaluations, callback=callback, running=self.running_jobs)
+        else:
+            run_asha(self.asha, None, 1, budget, max_evaluations=n_evaluations,
+                     callback=callback, eval_func=eval_func)
+        return full_config_list, full_perf_list
+
+    def _record_async(self, config, n_resource, val_loss, full_config_list, full_perf_list):
+        if np.isfinite(val_loss):
+            self.target_x[int(n_resource)].append(config)
+            self.target_y[int(n_resource)].append(val_loss)
+            self.evaluation_stats['timestamps'].append(time.time() - self.global_start_time)
+            self.evaluation_stats['val_scores'].append(val_loss)
+        self.exp_output[time.time()] = (int(n_resource), [config], [val_loss])
+        if self.asha.is_top_rung(n_resource):
+            self.incumbent_configs.append(config)
+            self.incumbent_perfs.append(val_loss)
+            full_config_list.append(config)
+            full_perf_list.append(val_loss)
+            if np.isfinite(val_loss):
+                # New suggestions come from the updated surrogate.
+                self._update_mf_observations()
+                self.asha.reset_candidates()
+
+    def collect_running_jobs(self, timeout=None):
+        """
+            Wait for the ASHA evaluations left in flight, e.g., at the end of the search, and record their results.
+            The evaluations not finished within timeout seconds are dropped.
+        :return: the configurations and the losses evaluated with the full resource.
+        """
+        full_config_list, full_perf_list = list(), list()
+        deadline = None if timeout is None else time.time() + timeout
+        for res, config, r in self.running_jobs:
+            res.wait(None if deadline is None else max(deadline - time.time(), 0))
+            if not res.ready():
+                continue
+            loss = res.get()[0]
+            self.asha.report(config, r, loss)
+            self._record_async(config, r, loss, full_config_list, full_perf_list)
+        self.running_jobs = list()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        return full_config_list, full_perf_list
 
     def _iterate(self, s, budget=MAX_INT, skip_last=0):
         # Set initial number of configurations
@@ -64,7 +210,7 @@ class MfseBase(object):
 
         # Choose a batch of configurations in different mechanisms.
         start_time = time.time()
-        T = self.mf_advisor.get_suggestions(n_suggestions=n)
+        T = self._sample_configs(n)
         time_elapsed = time.time() - start_time
         self.logger.info("Choosing next batch of configurations took %.2f sec." % time_elapsed)
 
@@ -133,12 +279,6 @@ class MfseBase(object):
                     T = [T[indices[0]]]
 
         if len(self.target_y[self.iterate_r[-1]]) != 0:
-            observations = list()
-            for item in self.target_x:
-                config_dict = OrderedDict()
-                for i, config in enumerate(self.target_x[item]):
-                    config_dict[config] = self.target_y[item][i]
-                observations.append(config_dict)
-            self.mf_advisor.update_mf_observations(observations)
+            self._update_mf_observations()
 
         return full_config_list, full_perf_list
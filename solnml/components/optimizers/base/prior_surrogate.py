@@ -0,0 +1,24 @@
+import numpy as np
+
+from solnml.components.optimizers.base.config_space_utils import convert_configurations_to_array
+
+
+class PriorAwareTrain(object):
+    def __init__(self, train, observations):
+        """
+            Train a surrogate on the observations of this run together with prior observations,
+            e.g., the configurations evaluated in previous runs, which are not evaluated again.
+        :param train: the train method of the surrogate.
+        :param observations: a non-empty list of (Configuration, objective), the smaller the better.
+        """
+        self.train = train
+        self.X = convert_configurations_to_array([config for config, _ in observations])
+        self.y = np.array([objective for _, objective in observations], dtype=np.float64)
+
+    def __call__(self, X: np.ndarray, Y: np.ndarray):
+        # The observations of this run replace the prior ones of the same configurations.
+        observed = set(map(tuple, np.nan_to_num(X)))
+        mask = np.array([tuple(x) not in observed for x in np.nan_to_num(self.X)], dtype=bool)
+        X = np.vstack([self.X[mask], X])
+        Y = np.concatenate([self.y[mask].reshape((-1,) + Y.shape[1:]), Y])
+        return self.train(X, Y)
@@ -1,3 +1,4 @@
+import time
 import numpy as np
 import logging
 
@@ -38,6 +39,9 @@ class RandomForestWithInstances(AbstractEPM):
                  eps_purity: int=1e-8,
                  max_num_nodes: int=2**20,
                  seed: int=42,
+                 refit_schedule: str='always',
+                 refit_interval: int=10,
+                 normalize_y: bool=False,
                  **kwargs):
         """Constructor
 
@@ -73,6 +77,15 @@ class RandomForestWithInstances(AbstractEPM):
             The maxmimum total number of nodes in a tree
         seed : int
             The seed that is passed to the random_forest_run library.
+        refit_schedule : str
+            When to rebuild the forest in train(). 'always' refits after every call,
+            'doubling' refits once the number of data points has doubled since the
+            last refit, and 'interval' refits every refit_interval new data points.
+        refit_interval : int
+            The number of new data points between two refits if refit_schedule='interval'.
+        normalize_y : bool
+            Predict the targets normalized to zero mean and unit variance. The forest is fitted
+            on the raw targets, a positive affine transform of the targets does not change its splits.
         """
         super().__init__(**kwargs)
 
@@ -80,21 +93,26 @@ class RandomForestWithInstances(AbstractEPM):
         self.bounds = bounds
         self.rng = regression.default_random_engine(seed)
 
-        self.rf_opts = regression.forest_opts()
-        self.rf_opts.num_trees = num_trees
-        self.rf_opts.do_bootstrapping = do_bootstrapping
-        max_features = 0 if ratio_features > 1.0 else \
-            max(1, int(types.shape[0] * ratio_features))
-        self.rf_opts.tree_opts.max_features = max_features
-        self.rf_opts.tree_opts.min_samples_to_split = min_samples_split
-        self.rf_opts.tree_opts.min_samples_in_leaf = min_samples_leaf
-        self.rf_opts.tree_opts.max_depth = max_depth
-        self.rf_opts.tree_opts.epsilon_purity = eps_purity
-        self.rf_opts.tree_opts.max_num_nodes = max_num_nodes
+        self.rf_opts = self._create_rf_opts(num_trees, do_bootstrapping, ratio_features, min_samples_split,
+                                            min_samples_leaf, max_depth, eps_purity, max_num_nodes)
 
         self.n_points_per_tree = n_points_per_tree
         self.rf = None  # type: regression.binary_rss_forest
 
+        if refit_schedule not in ['always', 'doubling', 'interval']:
+            raise ValueError('Invalid refit schedule: %s!' % refit_schedule)
+        self.refit_schedule = refit_schedule
+        self.refit_interval = refit_interval
+        self.normalize_y = normalize_y
+        self.mean_y_, self.std_y_ = 0., 1.
+        self.n_points_at_refit = 0
+        self.num_refits = 0
+        # Time cost (in seconds) of each call to train(), including the skipped refits.
+        self.train_time_history = list()
+        self._data = None
+        self._data_X = None
+        self._data_y = None
+
         # This list well be read out by save_iteration() in the solver
         self.hypers = [num_trees, max_num_nodes, do_bootstrapping,
                        n_points_per_tree, ratio_features, min_samples_split,
@@ -104,6 +122,46 @@ class RandomForestWithInstances(AbstractEPM):
         self.logger = logging.getLogger(self.__module__ + "." +
                                         self.__class__.__name__)
 
+    def _create_rf_opts(self, num_trees, do_bootstrapping, ratio_features, min_samples_split,
+                        min_samples_leaf, max_depth, eps_purity, max_num_nodes):
+        rf_opts = regression.forest_opts()
+        rf_opts.num_trees = num_trees
+        rf_opts.do_bootstrapping = do_bootstrapping
+        max_features = 0 if ratio_features > 1.0 else \
+            max(1, int(self.types.shape[0] * ratio_features))
+        rf_opts.tree_opts.max_features = max_features
+        rf_opts.tree_opts.min_samples_to_split = min_samples_split
+        rf_opts.tree_opts.min_samples_in_leaf = min_samples_leaf
+        rf_opts.tree_opts.max_depth = max_depth
+        rf_opts.tree_opts.epsilon_purity = eps_purity
+        rf_opts.tree_opts.max_num_nodes = max_num_nodes
+        return rf_opts
+
+    def __getstate__(self):
+        """The pyrfr objects (SwigPyObject) can not be pickled: the forest is stored as its
+        ascii representation, the random engine and the options are rebuilt from the hypers.
+        """
+        state = self.__dict__.copy()
+        for key in ['rng', 'rf_opts', '_data']:
+            state.pop(key)
+        state['_data_X'], state['_data_y'] = None, None
+        state['rf'] = None if self.rf is None else self.rf.ascii_string_representation()
+        return state
+
+    def __setstate__(self, state):
+        rf_representation = state.pop('rf')
+        self.__dict__.update(state)
+        num_trees, max_num_nodes, do_bootstrapping, _, ratio_features, min_samples_split, \
+            min_samples_leaf, max_depth, eps_purity, seed = self.hypers
+        self.rng = regression.default_random_engine(seed)
+        self.rf_opts = self._create_rf_opts(num_trees, do_bootstrapping, ratio_features, min_samples_split,
+                                            min_samples_leaf, max_depth, eps_purity, max_num_nodes)
+        self._data = None
+        self.rf = None
+        if rf_representation is not None:
+            self.rf = regression.binary_rss_forest()
+            self.rf.load_from_ascii_string(rf_representation)
+
     def _train(self, X: np.ndarray, y: np.ndarray, **kwargs):
         """Trains the random forest on X and y.
 
@@ -119,8 +177,22 @@ class RandomForestWithInstances(AbstractEPM):
         self
         """
 
+        start_time = time.time()
+        y = y.flatten()
+        if self.normalize_y:
+            # The forest is fitted on the raw targets, whose normalization changes at every call,
+            # and the predictions are normalized with the statistics of the current targets.
+            self.mean_y_ = np.mean(y)
+            self.std_y_ = np.std(y)
+            if self.std_y_ == 0:
+                self.std_y_ = 1
+        if not self._need_refit(X.shape[0]):
+            # Keep the forest fitted at the last refit, along with the data it was fitted on.
+            self._log_train(X.shape[0], start_time)
+            return self
+
         self.X = X
-        self.y = y.flatten()
+        self.y = y
 
         if self.n_points_per_tree <= 0:
             self.rf_opts.num_data_points_per_tree = self.X.shape[0]
@@ -128,10 +200,50 @@ class RandomForestWithInstances(AbstractEPM):
             self.rf_opts.num_data_points_per_tree = self.n_points_per_tree
         self.rf = regression.binary_rss_forest()
         self.rf.options = self.rf_opts
-        data = self.__init_data_container(self.X, self.y)
+        data = self._update_data_container(self.X, self.y)
         self.rf.fit(data, rng=self.rng)
+
+        self.n_points_at_refit = self.X.shape[0]
+        self.num_refits += 1
+        self._log_train(X.shape[0], start_time)
         return self
 
+    def _log_train(self, n_points: int, start_time: float):
+        self.train_time_history.append(time.time() - start_time)
+        self.logger.debug('Trained the random forest on %d points in %.4f seconds (%d refits in %d calls, '
+                          '%.4f seconds in total).' % (n_points, self.train_time_history[-1], self.num_refits,
+                                                      len(self.train_time_history), sum(self.train_time_history)))
+
+    def get_train_stats(self):
+        """The cost of the calls to train(): the number of calls and refits, and the time spent (in seconds)."""
+        return {'n_trains': len(self.train_time_history),
+                'n_refits': self.num_refits,
+                'train_time': float(np.sum(self.train_time_history)),
+                'last_train_time': self.train_time_history[-1] if len(self.train_time_history) > 0 else None}
+
+    def _need_refit(self, n_points: int):
+        if self.rf is None or self.refit_schedule == 'always':
+            return True
+        if n_points < self.n_points_at_refit:
+            return True
+        if self.refit_schedule == 'doubling':
+            return n_points >= 2 * self.n_points_at_refit
+        return n_points - self.n_points_at_refit >= self.refit_interval
+
+    def _update_data_container(self, X: np.ndarray, y: np.ndarray):
+        """Reuses the data container of the last refit if X and y only append
+        new data points to it, otherwise builds a new one.
+        """
+        n_old = 0 if self._data_X is None else self._data_X.shape[0]
+        if self._data is not None and n_old <= X.shape[0] and \
+                np.array_equal(self._data_X, X[:n_old]) and np.array_equal(self._data_y, y[:n_old]):
+            self._add_data_points(self._data, X[n_old:], y[n_old:])
+        else:
+            self._data = self.__init_data_container(X, y)
+        self._data_X = X.copy()
+        self._data_y = y.copy()
+        return self._data
+
     def __init_data_container(self, X: np.ndarray, y: np.ndarray):
         """Fills a pyrfr default data container, s.t. the forest knows
         categoricals and bounds for continous data
@@ -157,10 +269,15 @@ class RandomForestWithInstances(AbstractEPM):
             else:
                 data.set_bounds_of_feature(i, mn, mx)
 
-        for row_X, row_y in zip(X, y):
-            data.add_data_point(row_X, row_y)
+        self._add_data_points(data, X, y)
         return data
 
+    @staticmethod
+    def _add_data_points(data, X: np.ndarray, y: np.ndarray):
+        # Converting to python lists in one go avoids a numpy-to-vector conversion per row.
+        for row_X, row_y in zip(X.tolist(), y.tolist()):
+            data.add_data_point(row_X, row_y)
+
     def _predict(self, X: np.ndarray):
         """Predict means and variances for given X.
 
@@ -188,7 +305,7 @@ class RandomForestWithInstances(AbstractEPM):
             mean, var = self.rf.predict_mean_var(row_X)
             means.append(mean)
             vars_.append(var)
-        means = np.array(means)
-        vars_ = np.array(vars_)
+        means = (np.array(means) - self.mean_y_) / self.std_y_
+        vars_ = np.array(vars_) / self.std_y_ ** 2
 
         return means.reshape((-1, 1)), vars_.reshape((-1, 1))
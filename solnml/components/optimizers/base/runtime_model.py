@@ -0,0 +1,62 @@
+import numpy as np
+from ConfigSpace import Configuration
+
+from solnml.components.optimizers.base.funcs import get_types
+from solnml.components.optimizers.base.config_space_utils import convert_configurations_to_array
+from solnml.components.optimizers.base.prob_rf import RandomForestWithInstances
+
+
+class RuntimeModel(object):
+    def __init__(self, config_space, min_points=5, seed=1, refit_schedule='always'):
+        """
+            Random forest that predicts the runtime of configurations, fitted on log(runtime).
+        :param min_points: the model is used after observing min_points runtimes.
+        :param refit_schedule: when the forest is refitted, see RandomForestWithInstances.
+        """
+        self.config_space = config_space
+        types, bounds = get_types(config_space)
+        self.model = RandomForestWithInstances(types, bounds, seed=seed, refit_schedule=refit_schedule)
+        self.min_points = min_points
+        self.configs = list()
+        self.runtimes = list()
+        self.is_fitted = False
+
+    def add(self, config: Configuration, runtime):
+        self.configs.append(config)
+        self.runtimes.append(max(runtime, 1e-3))
+        if len(self.configs) >= self.min_points:
+            self.model.train(convert_configurations_to_array(self.configs), np.log(np.array(self.runtimes)))
+            self.is_fitted = True
+
+    def predict_runtime(self, X: np.ndarray):
+        """
+            Predicted runtime (in seconds) of the configuration arrays X.
+        """
+        mean, _ = self.model.predict(X)
+        return np.exp(mean).reshape(-1)
+
+    def predict_config_runtime(self, config: Configuration):
+        return self.predict_runtime(convert_configurations_to_array([config]))[0]
+
+
+class RuntimeAwareAcquisition(object):
+    def __init__(self, compute, runtime_model: RuntimeModel, time_limit=None):
+        """
+            Divide the values of an acquisition function by the predicted runtime,
+            e.g., EI becomes expected improvement per second.
+        :param compute: the _compute method of the acquisition function.
+        :param time_limit: the configurations predicted to run longer than time_limit are never suggested.
+        """
+        self.compute = compute
+        self.runtime_model = runtime_model
+        self.time_limit = time_limit
+
+    def __call__(self, X: np.ndarray, **kwargs):
+        acq = self.compute(X, **kwargs)
+        if not self.runtime_model.is_fitted:
+            return acq
+        runtime = self.runtime_model.predict_runtime(X).reshape(acq.shape)
+        acq = acq / runtime
+        if self.time_limit is not None:
+            acq[runtime > self.time_limit] = -np.inf
+        return acq
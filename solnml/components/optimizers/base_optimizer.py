@@ -1,12 +1,11 @@
 import abc
-import os
 import time
 import numpy as np
 import pickle as pkl
 from solnml.utils.constant import MAX_INT
 from solnml.utils.logging_utils import get_logger
 from solnml.components.evaluators.base_evaluator import _BaseEvaluator
-from solnml.components.utils.topk_saver import CombinedTopKModelSaver
+from solnml.components.utils.topk_saver import CombinedTopKModelSaver, remove_model
 
 
 class BaseOptimizer(object):
@@ -36,8 +35,33 @@ class BaseOptimizer(object):
     def iterate(self, budget=MAX_INT):
         pass
 
+    def warm_start(self, configs):
+        """
+            Evaluate the configurations first, e.g., the incumbents of a previous run.
+        :param configs: a list of Configuration in self.config_space.
+        """
+        self.logger.warning('Warm start is not supported in %s!' % self.__class__.__name__)
+
+    def collect_running_evaluations(self, timeout=None):
+        """
+            Wait for the evaluations left in flight by iterate(), e.g., at the end of the search, and record them.
+            The evaluations not finished within timeout seconds are dropped.
+        """
+        pass
+
+    def add_prior_observations(self, observations):
+        """
+            Learn from the observations of previous runs without evaluating them, e.g., train the surrogate on them.
+            The optimizers without a surrogate evaluate the best configurations first instead.
+        :param observations: a list of (Configuration in self.config_space, perf), perf: the larger, the better.
+        """
+        self.warm_start([config for config, _ in sorted(observations, key=lambda x: -x[1])])
+
     # TODO：Refactor the other optimizers
     def update_saver(self, config_list, perf_list):
+        # The models evaluated on a sample of the data are not saved, see progressive sampling.
+        if getattr(self.evaluator, 'sample_ratio', 1.0) < 1:
+            return
         # Check if all the configs is valid in case of storing None into the config file
         all_invalid = True
 
@@ -59,16 +83,16 @@ class BaseOptimizer(object):
                 save_flag, model_path, delete_flag, model_path_deleted = self.topk_saver.add(config, -perf,
                                                                                              classifier_id)
                 # By default, the evaluator has already stored the models.
-                if self.eval_type in ['holdout', 'partial']:
+                if self.eval_type in ['holdout', 'partial', 'partial_asha']:
                     if save_flag:
                         pass
                     else:
-                        os.remove(model_path)
+                        remove_model(model_path)
                         self.logger.info("Model deleted from %s" % model_path)
 
                     try:
                         if delete_flag:
-                            os.remove(model_path_deleted)
+                            remove_model(model_path_deleted)
                             self.logger.info("Model deleted from %s" % model_path_deleted)
                         else:
                             pass
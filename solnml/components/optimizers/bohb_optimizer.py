@@ -9,11 +9,11 @@ class BohbOptimizer(BaseOptimizer, BohbBase):
     def __init__(self, evaluator, config_space, name, eval_type, time_limit=None, evaluation_limit=None,
                  per_run_time_limit=600, per_run_mem_limit=1024, output_dir='./', timestamp=None,
                  inner_iter_num_per_iter=1, seed=1,
-                 R=27, eta=3, mode='smac', n_jobs=1):
+                 R=27, eta=3, mode='smac', n_jobs=1, refit_schedule='always'):
         BaseOptimizer.__init__(self, evaluator, config_space, name, eval_type=eval_type, timestamp=timestamp,
                                output_dir=output_dir, seed=seed)
         BohbBase.__init__(self, eval_func=self.evaluator, config_generator=mode, config_space=self.config_space,
-                          seed=seed, R=R, eta=eta, n_jobs=n_jobs)
+                          seed=seed, R=R, eta=eta, n_jobs=n_jobs, refit_schedule=refit_schedule)
         self.time_limit = time_limit
         self.evaluation_num_limit = evaluation_limit
         self.inner_iter_num_per_iter = inner_iter_num_per_iter
@@ -2,7 +2,7 @@ import time
 import os
 import random as rd
 import numpy as np
-from math import log
+from math import log, ceil
 from ConfigSpace import ConfigurationSpace
 from ConfigSpace.hyperparameters import UnParametrizedHyperparameter
 
@@ -11,6 +11,7 @@ from solnml.components.utils.constants import IMG_CLS, TEXT_CLS, OBJECT_DET
 from solnml.components.optimizers.base.config_space_utils import sample_configurations
 from solnml.components.models.img_classification.nn_utils.nn_aug.aug_hp_space import get_aug_hyperparameter_space
 from solnml.components.computation.parallel_process import ParallelProcessEvaluator
+from solnml.components.optimizers.base.asha import AshaScheduler, run_asha
 from solnml.components.transfer_learning.tlbo.models.kde import TPE
 from solnml.components.optimizers.base.acquisition import EI
 from solnml.components.optimizers.base.acq_optimizer import RandomSampling
@@ -21,7 +22,14 @@ from solnml.components.optimizers.base.config_space_utils import convert_configu
 
 class CashpOptimizer(object):
     def __init__(self, task_type, architectures, time_limit, sampling_strategy='uniform',
-                 R=27, eta=3, N=9, n_jobs=1):
+                 R=27, eta=3, N=9, n_jobs=1, scheduler='sync'):
+        """
+        :param scheduler: 'sync' runs synchronous successive halving and eliminates architectures between rounds;
+            'asha' promotes the configurations of all the architectures asynchronously.
+        """
+        if scheduler not in ['sync', 'asha']:
+            raise ValueError('Invalid scheduler: %s!' % scheduler)
+        self.scheduler = scheduler
         self.architectures = architectures
         self.time_limit = time_limit
         self.task_type = task_type
@@ -185,6 +193,8 @@ class CashpOptimizer(object):
     """
 
     def run(self, dl_evaluator):
+        if self.scheduler == 'asha':
+            return self.run_async(dl_evaluator)
         start_time = time.time()
         inc_config, inc_perf = None, np.inf
         architecture_candidates = self.architectures.copy()
@@ -298,6 +308,79 @@ class CashpOptimizer(object):
                 print('=' * 20)
         return inc_config, inc_perf
 
+    def run_async(self, dl_evaluator):
+        start_time = time.time()
+        architecture_candidates = self.architectures.copy()
+        self.evaluation_stats['timestamps'] = list()
+        self.evaluation_stats['val_scores'] = list()
+
+        def sample_func(n):
+            n_per_arch = max(1, int(ceil(n / len(architecture_candidates))))
+            configs = self.sample_configs_for_archs(architecture_candidates, n_per_arch,
+                                                    sampling_strategy=self.sampling_strategy)
+            # The uniform strategy always includes the default configurations.
+            evaluated = [config for config, _ in asha.rungs[asha.rung_resources[0]]] + \
+                asha.pending[asha.rung_resources[0]]
+            new_configs = [config for config in configs if config not in evaluated]
+            return new_configs if len(new_configs) > 0 else configs
+
+        asha = AshaScheduler(sample_func, R=self.R, eta=self.eta)
+        for _arch in architecture_candidates:
+            self.eval_hist_configs[_arch] = dict()
+            self.eval_hist_perfs[_arch] = dict()
+            for r in asha.rung_resources:
+                self.eval_hist_configs[_arch][r] = list()
+                self.eval_hist_perfs[_arch][r] = list()
+
+        def callback(config, r, val_loss):
+            if not np.isfinite(val_loss):
+                return
+            _arch = config['estimator']
+            self.eval_hist_configs[_arch][r].append(config)
+            self.eval_hist_perfs[_arch][r].append(val_loss)
+            self.evaluation_stats['timestamps'].append(time.time() - start_time)
+            self.evaluation_stats['val_scores'].append(val_loss)
+
+            # Train surrogate
+            if self.sampling_strategy == 'bohb':
+                if r == self.R:
+                    self.tpe_config_gen[_arch].new_result(config, val_loss, r)
+            elif self.sampling_strategy == 'mfse':
+                normalized_y = std_normalization(self.eval_hist_perfs[_arch][r])
+                self.mfse_config_gen[_arch]['surrogate'].train(
+                    convert_configurations_to_array(self.eval_hist_configs[_arch][r]),
+                    np.array(normalized_y, dtype=np.float64), r=r)
+                asha.reset_candidates()
+
+        budget = self.time_limit - (time.time() - start_time)
+        if self.n_jobs > 1:
+            with ParallelProcessEvaluator(dl_evaluator, n_worker=self.n_jobs) as executor:
+                run_asha(asha, executor, self.n_jobs, budget, callback=callback)
+        else:
+            run_asha(asha, None, 1, budget, callback=callback, eval_func=dl_evaluator)
+
+        # Remove tmp model
+        if dl_evaluator.continue_training:
+            for filename in os.listdir(dl_evaluator.model_dir):
+                # Temporary model
+                if 'tmp_%s' % dl_evaluator.timestamp in filename:
+                    try:
+                        filepath = os.path.join(dl_evaluator.model_dir, filename)
+                        os.remove(filepath)
+                    except Exception:
+                        pass
+
+        # The incumbent is the best configuration in the highest rung reached.
+        inc_config, inc_perf = None, np.inf
+        for r in reversed(asha.rung_resources):
+            results = [(config, loss) for config, loss in asha.rungs[r] if np.isfinite(loss)]
+            if len(results) > 0:
+                inc_config, inc_perf = min(results, key=lambda x: x[1])
+                break
+        self.logger.info('ASHA finished %d evaluations in %.2f seconds' %
+                         (sum(len(asha.rungs[r]) for r in asha.rung_resources), time.time() - start_time))
+        return inc_config, inc_perf
+
     def query_performance(self, C, r):
         perfs = list()
         for config in C:
@@ -7,18 +7,30 @@ from solnml.components.optimizers.tpe_optimizer import TPEOptimizer
 def build_hpo_optimizer(eval_type, evaluator, config_space,
                         per_run_time_limit=600, per_run_mem_limit=1024,
                         output_dir='./', inner_iter_num_per_iter=1,
-                        timestamp=None, seed=1, n_jobs=1):
+                        timestamp=None, seed=1, n_jobs=1, acq_type='ei', refit_schedule='always'):
+    """
+    :param refit_schedule: when the random forest surrogates of BOHB and the runtime model of SMAC are refitted,
+        'always', 'doubling' or 'interval', see RandomForestWithInstances.
+    """
+    optimizer_kwargs = dict()
     if eval_type == 'partial':
         optimizer_class = MfseOptimizer
+    elif eval_type == 'partial_asha':
+        optimizer_class = MfseOptimizer
+        optimizer_kwargs['scheduler'] = 'asha'
     elif eval_type == 'partial_bohb':
         optimizer_class = BohbOptimizer
+        optimizer_kwargs['refit_schedule'] = refit_schedule
     elif eval_type == 'holdout_tpe':
         optimizer_class = TPEOptimizer
     else:
         # TODO: Support asynchronous BO
         optimizer_class = SMACOptimizer
+        optimizer_kwargs['acq_type'] = acq_type
+        optimizer_kwargs['refit_schedule'] = refit_schedule
     return optimizer_class(evaluator, config_space, 'hpo',
                            eval_type=eval_type, output_dir=output_dir,
                            per_run_time_limit=per_run_time_limit,
                            inner_iter_num_per_iter=inner_iter_num_per_iter,
-                           timestamp=timestamp, seed=seed, n_jobs=n_jobs)
+                           timestamp=timestamp, seed=seed, n_jobs=n_jobs,
+                           **optimizer_kwargs)
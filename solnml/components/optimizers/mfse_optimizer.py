@@ -10,12 +10,12 @@ from solnml.components.optimizers.base.mfsebase import MfseBase
 class MfseOptimizer(BaseOptimizer, MfseBase):
     def __init__(self, evaluator, config_space, name, eval_type, time_limit=None, evaluation_limit=None,
                  per_run_time_limit=600, per_run_mem_limit=1024, output_dir='./', timestamp=None,
-                 inner_iter_num_per_iter=1, seed=1, R=27, eta=3, n_jobs=1):
+                 inner_iter_num_per_iter=1, seed=1, R=27, eta=3, n_jobs=1, scheduler='sync'):
         BaseOptimizer.__init__(self, evaluator, config_space, name, eval_type=eval_type, timestamp=timestamp,
                                output_dir=output_dir, seed=seed)
         MfseBase.__init__(self, eval_func=self.evaluator, config_space=self.config_space,
                           per_run_time_limit=per_run_time_limit, seed=seed,
-                          R=R, eta=eta, n_jobs=n_jobs, output_dir=output_dir)
+                          R=R, eta=eta, n_jobs=n_jobs, output_dir=output_dir, scheduler=scheduler)
         self.time_limit = time_limit
         self.evaluation_num_limit = evaluation_limit
 
@@ -24,6 +24,12 @@ class MfseOptimizer(BaseOptimizer, MfseBase):
         self.per_run_time_limit = per_run_time_limit
         self.per_run_mem_limit = per_run_mem_limit
 
+    def warm_start(self, configs):
+        self.warm_start_configs = list(configs)
+
+    def add_prior_observations(self, observations):
+        MfseBase.add_prior_observations(self, observations)
+
     def iterate(self, budget=MAX_INT):
         '''
             Iterate a SH procedure (inner loop) in Hyperband.
@@ -35,12 +41,15 @@ class MfseOptimizer(BaseOptimizer, MfseBase):
             if _time_elapsed >= budget:
                 break
             budget_left = budget - _time_elapsed
-            config_list, perf_list = self._iterate(self.s_values[self.inner_iter_id], budget=budget_left)
+            if self.scheduler == 'asha':
+                config_list, perf_list = self._iterate_async(self.s_values[self.inner_iter_id], budget=budget_left)
+            else:
+                config_list, perf_list = self._iterate(self.s_values[self.inner_iter_id], budget=budget_left)
             self.update_saver(config_list, perf_list)
             self.inner_iter_id = (self.inner_iter_id + 1) % (self.s_max + 1)
 
-            # Remove tmp model
-            if self.evaluator.continue_training:
+            # Remove tmp model, ASHA keeps them to continue training the configurations promoted later.
+            if self.evaluator.continue_training and self.scheduler != 'asha':
                 for filename in os.listdir(self.evaluator.model_dir):
                     # Temporary model
                     if 'tmp_%s' % self.evaluator.timestamp in filename:
@@ -50,6 +59,19 @@ class MfseOptimizer(BaseOptimizer, MfseBase):
                         except Exception:
                             pass
 
+        self.update_incumbent()
+
+        # Incumbent performance: the large, the better.
+        iteration_cost = time.time() - _start_time
+        return self.incumbent_perf, iteration_cost, self.incumbent_config
+
+    def collect_running_evaluations(self, timeout=None):
+        config_list, perf_list = self.collect_running_jobs(timeout=timeout)
+        if len(config_list) > 0:
+            self.update_saver(config_list, perf_list)
+            self.update_incumbent()
+
+    def update_incumbent(self):
         if len(self.incumbent_perfs) > 0:
             inc_idx = np.argmin(np.array(self.incumbent_perfs))
 
@@ -77,9 +99,5 @@ class MfseOptimizer(BaseOptimizer, MfseBase):
         self.perfs = self.incumbent_perfs
         self.configs = self.incumbent_configs
 
-        # Incumbent performance: the large, the better.
-        iteration_cost = time.time() - _start_time
-        return self.incumbent_perf, iteration_cost, self.incumbent_config
-
     def get_evaluation_stats(self):
         return self.evaluation_stats
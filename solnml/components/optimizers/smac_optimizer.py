@@ -4,12 +4,15 @@ from openbox.optimizer.parallel_smbo import pSMBO as pBO
 from openbox.optimizer.generic_smbo import SMBO as BO
 from openbox.utils.constants import SUCCESS
 from solnml.components.optimizers.base_optimizer import BaseOptimizer, MAX_INT
+from solnml.components.optimizers.base.runtime_model import RuntimeModel, RuntimeAwareAcquisition
+from solnml.components.optimizers.base.prior_surrogate import PriorAwareTrain
+from solnml.components.utils.eval_memo import get_evaluation_memo
 
 
 class SMACOptimizer(BaseOptimizer):
     def __init__(self, evaluator, config_space, name, eval_type, time_limit=None, evaluation_limit=None,
                  per_run_time_limit=300, per_run_mem_limit=1024, output_dir='./', timestamp=None,
-                 inner_iter_num_per_iter=1, seed=1, n_jobs=1):
+                 inner_iter_num_per_iter=1, seed=1, n_jobs=1, acq_type='ei', refit_schedule='always'):
         super().__init__(evaluator, config_space, name, eval_type=eval_type, timestamp=timestamp, output_dir=output_dir,
                          seed=seed)
         self.time_limit = time_limit
@@ -18,26 +21,19 @@ class SMACOptimizer(BaseOptimizer):
         self.per_run_time_limit = per_run_time_limit
         self.per_run_mem_limit = per_run_mem_limit
 
-        if n_jobs == 1:
-            self.optimizer = BO(objective_function=self.evaluator,
-                                config_space=config_space,
-                                surrogate_type='prf',
-                                acq_type='ei',
-                                max_runs=int(1e10),
-                                task_id='Default',
-                                time_limit_per_trial=self.per_run_time_limit,
-                                random_state=self.seed)
-        else:
-            # TODO: Potential read-write conflict on history file.
-            self.optimizer = pBO(objective_function=self.evaluator,
-                                 config_space=config_space,
-                                 batch_size=n_jobs,
-                                 surrogate_type='prf',
-                                 acq_type='ei',
-                                 max_runs=int(1e10),
-                                 task_id='Default',
-                                 time_limit_per_trial=self.per_run_time_limit,
-                                 random_state=self.seed)
+        self.n_jobs = n_jobs
+        if acq_type not in ['ei', 'eips']:
+            raise ValueError('Invalid acquisition type: %s!' % acq_type)
+        if acq_type == 'eips' and n_jobs > 1:
+            # The trial durations are only observed in the sequential mode.
+            self.logger.warning('EI per second is not supported with n_jobs > 1, use EI instead!')
+            acq_type = 'ei'
+        self.acq_type = acq_type
+        self.runtime_model = RuntimeModel(config_space, seed=seed, refit_schedule=refit_schedule) if acq_type == 'eips' else None
+        self.warm_start_configs = list()
+        # (config, objective) observed in previous runs, sorted by the objective.
+        self.prior_observations = list()
+        self.optimizer = self.build_optimizer()
 
         self.trial_cnt = 0
         self.configs = list()
@@ -55,7 +51,99 @@ class SMACOptimizer(BaseOptimizer):
         self.logger.debug('The maximum trial number in HPO is: %d' % self.config_num_threshold)
         self.maximum_config_num = min(1500, self.config_num_threshold)
         self.eval_dict = {}
-        self.n_jobs = n_jobs
+
+    def build_optimizer(self):
+        # The warm start configurations replace the random initial design.
+        initial_configurations, initial_runs = None, 3
+        if len(self.warm_start_configs) > 0:
+            initial_configurations, initial_runs = self.warm_start_configs, len(self.warm_start_configs)
+        elif len(self.prior_observations) > 0:
+            # The surrogate starts from the prior observations, only the best prior configuration
+            # is evaluated to get an incumbent in this run.
+            initial_configurations, initial_runs = [self.prior_observations[0][0]], 1
+        if self.n_jobs == 1:
+            optimizer = BO(objective_function=self.evaluator,
+                          config_space=self.config_space,
+                          surrogate_type='prf',
+                          acq_type='ei',
+                          max_runs=int(1e10),
+                          task_id='Default',
+                          initial_runs=initial_runs,
+                          initial_configurations=initial_configurations,
+                          time_limit_per_trial=self.per_run_time_limit,
+                          random_state=self.seed)
+            if self.runtime_model is not None:
+                # Rank the candidates by expected improvement per second, and never suggest
+                # the ones predicted to exceed the time limit.
+                acquisition_function = optimizer.config_advisor.acquisition_function
+                acquisition_function._compute = RuntimeAwareAcquisition(acquisition_function._compute,
+                                                                        self.runtime_model,
+                                                                        time_limit=self.per_run_time_limit)
+        else:
+            # TODO: Potential read-write conflict on history file.
+            optimizer = pBO(objective_function=self.evaluator,
+                            config_space=self.config_space,
+                            batch_size=self.n_jobs,
+                            surrogate_type='prf',
+                            acq_type='ei',
+                            max_runs=int(1e10),
+                            task_id='Default',
+                            initial_runs=initial_runs,
+                            initial_configurations=initial_configurations,
+                            time_limit_per_trial=self.per_run_time_limit,
+                            random_state=self.seed)
+        if len(self.prior_observations) > 0:
+            surrogate_model = optimizer.config_advisor.surrogate_model
+            surrogate_model.train = PriorAwareTrain(surrogate_model.train, self.prior_observations)
+        return optimizer
+
+    def update_runtime_model(self, config, trial_num, memo_hits):
+        """
+            Add the elapsed time of the last trial recorded by the run history, i.e., the time of the evaluator call
+            without the surrogate fitting and the acquisition optimization of iterate().
+        :param trial_num: the number of trials in the run history before iterate().
+        :param memo_hits: the number of evaluation memo hits before iterate().
+        """
+        # The result was served by the evaluation memo, its elapsed time is not the runtime of the config.
+        if get_evaluation_memo().n_hits > memo_hits:
+            return
+        runhistory = self.optimizer.get_history()
+        if len(runhistory.configurations) <= trial_num:
+            return
+        elapsed_time = runhistory.elapsed_times[-1]
+        if elapsed_time is not None:
+            self.runtime_model.add(config, elapsed_time)
+
+    def warm_start(self, configs):
+        if len(self.optimizer.get_history().configurations) > 0:
+            self.logger.warning('Warm start is ignored since the optimization has already started!')
+            return
+        self.warm_start_configs = list(configs)
+        self.optimizer = self.build_optimizer()
+
+    def add_prior_observations(self, observations):
+        if len(self.optimizer.get_history().configurations) > 0:
+            self.logger.warning('Prior observations are ignored since the optimization has already started!')
+            return
+        # The objective of OpenBox is minimized.
+        self.prior_observations = sorted([(config, -perf) for config, perf in observations], key=lambda x: x[1])
+        self.optimizer = self.build_optimizer()
+
+    def __getstate__(self):
+        """The OpenBox optimizer holds its surrogate and worker pool, which can not be pickled:
+        only its run history is kept, and the optimizer is rebuilt on top of it.
+        """
+        state = self.__dict__.copy()
+        optimizer = state.pop('optimizer')
+        state['history_container'] = optimizer.get_history()
+        return state
+
+    def __setstate__(self, state):
+        history_container = state.pop('history_container')
+        self.__dict__.update(state)
+        self.optimizer = self.build_optimizer()
+        self.optimizer.config_advisor.history_container = history_container
+        self.optimizer.iteration_id = len(history_container.configurations)
 
     def run(self):
         while True:
@@ -86,7 +174,11 @@ class SMACOptimizer(BaseOptimizer):
                 if time.time() - _start_time > budget:
                     self.logger.warning('Time limit exceeded!')
                     break
+                _trial_num = len(self.optimizer.get_history().configurations)
+                _memo_hits = get_evaluation_memo().n_hits
                 _config, _status, _, _perf = self.optimizer.iterate()
+                if self.runtime_model is not None:
+                    self.update_runtime_model(_config, _trial_num, _memo_hits)
                 self.update_saver([_config], [_perf[0]])
                 if _status == SUCCESS:
                     self.exp_output[time.time()] = (_config, _perf[0])
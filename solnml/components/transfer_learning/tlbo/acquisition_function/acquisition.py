@@ -1,7 +1,7 @@
 # encoding=utf8
 import abc
 import copy
-from typing import List
+from typing import List, Union
 
 import numpy as np
 from scipy.stats import norm
@@ -52,21 +52,24 @@ class AbstractAcquisitionFunction(object, metaclass=abc.ABCMeta):
         for key in kwargs:
             setattr(self, key, kwargs[key])
 
-    def __call__(self, configurations: List[Configuration]):
+    def __call__(self, configurations: Union[List[Configuration], np.ndarray]):
         """Computes the acquisition value for a given X
 
         Parameters
         ----------
-        configurations : list
+        configurations : list or np.ndarray
             The configurations where the acquisition function
-            should be evaluated.
+            should be evaluated, or their imputed array representation.
 
         Returns
         -------
         np.ndarray(N, 1)
             acquisition values for X
         """
-        X = convert_configurations_to_array(configurations)
+        if isinstance(configurations, np.ndarray):
+            X = configurations
+        else:
+            X = convert_configurations_to_array(configurations)
         if len(X.shape) == 1:
             X = X[np.newaxis, :]
 
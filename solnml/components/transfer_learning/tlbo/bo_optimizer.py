@@ -43,7 +43,8 @@ class BO(BaseFacade):
                  initial_configurations=None,
                  initial_runs=3,
                  task_id=None,
-                 rng=None):
+                 rng=None,
+                 refit_schedule='always'):
         super().__init__(config_space, task_id)
         if rng is None:
             run_id, rng = get_rng()
@@ -70,7 +71,8 @@ class BO(BaseFacade):
         if self.surrogate_model == 'gp':
             self.model = create_gp_model(config_space, rng)
         elif self.surrogate_model == 'prob_rf':
-            self.model = RandomForestWithInstances(config_space, seed=rng.randint(MAXINT), normalize_y=True)
+            self.model = RandomForestWithInstances(config_space, seed=rng.randint(MAXINT), normalize_y=True,
+                                                   refit_schedule=refit_schedule)
         else:
             raise ValueError('Unsupported surrogate model - %s!' % self.surrogate_model)
 
@@ -157,6 +159,6 @@ class BO(BaseFacade):
             num_points=1000,
             random_configuration_chooser=self.random_configuration_chooser
         )
-        config = list(challengers)[0]
+        config = next(challengers)
         # assert config.origin != 'Random Search'
         return config
@@ -120,6 +120,8 @@ class GaussianProcessEnsemble(BaseModel):
         self.gp_models = gp_models
         assert self.gp_models is not None
         self.weight_update_id = 0
+        # Predictions of the base surrogates on the observed configurations, keyed by the raw bytes of the row.
+        self.base_predictions = dict()
         self._init()
 
     def create_basic_model(self):
@@ -137,16 +139,49 @@ class GaussianProcessEnsemble(BaseModel):
         # Set initial weights.
         self.model_weights = np.array([1]*self.n_runhistory + [0]) / self.n_runhistory
 
+    def _predict_base_models(self, X: np.ndarray):
+        """
+            Return the predictive mean and std of all base surrogates on X with shape (n_runhistory, N).
+            The base surrogates are fixed, so the predictions on the observed configurations are cached.
+        """
+        keys = [x.tobytes() for x in X]
+        new_idx = [idx for idx, key in enumerate(keys) if key not in self.base_predictions]
+        if len(new_idx) > 0:
+            mu_list, std_list = list(), list()
+            for _model in self.gp_models:
+                _mu, _var = _model.predict(X[new_idx])
+                mu_list.append(_mu.flatten())
+                std_list.append(np.sqrt(_var).flatten())
+            mu_list, std_list = np.array(mu_list), np.array(std_list)
+            for i, idx in enumerate(new_idx):
+                self.base_predictions[keys[idx]] = (mu_list[:, i], std_list[:, i])
+
+        predictive_mu = np.array([self.base_predictions[key][0] for key in keys]).T
+        predictive_std = np.array([self.base_predictions[key][1] for key in keys]).T
+        return predictive_mu, predictive_std
+
+    @staticmethod
+    def _compute_ranking_loss(y: np.ndarray, mu: np.ndarray, std: np.ndarray, n_sampling: int):
+        """
+            Draw n_sampling predictions from N(mu, std) and count the misranked pairs (i, j) of each draw w.r.t. y.
+        """
+        sampled_y = np.random.normal(mu, std, size=(n_sampling, len(y)))
+        y_order = y[:, np.newaxis] < y[np.newaxis, :]
+        # Bound the size of the (n_samples, N, N) comparison tensor.
+        chunk_size = max(1, int(1e7 // (len(y) * len(y))))
+        rank_loss = list()
+        for start_id in range(0, n_sampling, chunk_size):
+            _sampled_y = sampled_y[start_id: start_id + chunk_size]
+            sampled_order = _sampled_y[:, :, np.newaxis] < _sampled_y[:, np.newaxis, :]
+            rank_loss.append(np.sum(sampled_order ^ y_order, axis=(1, 2)))
+        return np.concatenate(rank_loss)
+
     def _update_weights(self, X: np.ndarray, y: np.ndarray):
         _start_time = time.time()
         n_instance = X.shape[0]
         n_fold = 5
-        predictive_mu, predictive_std = list(), list()
 
-        for _model in self.gp_models:
-            _mu, _var = _model.predict(X)
-            predictive_mu.append(_mu)
-            predictive_std.append(np.sqrt(_var))
+        predictive_mu, predictive_std = self._predict_base_models(X)
 
         skip_target_model = True if n_instance < n_fold else False
 
@@ -163,56 +198,28 @@ class GaussianProcessEnsemble(BaseModel):
                 _mu, _var = _target_model.predict(X[start_id: start_id+bound])
                 target_mu.extend(_mu.flatten())
                 target_std.extend(np.sqrt(_var).flatten())
-                # target_mu.append(_mu)
-                # target_std.append(np.sqrt(_var))
-
-            predictive_mu.append(target_mu)
-            predictive_std.append(target_std)
 
         n_sampling = 100
-        argmin_cnt = [0] * (self.n_runhistory + 1)
-        ranking_loss_hist = list()
-
-        for _ in range(n_sampling):
-            ranking_loss_list = list()
-            for task_id in range(self.n_runhistory):
-                sampled_y = np.random.normal(predictive_mu[task_id], predictive_std[task_id])
-                rank_loss = 0
-                for i in range(len(y)):
-                    for j in range(len(y)):
-                        if (y[i] < y[j]) ^ (sampled_y[i] < sampled_y[j]):
-                            rank_loss += 1
-                ranking_loss_list.append(rank_loss)
-
-            # Compute ranking loss for target surrogate.
-            rank_loss = 0
-            if not skip_target_model:
-                # fold_num = n_instance // n_fold
-                # for i in range(n_fold):
-                #     sampled_y = np.random.normal(predictive_mu[self.n_runhistory][i], predictive_std[self.n_runhistory][i])
-                #     bound = (n_instance - i * fold_num) if i == (n_fold - 1) else fold_num
-                #     start_id = fold_num*i
-                #     for i in range(start_id, start_id + bound):
-                #         for j in range(n_instance):
-                #             if (y[i] < y[j]) ^ (sampled_y[i] < sampled_y[j]):
-                #                 rank_loss += 1
-                sampled_y = np.random.normal(predictive_mu[self.n_runhistory], predictive_std[self.n_runhistory])
-                for i in range(len(y)):
-                    for j in range(len(y)):
-                        if (y[i] < y[j]) ^ (sampled_y[i] < sampled_y[j]):
-                            rank_loss += 1
-            else:
-                rank_loss = len(y) * len(y)
-            ranking_loss_list.append(rank_loss)
-            ranking_loss_hist.append(ranking_loss_list)
-            argmin_id = np.argmin(ranking_loss_list)
-            argmin_cnt[argmin_id] += 1
+        y_flatten = np.asarray(y).flatten()
+        # ranking_loss_hist[k, task_id]: the ranking loss of the k-th sampling.
+        ranking_loss_hist = np.zeros((n_sampling, self.n_runhistory + 1))
+        for task_id in range(self.n_runhistory):
+            ranking_loss_hist[:, task_id] = self._compute_ranking_loss(y_flatten, predictive_mu[task_id],
+                                                                       predictive_std[task_id], n_sampling)
+
+        # Compute ranking loss for target surrogate.
+        if not skip_target_model:
+            ranking_loss_hist[:, -1] = self._compute_ranking_loss(y_flatten, np.array(target_mu),
+                                                                  np.array(target_std), n_sampling)
+        else:
+            ranking_loss_hist[:, -1] = n_instance * n_instance
+
+        argmin_cnt = np.bincount(np.argmin(ranking_loss_hist, axis=1), minlength=self.n_runhistory + 1)
 
         self.model_weights = np.array(argmin_cnt) / n_sampling
         print(self.model_weights)
 
         self.ignore_flag = [False] * self.n_runhistory
-        ranking_loss_hist = np.array(ranking_loss_hist)
         threshold = sorted(ranking_loss_hist[:, -1])[int(n_sampling * 0.7)]
         for i in range(self.n_runhistory):
             median = sorted(ranking_loss_hist[:, i])[int(n_sampling * 0.5)]
@@ -1,4 +1,5 @@
 import logging
+import time
 import typing
 
 import numpy as np
@@ -43,6 +44,8 @@ class RandomForestWithInstances(AbstractModel):
                  eps_purity: float=1e-8,
                  max_num_nodes: int=2**20,
                  seed: int=42,
+                 refit_schedule: str='always',
+                 refit_interval: int=10,
                  **kwargs):
         """
         Parameters
@@ -80,6 +83,12 @@ class RandomForestWithInstances(AbstractModel):
             The maxmimum total number of nodes in a tree
         seed : int
             The seed that is passed to the random_forest_run library.
+        refit_schedule : str
+            When to rebuild the forest in train(). 'always' refits after every call,
+            'doubling' refits once the number of data points has doubled since the
+            last refit, and 'interval' refits every refit_interval new data points.
+        refit_interval : int
+            The number of new data points between two refits if refit_schedule='interval'.
         """
         types, bounds = get_types(config_space, instance_features=None)
         super().__init__(config_space, types, bounds, seed, **kwargs)
@@ -88,22 +97,24 @@ class RandomForestWithInstances(AbstractModel):
         self.log_y = log_y
         self.rng = regression.default_random_engine(seed)
 
-        self.rf_opts = regression.forest_opts()
-        self.rf_opts.num_trees = num_trees
-        self.rf_opts.do_bootstrapping = do_bootstrapping
-        max_features = 0 if ratio_features > 1.0 else \
-            max(1, int(types.shape[0] * ratio_features))
-        self.rf_opts.tree_opts.max_features = max_features
-        self.rf_opts.tree_opts.min_samples_to_split = min_samples_split
-        self.rf_opts.tree_opts.min_samples_in_leaf = min_samples_leaf
-        self.rf_opts.tree_opts.max_depth = max_depth
-        self.rf_opts.tree_opts.epsilon_purity = eps_purity
-        self.rf_opts.tree_opts.max_num_nodes = max_num_nodes
-        self.rf_opts.compute_law_of_total_variance = False
+        self.rf_opts = self._create_rf_opts(num_trees, do_bootstrapping, ratio_features, min_samples_split,
+                                            min_samples_leaf, max_depth, eps_purity, max_num_nodes)
 
         self.n_points_per_tree = n_points_per_tree
         self.rf = None  # type: regression.binary_rss_forest
 
+        if refit_schedule not in ['always', 'doubling', 'interval']:
+            raise ValueError('Invalid refit schedule: %s!' % refit_schedule)
+        self.refit_schedule = refit_schedule
+        self.refit_interval = refit_interval
+        self.n_points_at_refit = 0
+        self.num_refits = 0
+        # Time cost (in seconds) of each call to train(), including the skipped refits.
+        self.train_time_history = list()
+        self._data = None
+        self._data_X = None
+        self._data_y = None
+
         # This list well be read out by save_iteration() in the solver
         self.hypers = [num_trees, max_num_nodes, do_bootstrapping,
                        n_points_per_tree, ratio_features, min_samples_split,
@@ -113,6 +124,47 @@ class RandomForestWithInstances(AbstractModel):
         self.logger = logging.getLogger(self.__module__ + "." +
                                         self.__class__.__name__)
 
+    def _create_rf_opts(self, num_trees, do_bootstrapping, ratio_features, min_samples_split,
+                        min_samples_leaf, max_depth, eps_purity, max_num_nodes):
+        rf_opts = regression.forest_opts()
+        rf_opts.num_trees = num_trees
+        rf_opts.do_bootstrapping = do_bootstrapping
+        max_features = 0 if ratio_features > 1.0 else \
+            max(1, int(self.types.shape[0] * ratio_features))
+        rf_opts.tree_opts.max_features = max_features
+        rf_opts.tree_opts.min_samples_to_split = min_samples_split
+        rf_opts.tree_opts.min_samples_in_leaf = min_samples_leaf
+        rf_opts.tree_opts.max_depth = max_depth
+        rf_opts.tree_opts.epsilon_purity = eps_purity
+        rf_opts.tree_opts.max_num_nodes = max_num_nodes
+        rf_opts.compute_law_of_total_variance = False
+        return rf_opts
+
+    def __getstate__(self):
+        """The pyrfr objects (SwigPyObject) can not be pickled: the forest is stored as its
+        ascii representation, the random engine and the options are rebuilt from the hypers.
+        """
+        state = self.__dict__.copy()
+        for key in ['rng', 'rf_opts', '_data']:
+            state.pop(key)
+        state['_data_X'], state['_data_y'] = None, None
+        state['rf'] = None if self.rf is None else self.rf.ascii_string_representation()
+        return state
+
+    def __setstate__(self, state):
+        rf_representation = state.pop('rf')
+        self.__dict__.update(state)
+        num_trees, max_num_nodes, do_bootstrapping, _, ratio_features, min_samples_split, \
+            min_samples_leaf, max_depth, eps_purity, seed = self.hypers
+        self.rng = regression.default_random_engine(seed)
+        self.rf_opts = self._create_rf_opts(num_trees, do_bootstrapping, ratio_features, min_samples_split,
+                                            min_samples_leaf, max_depth, eps_purity, max_num_nodes)
+        self._data = None
+        self.rf = None
+        if rf_representation is not None:
+            self.rf = regression.binary_rss_forest()
+            self.rf.load_from_ascii_string(rf_representation)
+
     def _train(self, X: np.ndarray, y: np.ndarray):
         """Trains the random forest on X and y.
 
@@ -128,10 +180,19 @@ class RandomForestWithInstances(AbstractModel):
         self
         """
 
-        self.X = X
-        self.y = y.flatten()
+        start_time = time.time()
+        y = y.flatten()
         if self.normalize_y:
-            self.y = self._normalize_y(self.y)
+            # The forest is fitted on the raw targets, whose normalization changes at every call,
+            # and the predictions are normalized with the statistics of the current targets.
+            self._normalize_y(y)
+        if not self._need_refit(X.shape[0]):
+            # Keep the forest fitted at the last refit, along with the data it was fitted on.
+            self._log_train(X.shape[0], start_time)
+            return self
+
+        self.X = X
+        self.y = y
 
         if self.n_points_per_tree <= 0:
             self.rf_opts.num_data_points_per_tree = self.X.shape[0]
@@ -139,10 +200,50 @@ class RandomForestWithInstances(AbstractModel):
             self.rf_opts.num_data_points_per_tree = self.n_points_per_tree
         self.rf = regression.binary_rss_forest()
         self.rf.options = self.rf_opts
-        data = self._init_data_container(self.X, self.y)
+        data = self._update_data_container(self.X, self.y)
         self.rf.fit(data, rng=self.rng)
+
+        self.n_points_at_refit = self.X.shape[0]
+        self.num_refits += 1
+        self._log_train(X.shape[0], start_time)
         return self
 
+    def _log_train(self, n_points: int, start_time: float):
+        self.train_time_history.append(time.time() - start_time)
+        self.logger.debug('Trained the random forest on %d points in %.4f seconds (%d refits in %d calls, '
+                          '%.4f seconds in total).' % (n_points, self.train_time_history[-1], self.num_refits,
+                                                      len(self.train_time_history), sum(self.train_time_history)))
+
+    def get_train_stats(self):
+        """The cost of the calls to train(): the number of calls and refits, and the time spent (in seconds)."""
+        return {'n_trains': len(self.train_time_history),
+                'n_refits': self.num_refits,
+                'train_time': float(np.sum(self.train_time_history)),
+                'last_train_time': self.train_time_history[-1] if len(self.train_time_history) > 0 else None}
+
+    def _need_refit(self, n_points: int):
+        if self.rf is None or self.refit_schedule == 'always':
+            return True
+        if n_points < self.n_points_at_refit:
+            return True
+        if self.refit_schedule == 'doubling':
+            return n_points >= 2 * self.n_points_at_refit
+        return n_points - self.n_points_at_refit >= self.refit_interval
+
+    def _update_data_container(self, X: np.ndarray, y: np.ndarray):
+        """Reuses the data container of the last refit if X and y only append
+        new data points to it, otherwise builds a new one.
+        """
+        n_old = 0 if self._data_X is None else self._data_X.shape[0]
+        if self._data is not None and n_old <= X.shape[0] and \
+                np.array_equal(self._data_X, X[:n_old]) and np.array_equal(self._data_y, y[:n_old]):
+            self._add_data_points(self._data, X[n_old:], y[n_old:])
+        else:
+            self._data = self._init_data_container(X, y)
+        self._data_X = X.copy()
+        self._data_y = y.copy()
+        return self._data
+
     def _init_data_container(self, X: np.ndarray, y: np.ndarray):
         """Fills a pyrfr default data container, s.t. the forest knows
         categoricals and bounds for continous data
@@ -168,10 +269,15 @@ class RandomForestWithInstances(AbstractModel):
             else:
                 data.set_bounds_of_feature(i, mn, mx)
 
-        for row_X, row_y in zip(X, y):
-            data.add_data_point(row_X, row_y)
+        self._add_data_points(data, X, y)
         return data
 
+    @staticmethod
+    def _add_data_points(data, X: np.ndarray, y: np.ndarray):
+        # Converting to python lists in one go avoids a numpy-to-vector conversion per row.
+        for row_X, row_y in zip(X.tolist(), y.tolist()):
+            data.add_data_point(row_X, row_y)
+
     def _predict(self, X: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
         """Predict means and variances for given X.
 
@@ -201,11 +307,14 @@ class RandomForestWithInstances(AbstractModel):
                 for preds in preds_per_tree:
                     # within one tree, we want to use the
                     # arithmetic mean and not the geometric mean
-                    means_per_tree.append(np.log(np.mean(np.exp(preds))))
+                    means_per_tree.append(np.log(np.mean(np.exp(self._transform_y(preds)))))
                 mean = np.mean(means_per_tree)
                 var = np.var(means_per_tree) # variance over trees as uncertainty estimate
             else:
                 mean, var = self.rf.predict_mean_var(row_X)
+                mean = self._transform_y(mean)
+                if self.normalize_y:
+                    var = var / self.std_y_ ** 2
             means.append(mean)
             vars_.append(var)
         means = np.array(means)
@@ -213,6 +322,12 @@ class RandomForestWithInstances(AbstractModel):
 
         return means.reshape((-1, 1)), vars_.reshape((-1, 1))
 
+    def _transform_y(self, y):
+        """Normalize the raw predictions or leaf values with the statistics of the last call to train()."""
+        if not self.normalize_y:
+            return y
+        return (np.asarray(y) - self.mean_y_) / self.std_y_
+
     def predict_marginalized_over_instances(self, X: np.ndarray):
         """Predict mean and variance marginalized over all instances.
 
@@ -271,6 +386,7 @@ class RandomForestWithInstances(AbstractModel):
 
             # 2. average in each tree
             for tree_id in range(self.rf_opts.num_trees):
+                preds_trees[tree_id] = self._transform_y(preds_trees[tree_id])
                 if self.log_y:
                     preds_trees[tree_id] = \
                         np.log(np.mean(np.exp(preds_trees[tree_id])))
@@ -8,8 +8,10 @@ import numpy as np
 from ..acquisition_function.acquisition import AbstractAcquisitionFunction
 from ..config_space import get_one_exchange_neighbourhood, \
     Configuration, ConfigurationSpace
+from ..config_space.util import impute_default_values
 from ..optimizer.random_configuration_chooser import ChooserNoCoolDown
 from ..utils.history_container import HistoryContainer
+from solnml.components.optimizers.base.config_space_utils import sample_configurations_array
 
 
 class AcquisitionFunctionMaximizer(object, metaclass=abc.ABCMeta):
@@ -359,6 +361,31 @@ class RandomSearch(AcquisitionFunctionMaximizer):
                 rand_configs[i].origin = 'Random Search'
             return [(0, rand_configs[i]) for i in range(len(rand_configs))]
 
+    def _maximize_array(
+            self,
+            num_points: int
+    ) -> List[Tuple[float, np.ndarray]]:
+        """Randomly sampled configurations in their array representation, sorted
+        according to acquisition function. No Configuration object is created.
+
+        Parameters
+        ----------
+        num_points: int
+            number of points to be sampled
+
+        Returns
+        -------
+        list: (acquisition value, configuration vector),
+                ordered by their acquisition function value
+        """
+        rand_array = sample_configurations_array(self.config_space, num_points, self.rng)
+        acq_values = self.acquisition_function(impute_default_values(self.config_space, rand_array.copy()))
+
+        random = self.rng.rand(len(acq_values))
+        # Last column is primary sort key!
+        indices = np.lexsort((random.flatten(), acq_values.flatten()))
+        return [(acq_values[ind][0], rand_array[ind]) for ind in indices[::-1]]
+
 
 class InterleavedLocalAndRandomSearch(AcquisitionFunctionMaximizer):
     """Implements openbox's default acquisition function optimization.
@@ -453,11 +480,9 @@ class InterleavedLocalAndRandomSearch(AcquisitionFunctionMaximizer):
             runhistory, self.n_sls_iterations, **kwargs
         )
 
-        # Get configurations sorted by EI
-        next_configs_by_random_search_sorted = self.random_search._maximize(
-            runhistory,
-            num_points - len(next_configs_by_local_search),
-            _sorted=True,
+        # Get configurations sorted by EI, they are kept as arrays until the ChallengerList returns them
+        next_configs_by_random_search_sorted = self.random_search._maximize_array(
+            num_points - len(next_configs_by_local_search)
         )
 
         # Having the configurations from random search, sorted by their
@@ -473,7 +498,8 @@ class InterleavedLocalAndRandomSearch(AcquisitionFunctionMaximizer):
         next_configs_by_acq_value.sort(reverse=True, key=lambda x: x[0])
         self.logger.debug(
             "First 10 acq func (origin) values of selected configurations: %s",
-            str([[_[0], _[1].origin] for _ in next_configs_by_acq_value[:10]])
+            str([[_[0], _[1].origin if isinstance(_[1], Configuration) else 'Random Search (sorted)']
+                 for _ in next_configs_by_acq_value[:10]])
         )
         next_configs_by_acq_value = [_[1] for _ in next_configs_by_acq_value]
 
@@ -503,7 +529,8 @@ class ChallengerList(object):
     Parameters
     ----------
     challengers : list
-        List of challengers (without interleaved random configurations)
+        List of challengers (without interleaved random configurations), each of
+        which is a Configuration or its vector representation
 
     configuration_space : ConfigurationSpace
         ConfigurationSpace from which to sample new random configurations.
@@ -528,6 +555,9 @@ class ChallengerList(object):
                 config.origin = 'Random Search'
             else:
                 config = self.challengers[self._index]
+                if isinstance(config, np.ndarray):
+                    config = Configuration(self.configuration_space, vector=config)
+                    config.origin = 'Random Search (sorted)'
                 self._index += 1
             self._iteration += 1
             return config
@@ -15,6 +15,8 @@ from .bo_optimizer import BaseFacade
 from .models.rf_with_instances import RandomForestWithInstances
 from .models.gp_ensemble import GaussianProcessEnsemble
 os_sep = os.sep
+# The pretrained surrogate models are fixed, so they are loaded at most once per process.
+_surrogate_models_cache = dict()
 
 
 def get_metafeature_vector(metafeature_dict):
@@ -71,9 +73,14 @@ def get_pretrain_surrogate_models(config_space, metric, task_id='hpo'):
     file_id = 'surrogate_models_%s_%s_%s.pk' % (estimator_id, metric, task_id)
     surrogate_models_file = os.path.join(cur_dir, file_id)
 
+    if file_id in _surrogate_models_cache:
+        return _surrogate_models_cache[file_id]
+
     if os.path.exists(surrogate_models_file):
         with open(surrogate_models_file, 'rb') as f:
-            return pk.load(f)
+            surrogate_models = pk.load(f)
+        _surrogate_models_cache[file_id] = surrogate_models
+        return surrogate_models
     else:
         dir_template = '%s' + os_sep + 'runhistory' + os_sep + 'hpo' + os_sep + '%s_%s_%s' + os_sep
         runhistory_dir = dir_template % (cur_dir, task_id, metric, estimator_id)
@@ -98,9 +105,12 @@ def get_pretrain_surrogate_models(config_space, metric, task_id='hpo'):
                 _model.train(X, y)
                 surrogate_models.append(_model)
                 print('%s: training basic surrogate model finished.' % dataset)
-            # TODO: bugs reported, TypeError: can't pickle SwigPyObject objects.
-            # with open(surrogate_models_file, 'wb') as f:
-            #     pk.dump(surrogate_models, f)
+            try:
+                with open(surrogate_models_file, 'wb') as f:
+                    pk.dump(surrogate_models, f)
+            except OSError as e:
+                print('Failed to save the basic surrogate models: %s' % str(e))
+            _surrogate_models_cache[file_id] = surrogate_models
             return surrogate_models
 
 
@@ -115,7 +125,8 @@ class TLBO(BaseFacade):
                  max_runs=200,
                  initial_runs=5,
                  task_id=None,
-                 rng=None):
+                 rng=None,
+                 refit_schedule='always'):
         super().__init__(config_space, task_id)
         self.gp_fusion = gp_fusion
         self.meta_warmstart = meta_warmstart
@@ -144,7 +155,8 @@ class TLBO(BaseFacade):
 
         gp_models = get_pretrain_surrogate_models(self.config_space, metric)
         if gp_models is None:
-            self.model = RandomForestWithInstances(config_space, seed=seed, normalize_y=True)
+            self.model = RandomForestWithInstances(config_space, seed=seed, normalize_y=True,
+                                                   refit_schedule=refit_schedule)
         else:
             self.model = GaussianProcessEnsemble(config_space,
                                                  gp_models,
@@ -281,4 +293,4 @@ class TLBO(BaseFacade):
             num_points=1000,
             random_configuration_chooser=self.random_configuration_chooser
         )
-        return list(challengers)[0]
+        return next(challengers)
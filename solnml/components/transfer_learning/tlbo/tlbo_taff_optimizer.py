@@ -49,7 +49,8 @@ class TLBO_AF(BaseFacade):
                  max_runs=200,
                  initial_runs=5,
                  task_id=None,
-                 rng=None):
+                 rng=None,
+                 refit_schedule='always'):
         super().__init__(config_space, task_id)
         if rng is None:
             _, rng = get_rng()
@@ -77,7 +78,8 @@ class TLBO_AF(BaseFacade):
 
         # Initialize the basic component in BO.
         self.objective_function = objective_function
-        self.model = RandomForestWithInstances(config_space, seed=seed, normalize_y=True)
+        self.model = RandomForestWithInstances(config_space, seed=seed, normalize_y=True,
+                                               refit_schedule=refit_schedule)
         self.weight_model = GaussianProcessEnsemble(config_space, past_runhistory,
                                                     gp_models=self.source_models,
                                                     seed=seed)
@@ -220,4 +222,4 @@ class TLBO_AF(BaseFacade):
             num_points=1000,
             random_configuration_chooser=self.random_configuration_chooser
         )
-        return list(challengers)[0]
+        return next(challengers)
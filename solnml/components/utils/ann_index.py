@@ -0,0 +1,186 @@
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from solnml.components.utils.sparse_utils import is_sparse
+
+# The KNN models search an IVF index instead of the exact neighbors above ANN_MIN_SAMPLES dense samples.
+ANN_MIN_SAMPLES = 100000
+
+
+def use_ann_index(X):
+    return not is_sparse(X) and X.shape[0] > ANN_MIN_SAMPLES
+
+
+class IVFIndex(object):
+    def __init__(self, n_lists=None, n_probes=8, p=2, batch_size=1024, random_state=None):
+        """
+            Inverted file index: the training points are clustered by k-means, and a query only
+            searches the points in its n_probes nearest clusters. Built once in fit, queried in batches.
+        :param n_lists: the number of clusters, sqrt(n_samples) by default.
+        :param n_probes: the number of clusters searched by each query, the recall/speed trade-off.
+        :param p: 1 for the manhattan distance, 2 for the euclidean distance.
+        """
+        self.n_lists = n_lists
+        self.n_probes = n_probes
+        self.p = p
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.centroids = None
+
+    @property
+    def metric(self):
+        return 'cityblock' if self.p == 1 else 'euclidean'
+
+    def fit(self, X):
+        from sklearn.cluster import MiniBatchKMeans
+        X = np.asarray(X)
+        n_samples = X.shape[0]
+        n_lists = self.n_lists if self.n_lists is not None else int(np.sqrt(n_samples))
+        n_lists = max(1, min(n_lists, n_samples))
+
+        # The clusters are learned on a sample, then all the points are assigned.
+        rng = np.random.RandomState(self.random_state)
+        n_train = min(n_samples, 64 * n_lists)
+        sample = X[rng.choice(n_samples, n_train, replace=False)] if n_train < n_samples else X
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, batch_size=max(1024, 4 * n_lists), n_init=1,
+                                 random_state=self.random_state)
+        kmeans.fit(sample)
+        self.centroids = kmeans.cluster_centers_
+        assignment = np.concatenate([self._nearest_lists(X[idx: idx + self.batch_size], 1)[:, 0]
+                                     for idx in range(0, n_samples, self.batch_size)])
+
+        order = np.argsort(assignment, kind='stable')
+        self.X = X[order]
+        self.ids = order
+        self.offsets = np.r_[0, np.cumsum(np.bincount(assignment, minlength=n_lists))]
+        return self
+
+    def _nearest_lists(self, Q, n_probes):
+        distances = cdist(Q, self.centroids, 'sqeuclidean')
+        if n_probes >= distances.shape[1]:
+            return np.argsort(distances, axis=1)
+        return np.argpartition(distances, n_probes - 1, axis=1)[:, :n_probes]
+
+    def _query_batch(self, Q, k):
+        n_queries = Q.shape[0]
+        best_dist = np.full((n_queries, k), np.inf)
+        best_ids = np.full((n_queries, k), -1, dtype=np.int64)
+
+        # Group the (query, list) pairs by list, so that each list is searched once for all its queries.
+        probes = self._nearest_lists(Q, min(self.n_probes, len(self.centroids)))
+        pair_queries = np.repeat(np.arange(n_queries), probes.shape[1])
+        pair_lists = probes.ravel()
+        order = np.argsort(pair_lists, kind='stable')
+        pair_queries, pair_lists = pair_queries[order], pair_lists[order]
+        lists, starts = np.unique(pair_lists, return_index=True)
+        ends = np.r_[starts[1:], len(pair_lists)]
+
+        for list_id, start, end in zip(lists, starts, ends):
+            begin, stop = self.offsets[list_id], self.offsets[list_id + 1]
+            if begin == stop:
+                continue
+            query_idx = pair_queries[start: end]
+            dist = np.hstack([best_dist[query_idx], cdist(Q[query_idx], self.X[begin: stop], self.metric)])
+            list_ids = np.broadcast_to(self.ids[begin: stop], (len(query_idx), stop - begin))
+            ids = np.hstack([best_ids[query_idx], list_ids])
+            if dist.shape[1] > k:
+                top = np.argpartition(dist, k - 1, axis=1)[:, :k]
+                dist = np.take_along_axis(dist, top, axis=1)
+                ids = np.take_along_axis(ids, top, axis=1)
+            best_dist[query_idx], best_ids[query_idx] = dist, ids
+
+        # The probed lists may hold less than k points, search these queries exactly.
+        missing = np.nonzero((best_ids < 0).any(axis=1))[0]
+        if len(missing) > 0:
+            dist = cdist(Q[missing], self.X, self.metric)
+            top = np.argpartition(dist, k - 1, axis=1)[:, :k]
+            best_dist[missing] = np.take_along_axis(dist, top, axis=1)
+            best_ids[missing] = self.ids[top]
+
+        order = np.argsort(best_dist, axis=1, kind='stable')
+        return np.take_along_axis(best_dist, order, axis=1), np.take_along_axis(best_ids, order, axis=1)
+
+    def query(self, Q, k):
+        """
+            The approximate k nearest neighbors of each query.
+        :return: (distances, indices), both of shape (n_queries, k) and sorted by distance.
+        """
+        if self.centroids is None:
+            raise ValueError('The index is not fitted!')
+        Q = np.asarray(Q)
+        if is_sparse(Q):
+            Q = Q.toarray()
+        k = min(k, self.X.shape[0])
+        results = [self._query_batch(Q[idx: idx + self.batch_size], k)
+                   for idx in range(0, Q.shape[0], self.batch_size)]
+        return np.vstack([dist for dist, _ in results]), np.vstack([ids for _, ids in results])
+
+
+def get_neighbor_weights(dist, weights):
+    """
+        The weights of the neighbors as in sklearn: 'uniform', or the inverse distance for 'distance',
+        where the neighbors at distance 0 take all the weight.
+    """
+    if weights == 'uniform':
+        return np.ones_like(dist)
+    with np.errstate(divide='ignore'):
+        inverse = 1. / dist
+    inf_mask = np.isinf(inverse)
+    inf_rows = inf_mask.any(axis=1)
+    inverse[inf_rows] = inf_mask[inf_rows]
+    return inverse
+
+
+class ANNKNeighborsRegressor(object):
+    def __init__(self, n_neighbors=5, weights='uniform', p=2, n_probes=8, random_state=None):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.p = p
+        self.n_probes = n_probes
+        self.random_state = random_state
+        self.index = None
+
+    def fit(self, X, y):
+        self.index = IVFIndex(n_probes=self.n_probes, p=self.p, random_state=self.random_state).fit(X)
+        self._y = np.asarray(y)
+        return self
+
+    def _average(self, X, targets):
+        # The weighted average of the neighbors' targets, computed batch by batch to bound the memory.
+        outputs = list()
+        for idx in range(0, X.shape[0], self.index.batch_size):
+            dist, ids = self.index.query(X[idx: idx + self.index.batch_size], self.n_neighbors)
+            weights = get_neighbor_weights(dist, self.weights)
+            neighbor_targets = targets[ids]
+            weights = weights.reshape(weights.shape + (1,) * (neighbor_targets.ndim - 2))
+            outputs.append((neighbor_targets * weights).sum(axis=1) / weights.sum(axis=1))
+        return np.concatenate(outputs)
+
+    def predict(self, X):
+        return self._average(X, self._y)
+
+
+class ANNKNeighborsClassifier(ANNKNeighborsRegressor):
+    """
+        Multiclass labels, or the binary indicators of multilabel targets.
+    """
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        self.index = IVFIndex(n_probes=self.n_probes, p=self.p, random_state=self.random_state).fit(X)
+        self.multilabel = y.ndim == 2 and y.shape[1] > 1
+        if self.multilabel:
+            self._y = y.astype(np.float64)
+        else:
+            self.classes_, codes = np.unique(y.reshape(-1), return_inverse=True)
+            self._y = np.eye(len(self.classes_))[codes]
+        return self
+
+    def predict_proba(self, X):
+        return self._average(X, self._y)
+
+    def predict(self, X):
+        proba = self.predict_proba(X)
+        if self.multilabel:
+            return (proba > 0.5).astype(int)
+        return self.classes_[np.argmax(proba, axis=1)]
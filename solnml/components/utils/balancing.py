@@ -1,5 +1,6 @@
 import numpy as np
 from collections import Counter
+from solnml.components.utils.data_profile import class_histogram
 
 
 def get_weights(Y, classifier, preprocessor, init_params, fit_params):
@@ -113,13 +114,9 @@ def smote(X, y, random_state=1):
     from imblearn.combine import SMOTETomek
     from imblearn.over_sampling import SMOTE
 
-    labels = list(y)
-    cnts = list()
-    for val in set(labels):
-        cnts.append(labels.count(val))
-    cnts = sorted(cnts)
-    if cnts[0] < 6:
-        sm = SMOTE(random_state=random_state, k_neighbors=cnts[0] - 1)
+    min_cnt = int(class_histogram(y)[1].min())
+    if min_cnt < 6:
+        sm = SMOTE(random_state=random_state, k_neighbors=min_cnt - 1)
         model = SMOTETomek(random_state=random_state, smote=sm)
     else:
         # The default value of k_neighbors in SMOTETomek is 5
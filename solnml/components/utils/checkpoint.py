@@ -0,0 +1,107 @@
+import os
+import time
+import pickle as pkl
+from solnml.components.feature_engineering.transformation_graph import DataNode
+
+_TRAIN_DATA_TAG = 'train_data'
+
+
+class _SearchPickler(pkl.Pickler):
+    """
+        Replace the copies of the training data in the execution tree with references,
+        so that the checkpoint only contains the search state.
+    """
+
+    def __init__(self, file, train_data: DataNode):
+        super().__init__(file, protocol=pkl.HIGHEST_PROTOCOL)
+        self.train_data = train_data
+
+    def is_train_data(self, node: DataNode):
+        if len(node.trans_hist) != 0 or node.data is None or node.data[0] is None:
+            return False
+        X, y = node.data[:2]
+        train_X, train_y = self.train_data.data[:2]
+        if X is train_X and y is train_y:
+            return True
+        # The blocks keep copies of the training data, which are compared by content.
+        if X.shape != train_X.shape or (y is None) != (train_y is None):
+            return False
+        return node.profile.fingerprint == self.train_data.profile.fingerprint
+
+    def persistent_id(self, obj):
+        if isinstance(obj, DataNode) and self.is_train_data(obj):
+            return _TRAIN_DATA_TAG, id(obj)
+        return None
+
+
+class _SearchUnpickler(pkl.Unpickler):
+    def __init__(self, file, train_data: DataNode):
+        super().__init__(file)
+        self.train_data = train_data
+        self.nodes = dict()
+
+    def persistent_load(self, pid):
+        tag, node_id = pid
+        if tag != _TRAIN_DATA_TAG:
+            raise pkl.UnpicklingError('Unsupported persistent id: %s!' % tag)
+        # Nodes shared in the original tree stay shared after loading.
+        if node_id not in self.nodes:
+            self.nodes[node_id] = self.train_data.copy_()
+        return self.nodes[node_id]
+
+
+class SearchCheckpointer(object):
+    def __init__(self, path, interval=60):
+        """
+            Periodically save the execution tree, so that an interrupted search can be resumed.
+        :param path: path of the checkpoint file.
+        :param interval: minimum number of seconds between two checkpoints.
+        """
+        self.path = path
+        self.interval = interval
+        self.last_save_time = time.time()
+        self.n_saved_evals = None
+
+    def save(self, solver, train_data: DataNode, force=False, **kwargs):
+        """
+            Save the solver if new trials finished since the last checkpoint. Each checkpoint is a full snapshot
+            of the search state, which replaces the previous one; the data nodes and the models already on disk
+            are not written again.
+        :param kwargs: other states to restore, e.g., the number of finished iterations.
+        :return: True if the checkpoint is written.
+        """
+        n_evals = len(solver.eval_dict)
+        if n_evals == self.n_saved_evals:
+            return False
+        if not force and time.time() - self.last_save_time < self.interval:
+            return False
+
+        state = dict(kwargs)
+        state['solver'] = solver
+        state['save_time'] = time.time()
+        state['data_fingerprint'] = train_data.profile.fingerprint
+        # Write to a temporary file first, so that an interruption never corrupts the last checkpoint.
+        tmp_path = '%s.%d.tmp' % (self.path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            _SearchPickler(f, train_data).dump(state)
+        os.replace(tmp_path, self.path)
+        self.last_save_time = time.time()
+        self.n_saved_evals = n_evals
+        return True
+
+    @staticmethod
+    def load(path, train_data: DataNode, check_data=True):
+        """
+            Load the checkpoint, the data nodes in the execution tree are rebuilt from train_data.
+        :param check_data: if True, train_data must be the data the checkpoint was saved with, e.g., to resume the
+            search; the checkpoints of similar datasets are loaded with False to read their evaluations only.
+        :return: a dict with the solver and the states saved with it.
+        """
+        if not os.path.exists(path):
+            raise ValueError('Checkpoint does not exist: %s!' % path)
+        with open(path, 'rb') as f:
+            state = _SearchUnpickler(f, train_data).load()
+        if check_data and 'data_fingerprint' in state and \
+                state['data_fingerprint'] != train_data.profile.fingerprint:
+            raise ValueError('The checkpoint was saved on different training data: %s!' % path)
+        return state
@@ -0,0 +1,166 @@
+import hashlib
+import pickle as pkl
+import numpy as np
+from scipy import sparse
+
+from solnml.components.utils.constants import CLS_TASKS
+
+
+def _hash_array(md5, X):
+    if X is None:
+        md5.update(b'none')
+        return
+    if sparse.issparse(X):
+        X = X.tocsr()
+        md5.update(str((X.shape, X.dtype.str)).encode())
+        for array in [X.data, X.indices, X.indptr]:
+            md5.update(memoryview(np.ascontiguousarray(array)).cast('B'))
+        return
+    if hasattr(X, 'values') and not isinstance(X, np.ndarray):
+        # pandas.DataFrame or Series.
+        X = X.values
+    X = np.asarray(X)
+    md5.update(str((X.shape, X.dtype.str)).encode())
+    if X.dtype.kind == 'O':
+        md5.update(pkl.dumps(X.tolist()))
+    else:
+        md5.update(memoryview(np.ascontiguousarray(X)).cast('B'))
+
+
+def array_fingerprint(*arrays):
+    """
+        MD5 of the arrays (dense, sparse or pandas), e.g., the key of the validation labels.
+    """
+    md5 = hashlib.md5()
+    for X in arrays:
+        _hash_array(md5, X)
+    return md5.hexdigest()
+
+
+def class_histogram(y):
+    """
+        The labels and their counts, the labels are sorted.
+    """
+    y = np.asarray(y).reshape(-1)
+    if y.dtype.kind in 'iub' and len(y) > 0 and y.min() >= 0 and y.max() <= 10 * len(y):
+        counts = np.bincount(y.astype(np.int64))
+        labels = np.nonzero(counts)[0]
+        return labels.astype(y.dtype), counts[labels]
+    return np.unique(y, return_counts=True)
+
+
+class DataProfile(object):
+    def __init__(self, X, y, feature_types=None, task_type=None):
+        """
+            Statistics of a dataset, each of them is computed at the first access and then cached.
+            The profile is bound to the arrays it was computed on (and keeps them referenced,
+            so that their ids are not reused), see is_valid_for.
+        """
+        self.feature_types = list(feature_types) if feature_types is not None else None
+        self.task_type = task_type
+        self._X = X
+        self._y = y
+        self._key = self.get_data_key(X, y)
+        self._class_stats = None
+        self._column_stats = None
+        self._fingerprint = None
+
+    @staticmethod
+    def get_data_key(X, y):
+        return id(X), id(y), getattr(X, 'shape', None), getattr(y, 'shape', None)
+
+    def is_valid_for(self, X, y):
+        return self._key == self.get_data_key(X, y)
+
+    def rebind(self, X, y):
+        """
+            The same profile for a copy of the data, the cached statistics are shared.
+        """
+        profile = DataProfile(X, y, feature_types=self.feature_types, task_type=self.task_type)
+        profile._class_stats = self._class_stats
+        profile._column_stats = self._column_stats
+        profile._fingerprint = self._fingerprint
+        return profile
+
+    @property
+    def class_stats(self):
+        if self._class_stats is None:
+            if self._y is None:
+                labels, counts = np.array([]), np.array([], dtype=np.int64)
+            else:
+                labels, counts = class_histogram(self._y)
+            self._class_stats = {'labels': labels, 'counts': counts}
+        return self._class_stats
+
+    @property
+    def class_counts(self):
+        """
+            {label: count} of the training labels.
+        """
+        stats = self.class_stats
+        return dict(zip(stats['labels'].tolist(), stats['counts'].tolist()))
+
+    @property
+    def n_classes(self):
+        return len(self.class_stats['labels'])
+
+    @property
+    def is_imbalanced(self):
+        """
+            Whether the smallest class has at most 1/4 of the samples in the largest class.
+        """
+        counts = self.class_stats['counts']
+        if self.task_type is not None and self.task_type not in CLS_TASKS or len(counts) < 2:
+            return False
+        return counts.min() * 4 <= counts.max()
+
+    @property
+    def column_stats(self):
+        """
+            A list of {'type', 'missing', 'cardinality'} for each column.
+        """
+        if self._column_stats is None:
+            X = self._X
+            n_features = X.shape[1]
+            missing, cardinality = list(), list()
+            if sparse.issparse(X):
+                X = X.tocsc()
+                n_samples = X.shape[0]
+                for idx in range(n_features):
+                    values = X.data[X.indptr[idx]:X.indptr[idx + 1]]
+                    missing.append(int(np.isnan(values).sum()) if values.dtype.kind == 'f' else 0)
+                    n_unique = len(np.unique(values[~np.isnan(values)] if values.dtype.kind == 'f' else values))
+                    # The implicit zeros are a value too.
+                    cardinality.append(n_unique + int(len(values) < n_samples))
+            elif hasattr(X, 'isnull'):
+                # pandas.DataFrame.
+                missing = X.isnull().sum().astype(int).tolist()
+                cardinality = X.nunique(dropna=True).astype(int).tolist()
+            else:
+                X = np.asarray(X)
+                for idx in range(n_features):
+                    column = X[:, idx]
+                    if column.dtype.kind == 'f':
+                        mask = np.isnan(column)
+                    else:
+                        mask = np.array([value is None or value != value for value in column], dtype=bool) \
+                            if column.dtype.kind == 'O' else np.zeros(len(column), dtype=bool)
+                    missing.append(int(mask.sum()))
+                    values = column[~mask]
+                    if values.dtype.kind == 'O':
+                        cardinality.append(len(set(values.tolist())))
+                    else:
+                        cardinality.append(len(np.unique(values)))
+            feature_types = self.feature_types if self.feature_types is not None else [None] * n_features
+            self._column_stats = [{'type': feature_types[idx], 'missing': missing[idx],
+                                   'cardinality': cardinality[idx]} for idx in range(n_features)]
+        return self._column_stats
+
+    @property
+    def fingerprint(self):
+        """
+            MD5 of the features and the labels, used as the key of the caches.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = array_fingerprint(self._X, self._y)
+        return self._fingerprint
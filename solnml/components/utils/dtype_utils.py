@@ -0,0 +1,30 @@
+import numpy as np
+
+SUPPORTED_DTYPES = ['float32', 'float64']
+
+
+def check_dtype(dtype):
+    """
+        Validate the compute dtype of the tabular pipelines.
+    :return: the numpy dtype, or None if the data are kept as they are.
+    """
+    if dtype is None:
+        return None
+    if str(np.dtype(dtype)) not in SUPPORTED_DTYPES:
+        raise ValueError('Invalid dtype: %s!' % str(dtype))
+    return np.dtype(dtype)
+
+
+def is_float32(X):
+    return getattr(X, 'dtype', None) == np.float32
+
+
+def requires_float64(estimator_class):
+    """
+        Whether the transformer declares float64 in get_properties()['preferred_dtype'],
+        i.e., it needs double precision internally.
+    """
+    try:
+        return estimator_class.get_properties().get('preferred_dtype', None) == np.float64
+    except (NotImplementedError, TypeError):
+        return False
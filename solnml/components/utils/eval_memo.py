@@ -0,0 +1,71 @@
+from solnml.components.utils.topk_saver import CombinedTopKModelSaver
+
+
+class EvaluationMemo(object):
+    def __init__(self, enabled=True):
+        """
+            Run-wide record of the evaluated configurations, shared by all the evaluators,
+            so that the same full configuration (FE + HPO) is never evaluated twice.
+        :param enabled: if False, every lookup misses and nothing is recorded.
+        """
+        self.enabled = enabled
+        self.records = dict()
+        self.n_queries = 0
+        self.n_hits = 0
+
+    @staticmethod
+    def get_key(config, fixed_config=None, **context):
+        """
+            Key of an evaluation: the canonical id of the full configuration, and the settings
+            that change its result or its saved model, e.g., the fingerprint of the data, the output
+            directory and timestamp of the run, the resampling strategy and the ratio of data used.
+        """
+        if not isinstance(config, dict):
+            config = config.get_dictionary()
+        _config = config.copy()
+        if fixed_config is not None:
+            if not isinstance(fixed_config, dict):
+                fixed_config = fixed_config.get_dictionary()
+            _config.update(fixed_config)
+        return (CombinedTopKModelSaver.get_configuration_id(_config),) + tuple(sorted(context.items()))
+
+    def lookup(self, key):
+        """
+            Return the recorded result of the evaluation, or None if not evaluated before.
+        """
+        if not self.enabled:
+            return None
+        self.n_queries += 1
+        if key in self.records:
+            self.n_hits += 1
+            return self.records[key]
+        return None
+
+    def add(self, key, result):
+        if self.enabled:
+            self.records[key] = result
+
+    @property
+    def hit_rate(self):
+        return self.n_hits / self.n_queries if self.n_queries > 0 else 0.
+
+    def get_stats(self):
+        return {'queries': self.n_queries, 'hits': self.n_hits, 'hit_rate': self.hit_rate}
+
+
+# Disabled outside of AutoML.fit, which enables it for the duration of the search.
+_evaluation_memo = EvaluationMemo(enabled=False)
+
+
+def get_evaluation_memo():
+    return _evaluation_memo
+
+
+def set_evaluation_memo(enabled=True):
+    """
+        Reset the process-wide evaluation memo, e.g., enabled at the beginning of each run
+        and disabled at its end.
+    """
+    global _evaluation_memo
+    _evaluation_memo = EvaluationMemo(enabled=enabled)
+    return _evaluation_memo
@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import time
+import uuid
+import psutil
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+_sinks = list()
+
+
+def get_rss():
+    """
+        Current resident set size of the current process in bytes.
+    """
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+def get_max_rss():
+    """
+        High-water mark of the resident set size over the lifetime of the current process in bytes,
+        it never decreases, so it is not the peak of a single stage.
+    """
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux.
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+    return get_rss()
+
+
+def get_array_info(array):
+    if array is None or not hasattr(array, 'shape'):
+        return None
+    if hasattr(array, 'nbytes'):
+        nbytes = array.nbytes
+    elif hasattr(array, 'data') and hasattr(array.data, 'nbytes'):
+        # Sparse matrices.
+        nbytes = array.data.nbytes
+    else:
+        nbytes = None
+    return {'shape': list(array.shape), 'nbytes': nbytes}
+
+
+class BaseSink(object):
+    def emit(self, event: dict):
+        raise NotImplementedError()
+
+
+class MemorySink(BaseSink):
+    """
+        Keep the events in memory. Events from forked worker processes are not collected.
+    """
+    def __init__(self):
+        self.events = list()
+
+    def emit(self, event: dict):
+        self.events.append(event)
+
+    def aggregate(self, key='algorithm'):
+        return aggregate_events(self.events, key=key)
+
+
+class JsonlSink(BaseSink):
+    """
+        Append the events to a JSON-lines file, one event per line.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, event: dict):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(event, default=str) + '\n')
+
+    def load(self):
+        return load_events(self.path)
+
+
+def add_sink(sink: BaseSink):
+    _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink: BaseSink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def clear_sinks():
+    del _sinks[:]
+
+
+def load_events(path):
+    events = list()
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                events.append(json.loads(line))
+    return events
+
+
+def aggregate_events(events, key='algorithm'):
+    """
+        Sum the stage costs grouped by key.
+    :param events: a list of events emitted by TrialRecorder.
+    :param key: 'algorithm' to group by the evaluated algorithm, or 'operator' to group
+        the feature engineering stages by their operator.
+    :return: {key_value: {stage: {'count', 'wall_time', 'cpu_time', 'rss_delta', 'max_rss_increase', 'max_rss'}}},
+        the RSS fields are the maximum over the events.
+    """
+    if key not in ['algorithm', 'operator']:
+        raise ValueError('Invalid aggregation key: %s!' % key)
+    stats = OrderedDict()
+    for event in events:
+        if event.get('event') != 'stage' or event.get(key) is None:
+            continue
+        stage_stats = stats.setdefault(event[key], OrderedDict())
+        item = stage_stats.setdefault(event['stage'], {'count': 0, 'wall_time': 0., 'cpu_time': 0.,
+                                                       'rss_delta': None, 'max_rss_increase': 0, 'max_rss': 0})
+        item['count'] += 1
+        item['wall_time'] += event['wall_time']
+        item['cpu_time'] += event['cpu_time']
+        item['rss_delta'] = event['rss_delta'] if item['rss_delta'] is None \
+            else max(item['rss_delta'], event['rss_delta'])
+        item['max_rss_increase'] = max(item['max_rss_increase'], event['max_rss_increase'])
+        item['max_rss'] = max(item['max_rss'], event['max_rss'])
+    return stats
+
+
+class NullRecorder(object):
+    """
+        Recorder used when no sink is registered, so that instrumentation costs nothing.
+    """
+    @contextmanager
+    def stage(self, stage, operator=None):
+        yield dict()
+
+    def finish(self, **kwargs):
+        pass
+
+
+class TrialRecorder(NullRecorder):
+    def __init__(self, sinks, **trial_info):
+        """
+            Record the cost of each stage in a trial and emit them to the sinks.
+        :param sinks: list of BaseSink.
+        :param trial_info: fields attached to every event, e.g., algorithm and evaluator.
+        """
+        self.sinks = sinks
+        self.trial_info = trial_info
+        self.trial_id = uuid.uuid4().hex
+        self.start_time = time.time()
+        self.start_cpu_time = time.process_time()
+        self.stage_costs = OrderedDict()
+
+    def emit(self, event: dict):
+        event['trial_id'] = self.trial_id
+        event['pid'] = os.getpid()
+        event['timestamp'] = time.time()
+        event.update(self.trial_info)
+        for sink in self.sinks:
+            sink.emit(event)
+
+    @contextmanager
+    def stage(self, stage, operator=None):
+        """
+            Time the enclosed block. The caller may put the array produced in this stage
+            under 'data' in the yielded dict to record its size.
+            The memory of the stage is recorded as rss_delta, the change of the current RSS,
+            and max_rss_increase, how much the stage raised the high-water mark of the process;
+            max_rss is the high-water mark itself.
+        """
+        info = dict()
+        _start_time, _start_cpu_time = time.time(), time.process_time()
+        _start_rss, _start_max_rss = get_rss(), get_max_rss()
+        try:
+            yield info
+        finally:
+            wall_time = time.time() - _start_time
+            cpu_time = time.process_time() - _start_cpu_time
+            max_rss = get_max_rss()
+            cost = self.stage_costs.setdefault(stage, [0., 0.])
+            cost[0] += wall_time
+            cost[1] += cpu_time
+            self.emit({'event': 'stage',
+                       'stage': stage,
+                       'operator': operator,
+                       'wall_time': wall_time,
+                       'cpu_time': cpu_time,
+                       'rss_delta': get_rss() - _start_rss,
+                       'max_rss_increase': max_rss - _start_max_rss,
+                       'max_rss': max_rss,
+                       'array': get_array_info(info.get('data', None))})
+
+    def finish(self, **kwargs):
+        event = {'event': 'trial',
+                 'wall_time': time.time() - self.start_time,
+                 'cpu_time': time.process_time() - self.start_cpu_time,
+                 'max_rss': get_max_rss(),
+                 'stages': {stage: {'wall_time': cost[0], 'cpu_time': cost[1]}
+                            for stage, cost in self.stage_costs.items()}}
+        event.update(kwargs)
+        self.emit(event)
+
+
+def create_recorder(**trial_info):
+    if len(_sinks) == 0:
+        return NullRecorder()
+    return TrialRecorder(list(_sinks), **trial_info)
@@ -37,4 +37,61 @@ def convert_multioutput_multiclass_to_multilabel(probas):
             else:
                 multioutput_probas[:, i] = 0
         probas = multioutput_probas
-    return probas
\ No newline at end of file
+    return probas
+
+# The kernel SVMs are fitted exactly below EXACT_KERNEL_MAX_SAMPLES samples, and approximately
+# above APPROX_KERNEL_MIN_SAMPLES samples, in between it depends on the time limit.
+EXACT_KERNEL_MAX_SAMPLES = 10000
+APPROX_KERNEL_MIN_SAMPLES = 50000
+# The number of landmarks in the Nystroem approximation, and the iterations of its linear solver.
+NYSTROEM_COMPONENTS = 500
+NYSTROEM_MAX_ITER = 1000
+# The models that choose between the exact kernel SVM and the approximation.
+KERNEL_APPROX_ESTIMATORS = ['libsvm_svc', 'libsvm_svr']
+
+
+def estimate_kernel_fit_time(n_samples, n_features):
+    """
+        Rough fit time (in seconds) of libsvm, which grows quadratically with the number of samples.
+    """
+    return 2e-9 * n_samples ** 2 * max(n_features, 1)
+
+
+def use_kernel_approximation(n_samples, n_features, approximation='auto', time_limit=None):
+    """
+        Whether to replace the exact kernel SVM with the Nystroem approximation and a linear solver.
+    :param approximation: 'auto', 'exact' or 'nystroem'.
+    :param time_limit: the remaining time (in seconds) of the trial, if known.
+    """
+    if approximation not in ['auto', 'exact', 'nystroem']:
+        raise ValueError('Invalid kernel approximation: %s!' % approximation)
+    if approximation != 'auto':
+        return approximation == 'nystroem'
+    if n_samples <= EXACT_KERNEL_MAX_SAMPLES:
+        return False
+    if n_samples > APPROX_KERNEL_MIN_SAMPLES:
+        return True
+    return time_limit is not None and estimate_kernel_fit_time(n_samples, n_features) > 0.5 * time_limit
+
+
+def set_kernel_approximation(config, estimator_id, data_shape, time_limit=None):
+    """
+        Decide once whether the kernel SVM of a configuration is approximated, from the shape of the
+        full training data, so that the evaluation, the refit and the ensemble fit the same model.
+    :param config: the configuration passed to get_estimator, updated in place.
+    :param time_limit: the time limit (in seconds) of a trial, e.g., per_run_time_limit.
+    """
+    if estimator_id in KERNEL_APPROX_ESTIMATORS:
+        key = '%s:approximation' % estimator_id
+        if config.get(key, 'auto') == 'auto':
+            n_samples, n_features = data_shape[0], data_shape[1]
+            config[key] = 'nystroem' if use_kernel_approximation(n_samples, n_features, 'auto', time_limit) \
+                else 'exact'
+    return config
+
+
+def get_nystroem(kernel, gamma, degree, coef0, n_samples, random_state=None):
+    from sklearn.kernel_approximation import Nystroem
+    # gamma=0 stands for the default 1 / n_features in libsvm.
+    return Nystroem(kernel=kernel, gamma=gamma if gamma else None, degree=degree, coef0=coef0,
+                    n_components=min(NYSTROEM_COMPONENTS, n_samples), random_state=random_state)
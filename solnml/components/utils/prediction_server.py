@@ -0,0 +1,310 @@
+import os
+import json
+import time
+import queue
+import threading
+import socketserver
+import collections
+import numpy as np
+
+from solnml.components.utils.constants import CLS_TASKS
+from solnml.components.utils import sparse_utils
+from solnml.utils.logging_utils import get_logger
+
+METHODS = ['predict', 'predict_proba']
+
+
+def concat_rows(blocks):
+    """
+        Stack the requests converted by ServingModel.to_array: the DataFrames of the raw data keep
+        the dtype of each column, the arrays are stacked as they are.
+    """
+    import pandas as pd
+    if isinstance(blocks[0], pd.DataFrame):
+        return pd.concat(blocks, ignore_index=True)
+    return sparse_utils.vstack(blocks)
+
+
+class _Request(object):
+    def __init__(self, X, method):
+        self.X = X
+        self.method = method
+        self.result = None
+        self.error = None
+        self.start_time = time.time()
+        self.done = threading.Event()
+
+
+class MicroBatcher(object):
+    def __init__(self, model, max_batch_size=256, max_delay=0.005, n_latencies=10000):
+        """
+            Coalesce the concurrent requests into micro-batches: a batch is run once it has
+            max_batch_size rows, or max_delay seconds after its first request arrived.
+        :param model: a ServingModel.
+        :param n_latencies: the number of recent request latencies kept for the percentiles.
+        """
+        if max_batch_size < 1:
+            raise ValueError('Invalid max_batch_size: %s!' % str(max_batch_size))
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.requests = queue.Queue()
+        self.logger = get_logger(self.__module__ + "." + self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=n_latencies)
+        self._start_time = time.time()
+        self.n_requests, self.n_batches, self.n_rows, self.n_errors = 0, 0, 0, 0
+
+        self._running = True
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, X, method='predict'):
+        """
+            Block until the prediction of the request is returned.
+        """
+        if method not in METHODS:
+            raise ValueError('Invalid method: %s!' % method)
+        if method == 'predict_proba' and self.model.task_type not in CLS_TASKS:
+            raise AttributeError("predict_proba is not supported in regression")
+        request = _Request(self.model.to_array(X), method)
+        # Check and enqueue under the lock, so that close() can not stop the worker in between.
+        with self._lock:
+            if not self._running:
+                raise RuntimeError('The micro-batcher is closed!')
+            self.requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _next_batch(self):
+        request = self.requests.get()
+        if request is None:
+            return None
+        batch, n_rows = [request], request.X.shape[0]
+        deadline = time.time() + self.max_delay
+        while n_rows < self.max_batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                # Finish the current batch before stopping.
+                self.requests.put(None)
+                break
+            batch.append(request)
+            n_rows += request.X.shape[0]
+        return batch
+
+    def _predict(self, X):
+        if self.model.task_type in CLS_TASKS:
+            return self.model.predict_proba(X)
+        return self.model.predict(X)
+
+    def _finish(self, request, pred):
+        if request.method == 'predict' and self.model.task_type in CLS_TASKS:
+            pred = np.argmax(pred, axis=-1)
+        request.result = pred
+        request.done.set()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            try:
+                if len(batch) == 1:
+                    X = batch[0].X
+                else:
+                    X = concat_rows([request.X for request in batch])
+                pred = self._predict(X)
+                offset = 0
+                for request in batch:
+                    n_rows = request.X.shape[0]
+                    self._finish(request, pred[offset: offset + n_rows])
+                    offset += n_rows
+            except Exception as e:
+                # Predict the requests one by one, so that a bad request does not fail the others.
+                self.logger.debug('Failed to predict the batch: %s' % str(e))
+                for request in batch:
+                    try:
+                        self._finish(request, self._predict(request.X))
+                    except Exception as e:
+                        request.error = e
+                        request.done.set()
+            self._record(batch)
+
+    def _record(self, batch):
+        end_time = time.time()
+        with self._lock:
+            self.n_batches += 1
+            for request in batch:
+                self.n_requests += 1
+                self.n_rows += request.X.shape[0]
+                self.n_errors += int(request.error is not None)
+                self._latencies.append(end_time - request.start_time)
+
+    def get_stats(self):
+        """
+            The throughput and latency counters since the start.
+        """
+        with self._lock:
+            latencies = np.array(self._latencies)
+            elapsed_time = time.time() - self._start_time
+            stats = {'n_requests': self.n_requests,
+                     'n_batches': self.n_batches,
+                     'n_rows': self.n_rows,
+                     'n_errors': self.n_errors,
+                     'mean_batch_size': self.n_rows / max(self.n_batches, 1),
+                     'requests_per_second': self.n_requests / max(elapsed_time, 1e-12),
+                     'rows_per_second': self.n_rows / max(elapsed_time, 1e-12)}
+        for percentile in [50, 90, 99]:
+            stats['latency_p%d' % percentile] = float(np.percentile(latencies, percentile)) \
+                if len(latencies) > 0 else None
+        return stats
+
+    def close(self):
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            # The requests submitted before are predicted before the worker stops.
+            self.requests.put(None)
+        self._worker.join()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+        One JSON object per line, {"method": "predict" | "predict_proba" | "stats", "X": rows}.
+        The response is {"result": ...} or {"error": message}.
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line.decode('utf-8'))
+                method = message.get('method', 'predict')
+                if method == 'stats':
+                    result = self.server.batcher.get_stats()
+                else:
+                    result = self.server.batcher.submit(message['X'], method=method).tolist()
+                response = {'result': result}
+            except Exception as e:
+                response = {'error': '%s: %s' % (e.__class__.__name__, str(e))}
+            self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class PredictionServer(object):
+    def __init__(self, model, address=('127.0.0.1', 0), max_batch_size=256, max_delay=0.005):
+        """
+            Local prediction server that keeps the model in memory and micro-batches the concurrent requests.
+        :param model: a ServingModel.
+        :param address: (host, port) for TCP, port 0 picks a free port, or a path for a Unix socket.
+        """
+        self.model = model
+        self.batcher = MicroBatcher(model, max_batch_size=max_batch_size, max_delay=max_delay)
+        if isinstance(address, str):
+            if _UnixServer is None:
+                raise ValueError('Unix sockets are not supported on this platform: %s!' % address)
+            if os.path.exists(address):
+                os.remove(address)
+            self.server = _UnixServer(address, _RequestHandler)
+        else:
+            self.server = _TCPServer(tuple(address), _RequestHandler)
+        self.server.batcher = self.batcher
+        self._thread = None
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def get_stats(self):
+        return self.batcher.get_stats()
+
+    def shutdown(self):
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+        self.batcher.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
+class PredictionClient(object):
+    def __init__(self, address, timeout=None):
+        """
+            Client of a PredictionServer, a connection is kept open for all the requests.
+        """
+        import socket
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(address)
+        self.rfile = self.sock.makefile('rb')
+
+    def _call(self, message):
+        self.sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+        response = json.loads(self.rfile.readline().decode('utf-8'))
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response['result']
+
+    @staticmethod
+    def _to_list(X):
+        if isinstance(X, np.ndarray):
+            return X.tolist()
+        return X
+
+    def predict(self, X):
+        return np.array(self._call({'method': 'predict', 'X': self._to_list(X)}))
+
+    def predict_proba(self, X):
+        return np.array(self._call({'method': 'predict_proba', 'X': self._to_list(X)}))
+
+    def get_stats(self):
+        return self._call({'method': 'stats'})
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,163 @@
+import pickle as pkl
+import numpy as np
+
+from solnml.components.utils.constants import CLS_TASKS
+from solnml.components.utils.sparse_utils import is_sparse
+
+
+class ServingModel(object):
+    def __init__(self, task_type, members, feature_types, feature_names=None, dtype=None,
+                 preprocessor=None, raw_feature_types=None, raw_feature_names=None):
+        """
+            A fitted model for inference only: the weighted ensemble members with their FE pipelines,
+            and optionally the preprocessing (DataManager or FEPipeline) of the raw data.
+            The members sharing the same FE pipeline transform each request only once.
+        :param members: a list of (weight, op_list, estimator), the members with zero weight are dropped.
+        :param feature_types: the feature types of the data passed to the FE pipelines.
+        :param dtype: the compute dtype of the features, None keeps the dtype of the input data.
+        :param raw_feature_types: the feature types of the raw data, required if preprocessor is given.
+        """
+        self.task_type = task_type
+        self.feature_types = list(feature_types)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.dtype = dtype
+        self.preprocessor = preprocessor
+        self.raw_feature_types = list(raw_feature_types) if raw_feature_types is not None else None
+        self.raw_feature_names = list(raw_feature_names) if raw_feature_names is not None else None
+        if preprocessor is not None and self.raw_feature_types is None:
+            raise ValueError('The raw feature types are required by the preprocessor!')
+
+        # Each distinct FE pipeline is a list of (stage, transformer), see get_pipeline_steps.
+        self.pipelines = list()
+        self.members = list()
+        pipeline_keys = list()
+        for weight, op_list, estimator in members:
+            if weight <= 0:
+                continue
+            key = pkl.dumps(op_list)
+            if key not in pipeline_keys:
+                pipeline_keys.append(key)
+                self.pipelines.append(self.get_pipeline_steps(op_list))
+            self.members.append((float(weight), pipeline_keys.index(key), estimator))
+        if len(self.members) == 0:
+            raise ValueError('No model with positive weight to serve!')
+        self.weights = np.array([weight for weight, _, _ in self.members])
+
+    @staticmethod
+    def get_pipeline_steps(op_list):
+        """
+            The transformers in the order applied by construct_node, the balancers are skipped
+            as they do not change the features at test time.
+        """
+        return [(stage, tran) for stage, tran in op_list.items() if stage != 'balancer']
+
+    def to_array(self, X):
+        """
+            Convert the request to the raw data if the preprocessor is given, a DataFrame that keeps
+            the dtype of each column, or to a 2D array of the data passed to the FE pipelines otherwise.
+        """
+        import pandas as pd
+        names = self.raw_feature_names if self.preprocessor is not None else self.feature_names
+        if isinstance(X, dict):
+            X = [X]
+        if isinstance(X, (list, tuple)) and len(X) > 0 and isinstance(X[0], dict):
+            if names is None:
+                raise ValueError('The feature names are required to predict on dicts!')
+            X = [[row[name] for name in names] for row in X]
+        if is_sparse(X):
+            return X
+        if self.preprocessor is not None:
+            if isinstance(X, pd.DataFrame):
+                return X[names] if names is not None else X
+            if isinstance(X, np.ndarray):
+                X = X.reshape((1, -1)) if X.ndim == 1 else X
+            elif len(X) > 0 and np.ndim(X[0]) == 0:
+                # A single row.
+                X = [list(X)]
+            else:
+                X = list(X)
+            # Build the frame from the rows, np.asarray would cast a mix of numbers and strings to strings.
+            return pd.DataFrame(X, columns=names)
+        X = np.asarray(X)
+        if X.ndim == 1:
+            # A single row.
+            X = X.reshape((1, -1))
+        return X
+
+    def _preprocess(self, X):
+        from solnml.components.feature_engineering.transformation_graph import DataNode
+        df = self.to_array(X)
+        node = DataNode([df, None], self.raw_feature_types.copy(), self.task_type,
+                        feature_names=self.raw_feature_names)
+        if hasattr(self.preprocessor, 'preprocess_transform'):
+            # DataManager.
+            node = self.preprocessor.preprocess_transform(node)
+        else:
+            # FEPipeline.
+            node = self.preprocessor.transform(node)
+        return node.data[0]
+
+    def transform(self, X):
+        """
+            Run each distinct FE pipeline once.
+        :param X: a single row, a 2D array, a dict or a list of dicts (keyed by feature name).
+        :return: the features of each pipeline.
+        """
+        from solnml.components.feature_engineering.transformation_graph import DataNode
+        from solnml.components.feature_engineering.parse import operate_node
+        if self.preprocessor is not None:
+            X = self._preprocess(X)
+        else:
+            X = self.to_array(X)
+        if self.dtype is not None and X.dtype != self.dtype:
+            X = X.astype(self.dtype)
+
+        # The input is not copied, the transformers return new nodes.
+        node = DataNode([X, None], self.feature_types.copy(), self.task_type)
+        outputs = list()
+        for steps in self.pipelines:
+            _node = node
+            for stage, tran in steps:
+                if stage == 'densifier':
+                    _node = tran.operate(_node)
+                else:
+                    _node = operate_node(tran, _node)
+            outputs.append(_node.data[0])
+        return outputs
+
+    def _predict(self, X):
+        features = self.transform(X)
+        predictions = list()
+        for _, pipeline_idx, estimator in self.members:
+            if self.task_type in CLS_TASKS:
+                predictions.append(estimator.predict_proba(features[pipeline_idx]))
+            else:
+                predictions.append(estimator.predict(features[pipeline_idx]))
+        if len(predictions) == 1:
+            return predictions[0]
+        return np.average(np.asarray(predictions), axis=0, weights=self.weights)
+
+    def predict(self, X):
+        if self.task_type in CLS_TASKS:
+            return np.argmax(self._predict(X), axis=-1)
+        return self._predict(X)
+
+    def predict_proba(self, X):
+        if self.task_type not in CLS_TASKS:
+            raise AttributeError("predict_proba is not supported in regression")
+        return self._predict(X)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pkl.dump(self, f)
+
+
+def load_model(path):
+    """
+        Load a model saved by Classifier.export or Regressor.export.
+    """
+    with open(path, 'rb') as f:
+        model = pkl.load(f)
+    if not isinstance(model, ServingModel):
+        raise ValueError('Not a serving model: %s!' % path)
+    return model
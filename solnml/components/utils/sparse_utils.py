@@ -0,0 +1,72 @@
+import numpy as np
+from scipy import sparse
+
+
+def is_sparse(X):
+    return sparse.issparse(X)
+
+
+def to_dense(X):
+    if sparse.issparse(X):
+        return X.toarray()
+    return X
+
+
+def _float_dtype(X):
+    # Keep float32 data in float32, the other data are cast to float64.
+    return X.dtype if X.dtype.kind == 'f' else np.float64
+
+
+def _as_sparse(X):
+    if sparse.issparse(X):
+        return X
+    X = np.asarray(X)
+    return sparse.csr_matrix(X.astype(_float_dtype(X), copy=False))
+
+
+def hstack(blocks):
+    """
+        Stack the arrays column-wise, the result is a CSR matrix if any of them is sparse.
+    """
+    if any(sparse.issparse(block) for block in blocks):
+        return sparse.hstack([_as_sparse(block) for block in blocks], format='csr')
+    return np.hstack(blocks)
+
+
+def vstack(blocks):
+    if any(sparse.issparse(block) for block in blocks):
+        return sparse.vstack([_as_sparse(block) for block in blocks], format='csr')
+    return np.vstack(blocks)
+
+
+def delete_columns(X, fields):
+    if sparse.issparse(X):
+        fields = set(fields)
+        return X.tocsc()[:, [idx for idx in range(X.shape[1]) if idx not in fields]].tocsr()
+    return np.delete(X, fields, axis=1)
+
+
+def replace_columns(X, fields, X_new):
+    """
+        Return a copy of X whose columns in fields are replaced by the columns of X_new.
+    """
+    if sparse.issparse(X) or sparse.issparse(X_new):
+        n_features = X.shape[1]
+        columns = list(range(n_features))
+        for idx, field in enumerate(fields):
+            columns[field] = n_features + idx
+        return hstack([X, X_new]).tocsc()[:, columns].tocsr()
+    new_X = X.astype(_float_dtype(X))
+    new_X[:, fields] = X_new
+    return new_X
+
+
+def accepts_sparse(estimator_class):
+    """
+        Whether the transformer or model declares sparse input in get_properties()['input'].
+    """
+    from solnml.components.utils.constants import SPARSE
+    try:
+        return SPARSE in estimator_class.get_properties()['input']
+    except (NotImplementedError, KeyError, TypeError):
+        return False
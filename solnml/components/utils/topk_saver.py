@@ -1,6 +1,8 @@
 import os
+import fcntl
 import pickle as pkl
 import hashlib
+import numpy as np
 
 
 def load_combined_transformer_estimator(model_dir, config, timestamp):
@@ -10,6 +12,43 @@ def load_combined_transformer_estimator(model_dir, config, timestamp):
     return op_list, model
 
 
+def get_prediction_path(model_path):
+    return '%s_valid_pred.npz' % os.path.splitext(model_path)[0]
+
+
+def save_validation_predictions(model_path, y_pred, y_true):
+    """
+        Store the validation predictions of a saved model, so that the ensemble stage
+        does not need to rebuild the features and run inference again.
+    :param model_path: path of the pickled [op_list, estimator, score].
+    :param y_pred: probabilities for classification, predicted values for regression.
+    :param y_true: the corresponding validation labels.
+    """
+    np.savez_compressed(get_prediction_path(model_path),
+                        pred=np.asarray(y_pred, dtype=np.float32),
+                        labels=np.asarray(y_true))
+
+
+def load_validation_predictions(model_path):
+    """
+        Return (y_pred, y_true) stored by save_validation_predictions, or None if not recorded.
+    """
+    pred_path = get_prediction_path(model_path)
+    if not os.path.exists(pred_path):
+        return None
+    with np.load(pred_path, allow_pickle=False) as content:
+        return content['pred'], content['labels']
+
+
+def remove_model(model_path):
+    # The model of a configuration evaluated before may have been removed already.
+    if os.path.exists(model_path):
+        os.remove(model_path)
+    pred_path = get_prediction_path(model_path)
+    if os.path.exists(pred_path):
+        os.remove(pred_path)
+
+
 class BaseTopKModelSaver(object):
     def __init__(self, k, model_dir, identifier):
         self.k = k
@@ -17,6 +56,7 @@ class BaseTopKModelSaver(object):
         self.identifier = identifier
         self.sorted_list_path = os.path.join(model_dir, '%s_topk_config.pkl' % identifier)
         self.sorted_dict = None
+        self.updated_ids = set()
 
     @staticmethod
     def get_topk_config(config_path):
@@ -27,8 +67,22 @@ class BaseTopKModelSaver(object):
         return content
 
     def save_topk_config(self):
-        with open(self.sorted_list_path, 'wb') as f:
-            pkl.dump(self.sorted_dict, f)
+        # Other optimizers (e.g., arms pulled in parallel) may share this file,
+        # so only overwrite the entries updated by this saver and replace the file atomically.
+        # The lock keeps two savers from merging into the same old file and dropping each other's entries.
+        with open('%s.lock' % self.sorted_list_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                sorted_dict = self.get_topk_config(self.sorted_list_path)
+                for estimator_id in self.updated_ids:
+                    sorted_dict[estimator_id] = self.sorted_dict[estimator_id]
+                self.sorted_dict = sorted_dict
+                tmp_path = '%s.%d.tmp' % (self.sorted_list_path, os.getpid())
+                with open(tmp_path, 'wb') as f:
+                    pkl.dump(self.sorted_dict, f)
+                os.replace(tmp_path, self.sorted_list_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 
 class CombinedTopKModelSaver(BaseTopKModelSaver):
@@ -64,6 +118,7 @@ class CombinedTopKModelSaver(BaseTopKModelSaver):
         save_flag, delete_flag = False, False
         self.sorted_dict = self.get_topk_config(self.sorted_list_path)
         sorted_list = self.sorted_dict.get(estimator_id, list())
+        self.updated_ids.add(estimator_id)
 
         # Update existed configs
         for sorted_element in sorted_list:
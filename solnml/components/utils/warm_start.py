@@ -0,0 +1,86 @@
+import numpy as np
+from ConfigSpace import Configuration, ConfigurationSpace
+from solnml.components.utils.constants import SUCCESS
+from solnml.components.utils.checkpoint import SearchCheckpointer
+
+
+def _to_dict(config):
+    if config is None:
+        return dict()
+    if not isinstance(config, dict):
+        return config.get_dictionary().copy()
+    return config.copy()
+
+
+def load_prior_records(paths, train_data=None):
+    """
+        Collect the evaluated configurations of previous runs.
+    :param paths: path or list of paths, each is a topk config file (<timestamp>_topk_config.pkl)
+        or a checkpoint saved by AutoML.fit.
+    :param train_data: the data node used to load the checkpoints.
+    :return: a list of (config dict, perf) sorted by perf, the larger the better.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    records = dict()
+    for path in paths:
+        # The previous runs may be on a similar dataset.
+        content = SearchCheckpointer.load(path, train_data, check_data=False)
+        items = list()
+        if isinstance(content, dict) and 'solver' in content:
+            # The eval_dict of the execution tree: {(fe_config, hpo_config): [perf, time, state]}.
+            for (fe_config, hpo_config), (perf, _, state) in content['solver'].eval_dict.items():
+                if state == SUCCESS:
+                    config = _to_dict(fe_config)
+                    config.update(_to_dict(hpo_config))
+                    items.append((config, perf))
+        else:
+            # The topk configs: {algorithm: [(config, perf, model_path)]}.
+            for algo_id in content:
+                for config, perf, _ in content[algo_id]:
+                    items.append((_to_dict(config), perf))
+
+        for config, perf in items:
+            if 'algorithm' not in config or not np.isfinite(perf):
+                continue
+            key = tuple(sorted((k, str(v)) for k, v in config.items()))
+            if key not in records or records[key][1] < perf:
+                records[key] = (config, perf)
+    return sorted(records.values(), key=lambda x: -x[1])
+
+
+def rank_algorithms(records):
+    """
+        Rank the algorithms by their best performance in the records.
+    """
+    ranked_algorithms = list()
+    for config, _ in records:
+        if config['algorithm'] not in ranked_algorithms:
+            ranked_algorithms.append(config['algorithm'])
+    return ranked_algorithms
+
+
+def select_warm_start_records(records, n_configs_per_algorithm=10):
+    """
+        Select the records of the best configurations of each algorithm, in the order of their performance.
+    """
+    counts, selected_records = dict(), list()
+    for config, perf in records:
+        algo_id = config['algorithm']
+        if counts.get(algo_id, 0) < n_configs_per_algorithm:
+            selected_records.append((config, perf))
+            counts[algo_id] = counts.get(algo_id, 0) + 1
+    return selected_records
+
+
+def project_config(config: dict, config_space: ConfigurationSpace):
+    """
+        Restrict the configuration to the hyperparameters in config_space.
+    :return: the Configuration, or None if it is invalid in config_space.
+    """
+    names = config_space.get_hyperparameter_names()
+    values = {key: value for key, value in config.items() if key in names}
+    try:
+        return Configuration(config_space, values=values)
+    except ValueError:
+        return None
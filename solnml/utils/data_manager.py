@@ -3,6 +3,7 @@ import pandas as pd
 
 from solnml.components.utils.constants import *
 from solnml.components.utils.utils import is_discrete, detect_abnormal_type, detect_categorical_type
+from solnml.components.utils.dtype_utils import check_dtype
 from solnml.components.feature_engineering.transformation_graph import DataNode
 from solnml.components.feature_engineering.transformations.preprocessor.imputer import ImputationTransformation
 from solnml.components.feature_engineering.transformations.preprocessor.onehot_encoder import \
@@ -21,8 +22,13 @@ class DataManager(object):
     """
 
     # X,y should be None if using DataManager().load_csv(...)
-    def __init__(self, X=None, y=None, na_values=default_missing_values, feature_types=None, feature_names=None):
+    def __init__(self, X=None, y=None, na_values=default_missing_values, feature_types=None, feature_names=None,
+                 dtype=None):
+        """
+        :param dtype: if 'float32', the preprocessed features are stored in float32 to halve the memory.
+        """
         self.na_values = na_values
+        self.dtype = check_dtype(dtype)
         self.feature_types = feature_types
         self.feature_names = feature_names
         self.missing_flags = None
@@ -155,7 +161,7 @@ class DataManager(object):
 
     def preprocess(self, input_node, task_type=CLASSIFICATION, train_phase=True):
         try:
-            input_node = self.remove_uninf_cols(input_node, train_phase=True)
+            input_node = self.remove_uninf_cols(input_node, train_phase=train_phase)
             input_node = self.impute_cols(input_node)
             input_node = self.one_hot(input_node)
         except AttributeError as e:
@@ -165,6 +171,8 @@ class DataManager(object):
         if self.task_type is None or self.task_type in CLS_TASKS:
             # Label encoding.
             input_node = self.encode_label(input_node)
+        if self.dtype is not None:
+            input_node = input_node.astype(self.dtype)
         return input_node
 
     def preprocess_fit(self, input_node, task_type=CLASSIFICATION):
@@ -20,11 +20,5 @@ def is_imbalanced_dataset(data_node: DataNode):
     :param data_node:
     :return: boolean.
     """
-    labels = list(data_node.data[1])
-    cnts = list()
-    for val in set(labels):
-        cnts.append(labels.count(val))
-    cnts = sorted(cnts)
-    # print('label distribution', cnts)
-    assert len(cnts) > 1
-    return cnts[0] * 4 <= cnts[-1]
+    assert data_node.profile.n_classes > 1
+    return data_node.profile.is_imbalanced
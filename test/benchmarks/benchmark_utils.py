@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+import numpy as np
+
+sys.path.append(os.getcwd())
+from solnml.components.feature_engineering.transformation_graph import DataNode
+from solnml.components.utils.constants import CATEGORICAL, NUMERICAL, MULTICLASS_CLS, REGRESSION
+
+
+def generate_data(n_rows=1000, n_cols=20, cat_ratio=0.2, n_classes=2, task='cls', n_categories=5, seed=1):
+    """
+        Generate a synthetic dataset, the first int(n_cols * cat_ratio) columns are categorical.
+    """
+    rng = np.random.RandomState(seed)
+    n_cat = int(n_cols * cat_ratio)
+    n_num = n_cols - n_cat
+    X_cat = rng.randint(0, n_categories, size=(n_rows, n_cat)).astype(np.float64)
+    X_num = rng.randn(n_rows, n_num)
+    X = np.hstack([X_cat, X_num])
+
+    coef = rng.randn(n_cols)
+    signal = np.dot((X - X.mean(axis=0)) / (X.std(axis=0) + 1e-8), coef) + rng.randn(n_rows) * 0.5
+    if task == 'cls':
+        thresholds = np.percentile(signal, np.linspace(0, 100, n_classes + 1)[1:-1])
+        y = np.searchsorted(thresholds, signal)
+        task_type = MULTICLASS_CLS
+    else:
+        y = signal
+        task_type = REGRESSION
+    feature_types = [CATEGORICAL] * n_cat + [NUMERICAL] * n_num
+    return DataNode(data=[X, y], feature_type=feature_types, task_type=task_type)
+
+
+def measure(func, repeats=3, warmup=0, n_rows=None, track_memory=False):
+    """
+        Run func for `repeats` times and summarize its wall time.
+    :param track_memory: if True, also record the peak memory allocated by func (via tracemalloc).
+    :return: a dict with mean/std/min/median/p50/p99 time (in seconds), and throughput (rows/second)
+        if n_rows is given.
+    """
+    import tracemalloc
+    for _ in range(warmup):
+        func()
+    costs, peaks = list(), list()
+    for _ in range(repeats):
+        if track_memory:
+            tracemalloc.start()
+        _start_time = time.perf_counter()
+        func()
+        costs.append(time.perf_counter() - _start_time)
+        if track_memory:
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    costs = np.array(costs)
+    result = {'mean': float(np.mean(costs)),
+              'std': float(np.std(costs)),
+              'min': float(np.min(costs)),
+              'median': float(np.median(costs)),
+              'p50': float(np.percentile(costs, 50)),
+              'p99': float(np.percentile(costs, 99)),
+              'repeats': repeats}
+    if n_rows is not None:
+        result['throughput'] = float(n_rows / max(result['median'], 1e-12))
+    if track_memory:
+        result['peak_memory_mb'] = float(np.max(peaks) / 2 ** 20)
+    return result
+
+
+def get_environment():
+    try:
+        revision = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        revision = None
+    return {'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'revision': revision,
+            'timestamp': time.time()}
+
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline, tolerance=0.1, key='median'):
+    """
+        Compare the benchmark results with a saved baseline.
+    :param tolerance: a case regresses if it is slower than the baseline by more than this ratio.
+    :return: a list of (case, baseline time, current time, ratio, status) sorted by ratio.
+    """
+    rows = list()
+    current_cases, baseline_cases = current['results'], baseline['results']
+    for case in sorted(set(current_cases.keys()) | set(baseline_cases.keys())):
+        if case not in baseline_cases:
+            rows.append((case, None, current_cases[case].get(key), None, 'new'))
+            continue
+        if case not in current_cases:
+            rows.append((case, baseline_cases[case].get(key), None, None, 'missing'))
+            continue
+        _base, _cur = baseline_cases[case].get(key), current_cases[case].get(key)
+        if _base is None or _cur is None:
+            rows.append((case, _base, _cur, None, 'failed'))
+            continue
+        ratio = _cur / max(_base, 1e-12)
+        if ratio > 1 + tolerance:
+            status = 'regression'
+        elif ratio < 1 - tolerance:
+            status = 'improvement'
+        else:
+            status = 'unchanged'
+        rows.append((case, _base, _cur, ratio, status))
+    rows.sort(key=lambda x: -1 if x[3] is None else x[3], reverse=True)
+    return rows
+
+
+def print_comparison(rows):
+    import tabulate
+    table = list()
+    for case, _base, _cur, ratio, status in rows:
+        table.append([case,
+                      '-' if _base is None else '%.4f' % _base,
+                      '-' if _cur is None else '%.4f' % _cur,
+                      '-' if ratio is None else '%.2fx' % ratio,
+                      status])
+    print(tabulate.tabulate(table, headers=['case', 'baseline(s)', 'current(s)', 'ratio', 'status']))
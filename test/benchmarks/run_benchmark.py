@@ -0,0 +1,360 @@
+"""
+    This script benchmarks the hot paths in solnml on synthetic data, and compares the results
+    with a saved baseline to track performance regressions.
+
+    Run a benchmark and save it as the baseline:
+        python test/benchmarks/run_benchmark.py --rows 5000 --cols 20 --output data/benchmarks/base.json
+    Run again and compare with the baseline (exit code 1 if any case regresses):
+        python test/benchmarks/run_benchmark.py --rows 5000 --cols 20 --baseline data/benchmarks/base.json
+    Compare two saved results without running:
+        python test/benchmarks/run_benchmark.py --compare new.json --baseline base.json
+    Report the memory saved by the float32 compute mode:
+        python test/benchmarks/run_benchmark.py --suites dtype --rows 20000 --cols 100
+    Report the p50/p99 latency of the exported serving model:
+        python test/benchmarks/run_benchmark.py --suites serving --serving_requests 1000
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import itertools
+import tempfile
+import traceback
+import numpy as np
+
+sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import generate_data, measure, get_environment, save_results, load_results, \
+    compare_results, print_comparison
+
+parser = argparse.ArgumentParser()
+all_suites = 'fe,parse,evaluator,ensemble,optimizer,meta_feature,e2e,dtype,serving'
+parser.add_argument('--suites', type=str, default=all_suites)
+parser.add_argument('--task', type=str, default='cls', choices=['cls', 'rgs'])
+parser.add_argument('--rows', type=int, default=2000)
+parser.add_argument('--cols', type=int, default=20)
+parser.add_argument('--cat_ratio', type=float, default=0.2)
+parser.add_argument('--n_classes', type=int, default=2)
+parser.add_argument('--repeats', type=int, default=3)
+parser.add_argument('--algorithms', type=str, default='random_forest,extra_trees,lightgbm,logistic_regression,'
+                                                       'k_nearest_neighbors,libsvm_svc')
+parser.add_argument('--n_trials', type=int, default=20, help='Number of suggestions for each optimizer.')
+parser.add_argument('--e2e_trials', type=int, default=10, help='Number of iterations in Classifier.fit.')
+parser.add_argument('--serving_requests', type=int, default=200, help='Number of requests for each batch size.')
+parser.add_argument('--seed', type=int, default=1)
+parser.add_argument('--output', type=str, default=None)
+parser.add_argument('--baseline', type=str, default=None)
+parser.add_argument('--compare', type=str, default=None)
+parser.add_argument('--tolerance', type=float, default=0.1)
+
+
+def get_task_type(task):
+    from solnml.components.utils.constants import MULTICLASS_CLS, REGRESSION
+    return MULTICLASS_CLS if task == 'cls' else REGRESSION
+
+
+def get_default_config(task, algorithm):
+    """
+        Default configuration of the joint FE and CASH space for a single algorithm.
+    """
+    from ConfigSpace import ConfigurationSpace
+    if task == 'cls':
+        from solnml.components.evaluators.cls_evaluator import get_fe_cs, get_cash_cs
+    else:
+        from solnml.components.evaluators.rgs_evaluator import get_fe_cs, get_cash_cs
+    task_type = get_task_type(task)
+    cs = ConfigurationSpace()
+    for sub_cs in [get_fe_cs(task_type), get_cash_cs([algorithm], task_type)]:
+        cs.add_hyperparameters(sub_cs.get_hyperparameters())
+        cs.add_conditions(sub_cs.get_conditions())
+        cs.add_forbidden_clauses(sub_cs.get_forbiddens())
+    return cs.get_default_configuration().get_dictionary().copy()
+
+
+def get_evaluator(task, data_node, output_dir, timestamp, resampling_strategy='holdout'):
+    from solnml.components.metrics.metric import get_metric
+    if task == 'cls':
+        from solnml.components.evaluators.cls_evaluator import ClassificationEvaluator
+        return ClassificationEvaluator(scorer=get_metric('bal_acc'), data_node=data_node,
+                                       resampling_strategy=resampling_strategy,
+                                       timestamp=timestamp, output_dir=output_dir)
+    else:
+        from solnml.components.evaluators.rgs_evaluator import RegressionEvaluator
+        return RegressionEvaluator(scorer=get_metric('mse'), data_node=data_node,
+                                   resampling_strategy=resampling_strategy,
+                                   timestamp=timestamp, output_dir=output_dir)
+
+
+def run_case(results, name, func, **kwargs):
+    print('Benchmark %s' % name)
+    try:
+        results[name] = measure(func, **kwargs)
+    except Exception as e:
+        traceback.print_exc()
+        results[name] = {'error': str(e)}
+
+
+def benchmark_fe(args, data_node, results):
+    from solnml.components.feature_engineering.transformations import _transformers
+    for name, transformer_class in sorted(_transformers.items()):
+        def operate():
+            if hasattr(transformer_class, 'get_hyperparameter_search_space'):
+                config = transformer_class.get_hyperparameter_search_space().get_default_configuration()
+                transformer = transformer_class(**config.get_dictionary())
+            else:
+                transformer = transformer_class()
+            transformer.operate(data_node.copy_())
+
+        run_case(results, 'fe/%s' % name, operate, repeats=args.repeats, n_rows=args.rows)
+
+
+def benchmark_parse(args, data_node, results):
+    from solnml.components.feature_engineering.parse import parse_config, construct_node
+    config = get_default_config(args.task, args.algorithms.split(',')[0])
+    run_case(results, 'parse/parse_config',
+             lambda: parse_config(data_node, config, record=True),
+             repeats=args.repeats, n_rows=args.rows)
+    _, op_list = parse_config(data_node, config, record=True)
+    run_case(results, 'parse/construct_node',
+             lambda: construct_node(data_node.copy_(), op_list),
+             repeats=args.repeats, n_rows=args.rows)
+
+
+def benchmark_evaluator(args, data_node, output_dir, results):
+    timestamp = time.time()
+    evaluator = get_evaluator(args.task, data_node, output_dir, timestamp)
+    for algorithm in args.algorithms.split(','):
+        config = get_default_config(args.task, algorithm)
+        run_case(results, 'evaluator/%s' % algorithm, lambda: evaluator(config),
+                 repeats=args.repeats, n_rows=args.rows)
+
+
+def get_ensemble_stats(args, data_node, output_dir):
+    """
+        Evaluate the base models, which saves their models and validation predictions.
+    :return: the stats of the ensemble, {algorithm: [(config, perf, model_path)]}.
+    """
+    from solnml.components.utils.topk_saver import CombinedTopKModelSaver
+    timestamp = time.time()
+    evaluator = get_evaluator(args.task, data_node, output_dir, timestamp)
+    stats = dict()
+    for algorithm in args.algorithms.split(','):
+        config = get_default_config(args.task, algorithm)
+        perf = -evaluator(config)
+        if not np.isfinite(perf):
+            continue
+        model_path = CombinedTopKModelSaver.get_path_by_config(output_dir, config, timestamp)
+        stats[algorithm] = [(config, perf, model_path)]
+    return stats
+
+
+def benchmark_ensemble(args, data_node, output_dir, results):
+    from solnml.components.ensemble.ensemble_selection import EnsembleSelection
+    from solnml.components.metrics.metric import get_metric
+
+    stats = get_ensemble_stats(args, data_node, output_dir)
+
+    metric = get_metric('bal_acc' if args.task == 'cls' else 'mse')
+    task_type = get_task_type(args.task)
+
+    def build():
+        return EnsembleSelection(stats=stats, data_node=data_node, ensemble_size=50,
+                                 task_type=task_type, metric=metric, output_dir=output_dir)
+
+    def fit():
+        build().fit(data_node)
+
+    ensemble = build().fit(data_node)
+    run_case(results, 'ensemble/ensemble_selection_fit', fit, repeats=args.repeats, n_rows=args.rows)
+    run_case(results, 'ensemble/ensemble_selection_predict', lambda: ensemble.predict(data_node.copy_()),
+             repeats=args.repeats, n_rows=args.rows)
+
+
+def benchmark_serving(args, data_node, output_dir, results):
+    """
+        Per-request latency of the served ensemble, the requests are single rows and small batches.
+    """
+    from solnml.components.ensemble.ensemble_selection import EnsembleSelection
+    from solnml.components.feature_engineering.transformation_graph import DataNode
+    from solnml.components.metrics.metric import get_metric
+    from solnml.components.utils.serving import ServingModel, load_model
+
+    stats = get_ensemble_stats(args, data_node, output_dir)
+    task_type = get_task_type(args.task)
+    ensemble = EnsembleSelection(stats=stats, data_node=data_node, ensemble_size=50, task_type=task_type,
+                                 metric=get_metric('bal_acc' if args.task == 'cls' else 'mse'),
+                                 output_dir=output_dir)
+    ensemble.fit(data_node)
+    model_path = os.path.join(output_dir, 'serving_model.pkl')
+    ServingModel(task_type, ensemble.get_serving_members(), feature_types=data_node.feature_types).save(model_path)
+    run_case(results, 'serving/load_model', lambda: load_model(model_path), repeats=args.repeats)
+    model = load_model(model_path)
+
+    X = data_node.data[0]
+    table = list()
+    for batch_size in [1, 10, 100]:
+        batches = [X[idx: idx + batch_size] for idx in range(0, len(X) - batch_size + 1, batch_size)]
+        requests = itertools.cycle(batches)
+        serve = lambda: model.predict(next(requests))
+        ensemble_predict = lambda: ensemble.predict(DataNode([next(requests), None],
+                                                             data_node.feature_types.copy(), task_type))
+        for name, func in [('serving_model', serve), ('ensemble_predict', ensemble_predict)]:
+            case = 'serving/%s_batch_%d' % (name, batch_size)
+            run_case(results, case, func, repeats=args.serving_requests, warmup=1, n_rows=batch_size)
+            if 'p50' in results[case]:
+                table.append([name, batch_size, '%.2f' % (results[case]['p50'] * 1000),
+                              '%.2f' % (results[case]['p99'] * 1000)])
+
+    import tabulate
+    print(tabulate.tabulate(table, headers=['predict', 'batch size', 'p50 (ms)', 'p99 (ms)']))
+
+
+class DummyEvaluator(object):
+    """
+        A cheap evaluator, so that the optimizer cost is dominated by making suggestions.
+    """
+
+    def __init__(self):
+        self.fixed_config = None
+        self.continue_training = False
+        self.n_calls = 0
+
+    def __call__(self, config, **kwargs):
+        self.n_calls += 1
+        vector = config.get_array()
+        return float(np.nansum((vector - 0.3) ** 2))
+
+
+def benchmark_optimizer(args, output_dir, results):
+    from solnml.components.optimizers.smac_optimizer import SMACOptimizer
+    from solnml.components.optimizers.tpe_optimizer import TPEOptimizer
+    from solnml.components.optimizers.mfse_optimizer import MfseOptimizer
+    if args.task == 'cls':
+        from solnml.components.evaluators.cls_evaluator import get_cash_cs
+    else:
+        from solnml.components.evaluators.rgs_evaluator import get_cash_cs
+    cs = get_cash_cs(args.algorithms.split(','), get_task_type(args.task))
+
+    for name, optimizer_class in [('smac', SMACOptimizer), ('tpe', TPEOptimizer), ('mfse', MfseOptimizer)]:
+        def suggest():
+            # The 'cv' evaluation type keeps the optimizers from touching model files.
+            evaluator = DummyEvaluator()
+            optimizer = optimizer_class(evaluator, cs, 'hpo', eval_type='cv', output_dir=output_dir,
+                                        timestamp=time.time(), seed=args.seed)
+            while evaluator.n_calls < args.n_trials:
+                optimizer.iterate()
+
+        run_case(results, 'optimizer/%s_%d_trials' % (name, args.n_trials), suggest, repeats=args.repeats)
+
+
+def benchmark_meta_feature(args, data_node, results):
+    from solnml.datasets.utils import calculate_metafeatures
+    run_case(results, 'meta_feature/calculate_metafeatures',
+             lambda: calculate_metafeatures(data_node.copy_(), task_type=get_task_type(args.task)),
+             repeats=args.repeats, n_rows=args.rows)
+
+
+def benchmark_dtype(args, data_node, output_dir, results):
+    """
+        Compare the time and the peak memory of the feature engineering and evaluation in float64 and float32.
+    """
+    from solnml.components.feature_engineering.parse import parse_config
+    config = get_default_config(args.task, args.algorithms.split(',')[0])
+    memory = dict()
+    for dtype in ['float64', 'float32']:
+        _data_node = data_node.astype(dtype)
+        evaluator = get_evaluator(args.task, _data_node, output_dir, time.time())
+        run_case(results, 'dtype/parse_config_%s' % dtype,
+                 lambda: parse_config(_data_node, config, record=True),
+                 repeats=args.repeats, n_rows=args.rows, track_memory=True)
+        run_case(results, 'dtype/evaluator_%s' % dtype, lambda: evaluator(config),
+                 repeats=args.repeats, n_rows=args.rows, track_memory=True)
+        memory[dtype] = [_data_node.data[0].nbytes / 2 ** 20] + \
+                        [results['dtype/%s_%s' % (case, dtype)].get('peak_memory_mb', np.nan)
+                         for case in ['parse_config', 'evaluator']]
+
+    import tabulate
+    table = [[name, '%.2f' % memory['float64'][idx], '%.2f' % memory['float32'][idx],
+              '%.1f%%' % (100 * (1 - memory['float32'][idx] / memory['float64'][idx]))]
+             for idx, name in enumerate(['data', 'parse_config peak', 'evaluator peak'])]
+    print(tabulate.tabulate(table, headers=['memory (MB)', 'float64', 'float32', 'saved']))
+
+
+def benchmark_e2e(args, data_node, output_dir, results):
+    from solnml.estimators import Classifier, Regressor
+
+    def fit():
+        estimator_class = Classifier if args.task == 'cls' else Regressor
+        estimator = estimator_class(time_limit=3600,
+                                    amount_of_resource=args.e2e_trials,
+                                    include_algorithms=args.algorithms.split(','),
+                                    enable_meta_algorithm_selection=False,
+                                    metric='bal_acc' if args.task == 'cls' else 'mse',
+                                    random_state=args.seed,
+                                    output_dir=output_dir,
+                                    delete_output_dir_after_fit=True)
+        estimator.fit(data_node.copy_())
+
+    run_case(results, 'e2e/fit_%d_iterations' % args.e2e_trials, fit, repeats=1, n_rows=args.rows)
+
+
+def main():
+    args = parser.parse_args()
+
+    if args.compare is not None:
+        if args.baseline is None:
+            raise ValueError('Please specify the baseline to compare with!')
+        rows = compare_results(load_results(args.compare), load_results(args.baseline), tolerance=args.tolerance)
+        print_comparison(rows)
+        sys.exit(1 if any(row[4] == 'regression' for row in rows) else 0)
+
+    suites = args.suites.split(',')
+    for suite in suites:
+        if suite not in all_suites.split(','):
+            raise ValueError('Invalid benchmark suite: %s!' % suite)
+
+    data_node = generate_data(n_rows=args.rows, n_cols=args.cols, cat_ratio=args.cat_ratio,
+                              n_classes=args.n_classes, task=args.task, seed=args.seed)
+    output_dir = tempfile.mkdtemp(prefix='solnml_benchmark_')
+    results = dict()
+    try:
+        if 'fe' in suites:
+            benchmark_fe(args, data_node, results)
+        if 'parse' in suites:
+            benchmark_parse(args, data_node, results)
+        if 'evaluator' in suites:
+            benchmark_evaluator(args, data_node, output_dir, results)
+        if 'ensemble' in suites:
+            benchmark_ensemble(args, data_node, output_dir, results)
+        if 'optimizer' in suites:
+            benchmark_optimizer(args, output_dir, results)
+        if 'meta_feature' in suites:
+            benchmark_meta_feature(args, data_node, results)
+        if 'e2e' in suites:
+            benchmark_e2e(args, data_node, output_dir, results)
+        if 'dtype' in suites:
+            benchmark_dtype(args, data_node, output_dir, results)
+        if 'serving' in suites:
+            benchmark_serving(args, data_node, output_dir, results)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    content = {'environment': get_environment(),
+               'params': vars(args),
+               'results': results}
+    if args.output is not None:
+        output_folder = os.path.dirname(args.output)
+        if output_folder and not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+        save_results(content, args.output)
+        print('Benchmark results saved to %s' % args.output)
+
+    if args.baseline is not None:
+        rows = compare_results(content, load_results(args.baseline), tolerance=args.tolerance)
+        print_comparison(rows)
+        sys.exit(1 if any(row[4] == 'regression' for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
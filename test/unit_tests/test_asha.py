@@ -0,0 +1,81 @@
+import numpy as np
+
+from solnml.components.optimizers.base.asha import AshaScheduler, run_asha
+
+
+def get_scheduler(R=9, eta=3):
+    counter = iter(range(10000))
+    return AshaScheduler(lambda n: [next(counter) for _ in range(n)], R=R, eta=eta)
+
+
+def test_rungs():
+    scheduler = get_scheduler(R=27, eta=3)
+    assert scheduler.rung_resources == [1, 3, 9, 27]
+    assert scheduler.is_top_rung(27) and not scheduler.is_top_rung(9)
+
+
+def test_new_configurations_until_promotable():
+    scheduler = get_scheduler()
+    jobs = [scheduler.get_job() for _ in range(2)]
+    assert jobs == [(0, 1, True), (1, 1, True)]
+    for config, r, _ in jobs:
+        scheduler.report(config, r, float(config))
+    # Two results in the lowest rung, less than eta: still nothing to promote.
+    assert scheduler.get_job() == (2, 1, True)
+
+
+def test_promotion_order():
+    scheduler = get_scheduler()
+    losses = {0: 0.5, 1: 0.1, 2: 0.9, 3: 0.3, 4: 0.7, 5: 0.2}
+    for _ in range(3):
+        config, r, _ = scheduler.get_job()
+        scheduler.report(config, r, losses[config])
+    # The best of the three configurations in the lowest rung is promoted.
+    assert scheduler.get_job() == (1, 3, False)
+    assert scheduler.pending[3] == [1]
+    # It is promoted only once.
+    assert scheduler.get_job() == (3, 1, True)
+    scheduler.report(3, 1, losses[3])
+    scheduler.report(1, 3, 0.05)
+    for _ in range(2):
+        config, r, _ = scheduler.get_job()
+        scheduler.report(config, r, losses[config])
+    # The top third of six: 1 is already promoted, 5 is the next best.
+    assert scheduler.get_job() == (5, 3, False)
+
+
+def test_promote_from_highest_rung_first():
+    scheduler = get_scheduler()
+    for config in range(12):
+        scheduler.report(config, 1, float(config))
+    for config in [0, 1, 2]:
+        scheduler.promoted[1].append(config)
+        scheduler.report(config, 3, float(config))
+    # Both rungs have a promotable configuration, the higher rung goes first.
+    assert scheduler.get_job() == (0, 9, False)
+    assert scheduler.get_job() == (3, 3, False)
+
+
+def test_failed_configurations_are_not_promoted():
+    scheduler = get_scheduler()
+    scheduler.report(0, 1, np.nan)
+    scheduler.report(1, 1, None)
+    scheduler.report(2, 1, np.inf)
+    config, r, first_iter = scheduler.get_job()
+    assert r == 1 and first_iter
+
+
+def test_run_asha_sequential():
+    scheduler = get_scheduler()
+    evaluated = list()
+
+    def eval_func(config, resource_ratio, eta, first_iter):
+        evaluated.append((config, resource_ratio))
+        return float(config)
+
+    run_asha(scheduler, None, 1, budget=60, max_evaluations=13, eval_func=eval_func)
+    assert len(evaluated) == 13
+    # Nine new configurations, three promoted to 3 and one to 9.
+    assert sum(ratio == 1. / 9 for _, ratio in evaluated) == 9
+    assert [config for config, ratio in evaluated if ratio == 1. / 3] == [0, 1, 2]
+    assert [config for config, ratio in evaluated if ratio == 1.] == [0]
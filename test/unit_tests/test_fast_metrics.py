@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, balanced_accuracy_score, f1_score, precision_score, recall_score, \
+    roc_auc_score, mean_squared_error, mean_absolute_error, r2_score, make_scorer
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from sklearn.preprocessing import OneHotEncoder
+
+from solnml.components.metrics.fast_metrics import FastMetric, FastScorer
+
+CLS_FUNCS = {'acc': accuracy_score,
+             'bal_acc': balanced_accuracy_score,
+             'f1': lambda y_true, y_pred: f1_score(y_true, y_pred, average='macro'),
+             'precision': precision_score,
+             'recall': recall_score}
+RGS_FUNCS = {'mse': mean_squared_error,
+             'rmse': lambda y_true, y_pred: np.sqrt(mean_squared_error(y_true, y_pred)),
+             'mae': mean_absolute_error,
+             'r2': r2_score}
+
+
+def get_probas(n_samples, n_classes, seed):
+    rng = np.random.RandomState(seed)
+    probas = rng.rand(n_samples, n_classes)
+    return probas / probas.sum(axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize('name', sorted(CLS_FUNCS))
+@pytest.mark.parametrize('n_classes', [2, 3])
+def test_classification_metrics(name, n_classes):
+    if name in ['precision', 'recall'] and n_classes > 2:
+        pytest.skip('The binary average only applies to two classes.')
+    rng = np.random.RandomState(1)
+    y_true = rng.randint(n_classes, size=200)
+    probas = get_probas(200, n_classes, seed=2)
+    y_pred = np.argmax(probas, axis=1)
+    metric = FastMetric(name, y_true)
+    expected = CLS_FUNCS[name](y_true, y_pred)
+    assert metric.score(y_pred) == pytest.approx(expected)
+    # The class probabilities are scored by their argmax.
+    assert metric.score(probas) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('name', sorted(CLS_FUNCS))
+def test_classification_score_batch(name):
+    rng = np.random.RandomState(1)
+    y_true = rng.randint(2, size=100)
+    preds = rng.randint(2, size=(5, 100))
+    metric = FastMetric(name, y_true)
+    np.testing.assert_allclose(metric.score_batch(preds), [CLS_FUNCS[name](y_true, pred) for pred in preds])
+
+
+def test_classification_unseen_labels():
+    # The predictions may contain labels absent from the validation set.
+    y_true = np.array([0, 0, 1, 1, 2, 2])
+    y_pred = np.array([0, 3, 1, 1, 2, 3])
+    for name in ['acc', 'bal_acc', 'f1']:
+        assert FastMetric(name, y_true).score(y_pred) == pytest.approx(CLS_FUNCS[name](y_true, y_pred))
+
+
+def test_classification_classes():
+    # The probability columns are the labels in classes, not 0, ..., n_classes - 1.
+    rng = np.random.RandomState(1)
+    classes = np.array([0, 2, 5])
+    y_true = rng.choice(classes, size=200)
+    probas = get_probas(200, 3, seed=2)
+    y_pred = classes[np.argmax(probas, axis=1)]
+    for name in ['acc', 'bal_acc', 'f1']:
+        expected = CLS_FUNCS[name](y_true, y_pred)
+        assert FastMetric(name, y_true).score(probas, classes=classes) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('estimator', [LogisticRegression(), SVC(probability=True, random_state=1)])
+def test_score_predictions_classes(estimator):
+    rng = np.random.RandomState(1)
+    X = rng.randn(300, 4)
+    y = rng.choice([0, 1, 2], size=300)
+    # Class 1 is absent from the training set, so classes_ is [0, 2].
+    mask = y[:150] != 1
+    estimator.fit(X[:150][mask], y[:150][mask])
+    scorer = make_scorer(accuracy_score)
+    score, y_pred = FastScorer(scorer).score_predictions(estimator, X[150:], y[150:], 'predict_proba')
+    assert score == pytest.approx(scorer(estimator, X[150:], y[150:]))
+    assert y_pred.shape == (150, 2)
+
+
+def test_binary_auc():
+    rng = np.random.RandomState(1)
+    y_true = rng.randint(2, size=200)
+    y_score = rng.rand(200)
+    assert FastMetric('auc', y_true).score(y_score) == pytest.approx(roc_auc_score(y_true, y_score))
+
+
+@pytest.mark.parametrize('n_classes', [2, 4])
+def test_onehot_auc(n_classes):
+    rng = np.random.RandomState(1)
+    y = rng.randint(n_classes, size=300)
+    y_onehot = OneHotEncoder(categories='auto').fit_transform(y.reshape((-1, 1))).toarray()
+    probas = get_probas(300, n_classes, seed=2)
+    # Ties in the scores.
+    probas[:50] = np.round(probas[:50], 1)
+    metric = FastMetric('auc', y_onehot)
+    assert metric.score(probas) == pytest.approx(roc_auc_score(y_onehot, probas))
+
+
+def test_auc_single_class():
+    with pytest.raises(ValueError):
+        FastMetric('auc', np.ones(10))
+
+
+@pytest.mark.parametrize('name', sorted(RGS_FUNCS))
+def test_regression_metrics(name):
+    rng = np.random.RandomState(1)
+    y_true = rng.randn(200)
+    preds = y_true + rng.randn(3, 200)
+    metric = FastMetric(name, y_true)
+    assert metric.score(preds[0]) == pytest.approx(RGS_FUNCS[name](y_true, preds[0]))
+    np.testing.assert_allclose(metric.score_batch(preds), [RGS_FUNCS[name](y_true, pred) for pred in preds])
+
+
+def test_r2_constant_target():
+    y_true = np.ones(10)
+    metric = FastMetric('r2', y_true)
+    assert metric.score(y_true) == pytest.approx(r2_score(y_true, y_true))
+    assert metric.score(y_true + 1) == pytest.approx(r2_score(y_true, y_true + 1))
+
+
+def test_invalid_metric():
+    with pytest.raises(ValueError):
+        FastMetric('logloss', np.zeros(10))
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, ExtraTreesRegressor
+from sklearn.feature_selection import SelectFromModel
+
+from solnml.components.feature_engineering.transformations.feature_importance import ImportanceSelector
+
+
+@pytest.mark.parametrize('estimator_class', [ExtraTreesClassifier, ExtraTreesRegressor])
+def test_importance_selector(estimator_class):
+    rng = np.random.RandomState(1)
+    X = rng.rand(300, 20)
+    y = (X[:, 0] + X[:, 3] > 1).astype(int)
+    estimator = estimator_class(n_estimators=50, random_state=1).fit(X, y)
+    selector = ImportanceSelector(estimator.feature_importances_)
+    reference = SelectFromModel(estimator, threshold='mean', prefit=True)
+    np.testing.assert_array_equal(selector.get_support(), reference.get_support())
+    np.testing.assert_array_equal(selector.transform(X), reference.transform(X))
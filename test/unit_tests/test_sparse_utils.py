@@ -0,0 +1,56 @@
+import numpy as np
+from scipy import sparse
+
+from solnml.components.utils import sparse_utils
+
+
+def get_data():
+    rng = np.random.RandomState(1)
+    X = rng.rand(20, 6)
+    X[X < 0.5] = 0
+    X_new = rng.rand(20, 2)
+    return X, X_new
+
+
+def test_delete_columns():
+    X, _ = get_data()
+    expected = np.delete(X, [1, 4], axis=1)
+    np.testing.assert_array_equal(sparse_utils.delete_columns(X, [1, 4]), expected)
+    result = sparse_utils.delete_columns(sparse.csr_matrix(X), [4, 1])
+    assert sparse.isspmatrix_csr(result)
+    np.testing.assert_array_equal(result.toarray(), expected)
+
+
+def test_replace_columns():
+    X, X_new = get_data()
+    expected = X.copy()
+    expected[:, [3, 0]] = X_new
+    np.testing.assert_array_equal(sparse_utils.replace_columns(X, [3, 0], X_new), expected)
+    for _X, _X_new in [(sparse.csr_matrix(X), X_new), (X, sparse.csr_matrix(X_new)),
+                       (sparse.csr_matrix(X), sparse.csr_matrix(X_new))]:
+        result = sparse_utils.replace_columns(_X, [3, 0], _X_new)
+        assert sparse.isspmatrix_csr(result)
+        np.testing.assert_array_equal(result.toarray(), expected)
+
+
+def test_replace_columns_copy_and_dtype():
+    X = np.arange(12, dtype=np.int64).reshape((4, 3))
+    X_new = np.full((4, 1), 0.5)
+    result = sparse_utils.replace_columns(X, [1], X_new)
+    # The integer data are cast to float, and X is left unchanged.
+    assert result.dtype == np.float64
+    np.testing.assert_array_equal(result[:, 1], 0.5)
+    np.testing.assert_array_equal(X, np.arange(12).reshape((4, 3)))
+
+    X32 = X.astype(np.float32)
+    assert sparse_utils.replace_columns(X32, [1], X_new).dtype == np.float32
+
+
+def test_stack():
+    X, X_new = get_data()
+    np.testing.assert_array_equal(sparse_utils.hstack([X, X_new]), np.hstack([X, X_new]))
+    result = sparse_utils.hstack([sparse.csr_matrix(X), X_new])
+    assert sparse.isspmatrix_csr(result)
+    np.testing.assert_array_equal(result.toarray(), np.hstack([X, X_new]))
+    result = sparse_utils.vstack([sparse.csr_matrix(X), X])
+    np.testing.assert_array_equal(result.toarray(), np.vstack([X, X]))
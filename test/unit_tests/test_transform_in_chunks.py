@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from solnml.components.computation.resource_manager import set_resource_manager
+from solnml.components.feature_engineering.transformations.base_transformer import transform_in_chunks, \
+    MIN_CHUNK_ROWS
+
+
+@pytest.fixture
+def small_memory():
+    # 1MB for the trial, i.e., a few hundred rows per chunk.
+    set_resource_manager(n_cores=1, memory_limit=1)
+    yield
+    set_resource_manager(n_cores=1)
+
+
+def test_transform_in_chunks_dense(small_memory):
+    rng = np.random.RandomState(1)
+    X = rng.rand(5000, 10)
+    scaler = StandardScaler().fit(X)
+    row_bytes = 8 * 1024
+    expected = scaler.transform(X)
+    np.testing.assert_allclose(transform_in_chunks(scaler.transform, X, row_bytes), expected)
+    # A single chunk is transformed as is.
+    np.testing.assert_allclose(transform_in_chunks(scaler.transform, X[:MIN_CHUNK_ROWS], row_bytes),
+                               expected[:MIN_CHUNK_ROWS])
+
+
+def test_transform_in_chunks_float32(small_memory):
+    X = np.random.RandomState(1).rand(3000, 4).astype(np.float32)
+    result = transform_in_chunks(lambda _X: _X.astype(np.float64) * 2, X, 8 * 1024)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, X * 2)
+
+
+def test_transform_in_chunks_sparse(small_memory):
+    X = np.random.RandomState(1).randint(5, size=(3000, 3))
+    encoder = OneHotEncoder(categories='auto').fit(X)
+    result = transform_in_chunks(encoder.transform, X, 8 * 1024)
+    assert sparse.issparse(result)
+    np.testing.assert_array_equal(result.toarray(), encoder.transform(X).toarray())